@@ -0,0 +1,82 @@
+"""比较 JSON 与二进制两种城市数据加载方式的耗时和内存峰值
+
+用法: python benchmarks/bench_city_data.py [-n 次数]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.city_index import CityIndex, get_resource_path
+
+LOADERS = {
+    "json": lambda: CityIndex.from_json(get_resource_path('city_data.json')),
+    "binary": lambda: CityIndex.from_binary(get_resource_path('city_data.bin')),
+}
+
+# 在全新进程中测量，包含模块导入，近似冷启动
+COLD_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from utils.city_index import CityIndex, get_resource_path
+index = CityIndex.{method}(get_resource_path({name!r}))
+index.cities('广东省')
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def measure_warm(loader, number):
+    """同一进程内重复加载的平均耗时 (ms)"""
+    loader()
+    start = time.perf_counter()
+    for _ in range(number):
+        loader()
+    return (time.perf_counter() - start) * 1000 / number
+
+
+def measure_peak(loader):
+    """加载过程中的 Python 内存分配峰值 (KB)"""
+    tracemalloc.start()
+    index = loader()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del index
+    return peak / 1024
+
+
+def measure_cold(kind, number):
+    """新进程中的平均加载耗时 (ms)"""
+    method, name = {
+        "json": ("from_json", "city_data.json"),
+        "binary": ("from_binary", "city_data.bin"),
+    }[kind]
+    script = COLD_SCRIPT.format(root=ROOT, method=method, name=name)
+    results = []
+    for _ in range(number):
+        output = subprocess.run([sys.executable, "-c", script],
+                                capture_output=True, text=True, check=True).stdout
+        results.append(float(output.strip()))
+    return sum(results) / len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="城市数据加载基准测试")
+    parser.add_argument("-n", "--number", type=int, default=20, help="重复次数")
+    args = parser.parse_args()
+
+    print(f"{'格式':<8}{'冷启动(ms)':>12}{'热加载(ms)':>12}{'内存峰值(KB)':>14}")
+    for kind, loader in LOADERS.items():
+        cold = measure_cold(kind, max(1, args.number // 4))
+        warm = measure_warm(loader, args.number)
+        peak = measure_peak(loader)
+        print(f"{kind:<8}{cold:>12.2f}{warm:>12.2f}{peak:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""比较一次性获取与按省份并发获取城市数据的耗时，并检查断点续传和差异
+
+在本地启动一个模拟的高德行政区划接口，数据来自 resources/city_data.json，
+其中新增、删除、改名各一个区县，用来检查差异。每次请求的延迟为固定延迟加上按返回的行政区数量计算的传输时间。
+1. once: CityDataGenerator.generate，一次请求全国三级数据；按省份获取全部成功时的耗时；
+2. 按省份获取，其中两个省份返回错误：生成失败，原有文件不变，已完成的省份保存为断点；
+3. 再次运行：只获取失败的两个省份，输出与 once 相同，并列出差异。
+续传和输出内容的正确性由 tests/test_city_generate.py 检查，这里主要比较耗时。
+用法: python benchmarks/bench_city_generate.py [--delay-ms 毫秒] [--workers 数量]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 每个行政区的传输时间 (ms)
+PER_NODE_MS = 0.2
+
+
+def amap_tree(city_data):
+    """把 city_data.json 转换为接口返回的嵌套结构"""
+    return {"name": "中华人民共和国", "adcode": "100000", "districts": [
+        {"name": province, "adcode": info["adcode"], "districts": [
+            {"name": city, "adcode": city_info["adcode"], "districts": [
+                {"name": district, "adcode": district_info["adcode"], "districts": []}
+                for district, district_info in city_info.get("districts", {}).items()]}
+            for city, city_info in info.get("cities", {}).items()]}
+        for province, info in city_data.items() if info["adcode"] != "100000"]}
+
+
+def mutate(tree):
+    """新增、删除、改名各一个区县"""
+    province = next(item for item in tree["districts"] if item["name"] == "广东省")
+    city = next(item for item in province["districts"] if item["name"] == "深圳市")
+    city["districts"].append({"name": "测试新区", "adcode": "440399", "districts": []})
+    removed = city["districts"].pop(0)
+    city["districts"][0]["name"] += "（新）"
+    return removed
+
+
+def trim(node, depth):
+    """只保留 depth 层下级行政区"""
+    children = [trim(child, depth - 1) for child in node["districts"]] if depth > 0 else []
+    return {"name": node["name"], "adcode": node["adcode"], "districts": children}
+
+
+def count(node):
+    return 1 + sum(count(child) for child in node["districts"])
+
+
+class StandInAmapHandler(BaseHTTPRequestHandler):
+    tree = None
+    delay = 0.05
+    failing = set()
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        keywords, depth = query.get("keywords"), int(query.get("subdistrict", 1))
+        with StandInAmapHandler.lock:
+            StandInAmapHandler.requests += 1
+        if keywords in self.failing:
+            body = {"status": "0", "info": "CUQPS_HAS_EXCEEDED_THE_LIMIT", "infocode": "10020"}
+        else:
+            if keywords == "中国":
+                node = self.tree
+            else:
+                node = next((item for item in self.tree["districts"] if item["adcode"] == keywords), None)
+            districts = [trim(node, depth)] if node else []
+            time.sleep(self.delay + sum(map(count, districts)) * PER_NODE_MS / 1000)
+            body = {"status": "1", "info": "OK", "districts": districts}
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="城市数据生成基准测试")
+    parser.add_argument("--delay-ms", type=float, default=50, help="模拟接口每次请求的固定延迟 (ms)")
+    parser.add_argument("--workers", type=int, default=4, help="同时请求的省份数")
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "resources", "city_data.json"), 'r', encoding='utf-8') as f:
+        original = json.load(f)
+    StandInAmapHandler.tree = amap_tree(original)
+    removed = mutate(StandInAmapHandler.tree)
+    StandInAmapHandler.delay = args.delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInAmapHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["NM_AMAP_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    sys.path.insert(0, ROOT)
+    from create_city_json import CityDataGenerator, print_diff
+
+    work_dir = tempfile.mkdtemp(prefix="city-generate-")
+    try:
+        once_path = os.path.join(work_dir, "once", "city_data.json")
+        start = time.perf_counter()
+        CityDataGenerator("benchmark").generate(once_path)
+        once_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        CityDataGenerator("benchmark").generate_by_province(
+            os.path.join(work_dir, "clean", "city_data.json"), args.workers,
+            os.path.join(work_dir, "clean.parts"))
+        clean_ms = (time.perf_counter() - start) * 1000
+
+        # 输出文件先放一份原有数据，用来比较差异
+        output_path = os.path.join(work_dir, "resources", "city_data.json")
+        os.makedirs(os.path.dirname(output_path))
+        shutil.copy(os.path.join(ROOT, "resources", "city_data.json"), output_path)
+        checkpoint_dir = os.path.join(work_dir, "city_data.parts")
+        provinces = StandInAmapHandler.tree["districts"]
+        StandInAmapHandler.failing = {provinces[3]["adcode"], provinces[-2]["adcode"]}
+
+        start = time.perf_counter()
+        result = CityDataGenerator("benchmark").generate_by_province(
+            output_path, args.workers, checkpoint_dir)
+        failed_ms = (time.perf_counter() - start) * 1000
+        with open(output_path, 'r', encoding='utf-8') as f:
+            unchanged = json.load(f) == original
+        checkpoints = len(os.listdir(checkpoint_dir)) - 1
+
+        StandInAmapHandler.failing = set()
+        requests_before = StandInAmapHandler.requests
+        start = time.perf_counter()
+        diff = CityDataGenerator("benchmark").generate_by_province(
+            output_path, args.workers, checkpoint_dir)
+        resume_ms = (time.perf_counter() - start) * 1000
+        resume_requests = StandInAmapHandler.requests - requests_before
+        cleaned = not os.path.exists(checkpoint_dir)
+
+        with open(once_path, 'r', encoding='utf-8') as f:
+            once_data = json.load(f)
+        with open(output_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        same = json.loads(text) == once_data
+        same_text = text == json.dumps(once_data, ensure_ascii=False, indent=2)
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"once: {once_ms:.0f} ms，按省份（{args.workers} 个并发）: {clean_ms:.0f} ms")
+    print(f"按省份（{args.workers} 个并发，2 个省份失败）: {failed_ms:.0f} ms，结果 {result}，"
+          f"原有文件不变 {unchanged}，断点 {checkpoints} 个")
+    print(f"续传: {resume_ms:.0f} ms，请求 {resume_requests} 次，"
+          f"内容与 once 相同 {same}，文本与 json.dump 相同 {same_text}，断点已删除 {cleaned}")
+    print(f"删除的区县: {removed['adcode']} {removed['name']}")
+    print_diff(diff, limit=5)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""比较流式读取与整体解析行政区划表的耗时和内存峰值，并检查生成的数据
+
+stream: create_city_json.py --from-xlsx 使用的方式，逐行解析工作表，处理完即释放；
+dom:    先用 ElementTree 解析整个工作表和共享字符串表，再逐行取值（相当于一次加载整个工作簿）。
+内存峰值用 tracemalloc 统计，开启跟踪后耗时会偏高，两种方式分开计时。
+之后在临时目录生成 city_data.json 和 city_data.bin，检查两者都能加载，
+直辖市有区县，省直辖的县级市可以查到，并与原有数据比较差异。不会修改 resources 中的文件。
+用法: python benchmarks/bench_city_xlsx.py [-n 次数]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from xml.etree.ElementTree import fromstring
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from create_city_json import CityDataGenerator, build_city_data_from_rows
+from utils.city_index import CityIndex
+from utils.xlsx import _MAIN_NS, _column_index, _sheet_path, _text, iter_xlsx_rows
+
+XLSX_PATH = os.path.join(ROOT, "resources", "adcode.xlsx")
+
+
+def iter_dom_rows(path):
+    """整体解析后逐行取值，只处理本表用到的共享字符串和数字"""
+    with zipfile.ZipFile(path) as archive:
+        strings = fromstring(archive.read("xl/sharedStrings.xml"))
+        sheet = fromstring(archive.read(_sheet_path(archive, 0)))
+    shared_strings = [_text(item) for item in strings.iter(f"{_MAIN_NS}si")]
+    for row in sheet.iter(f"{_MAIN_NS}row"):
+        values = []
+        for cell in row.iter(f"{_MAIN_NS}c"):
+            column = _column_index(cell.get("r"))
+            value = cell.findtext(f"{_MAIN_NS}v")
+            if value is not None and cell.get("t") == "s":
+                value = shared_strings[int(value)]
+            values.extend([None] * (column + 1 - len(values)))
+            values[column] = value
+        yield values
+
+
+def measure(iter_rows, number):
+    """返回 (耗时中位数 ms, 内存峰值 bytes, 城市数据)"""
+    times = []
+    for _ in range(number):
+        start = time.perf_counter()
+        city_data = build_city_data_from_rows(iter_rows(XLSX_PATH))
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    build_city_data_from_rows(iter_rows(XLSX_PATH))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak, city_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="行政区划表读取基准测试")
+    parser.add_argument("-n", "--number", type=int, default=5, help="运行次数，取中位数")
+    args = parser.parse_args()
+    number = max(1, args.number)
+
+    stream_ms, stream_peak, stream_data = measure(iter_xlsx_rows, number)
+    dom_ms, dom_peak, dom_data = measure(iter_dom_rows, number)
+
+    work_dir = tempfile.mkdtemp(prefix="city-xlsx-")
+    try:
+        # 先放一份原有数据，差异相对于随程序发布的 city_data.json
+        output_path = os.path.join(work_dir, "city_data.json")
+        shutil.copy(os.path.join(ROOT, "resources", "city_data.json"), output_path)
+        start = time.perf_counter()
+        diff = CityDataGenerator(api_key="").generate_from_xlsx(XLSX_PATH, output_path)
+        build_ms = (time.perf_counter() - start) * 1000
+        from_json = CityIndex.from_json(output_path)
+        from_binary = CityIndex.from_binary(os.path.splitext(output_path)[0] + ".bin")
+        same_index = list(from_json.walk()) == list(from_binary.walk())
+        checks = {
+            "北京市的区县": len(from_binary.districts("北京市", "北京市")),
+            "东城区": from_binary.adcode("北京市", "北京市", "东城区"),
+            "济源市": from_binary.adcode("河南省", "济源市"),
+            "110101": from_binary.location("110101"),
+        }
+        from_binary._reader.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"stream: {stream_ms:.0f} ms，内存峰值 {stream_peak / 1024 / 1024:.1f} MB")
+    print(f"dom:    {dom_ms:.0f} ms，内存峰值 {dom_peak / 1024 / 1024:.1f} MB")
+    print(f"两种方式结果相同 {stream_data == dom_data}")
+    print(f"生成 JSON 和二进制: {build_ms:.0f} ms，两者加载后内容相同 {same_index}，"
+          f"新增 {len(diff['added'])} 个，删除 {len(diff['removed'])} 个，改名 {len(diff['renamed'])} 个")
+    for name, value in checks.items():
+        print(f"  {name}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
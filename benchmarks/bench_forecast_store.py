@@ -0,0 +1,115 @@
+"""天气预报解析和存储的耗时与空间
+
+使用一份高德天气接口 extensions=all 的返回数据，比较原样保存（与实况缓存相同的方式）
+和 ForecastStore 精简保存的磁盘大小、内存占用，并检查：
+- 同一份预报（reporttime 不变）重复获取时数据不替换，reporttime 变新时才替换；
+- 天气面板重绘预报时不发起请求。
+用法: python benchmarks/bench_forecast_store.py [-a 地区数量] [-n 解析次数]
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.forecast import ForecastStore, parse_forecast
+
+# 高德天气接口 extensions=all 的返回
+RECORDED_RESPONSE = json.loads("""
+{"status":"1","count":"1","info":"OK","infocode":"10000","forecasts":[{"city":"宝安区","adcode":"440306",
+"province":"广东","reporttime":"2024-05-20 11:03:07","casts":[
+{"date":"2024-05-20","week":"1","dayweather":"多云","nightweather":"雷阵雨","daytemp":"32","nighttemp":"26",
+"daywind":"南","nightwind":"南","daypower":"1-3","nightpower":"1-3","daytemp_float":"32.0","nighttemp_float":"26.0"},
+{"date":"2024-05-21","week":"2","dayweather":"雷阵雨","nightweather":"雷阵雨","daytemp":"31","nighttemp":"26",
+"daywind":"南","nightwind":"南","daypower":"1-3","nightpower":"1-3","daytemp_float":"31.0","nighttemp_float":"26.0"},
+{"date":"2024-05-22","week":"3","dayweather":"中雨","nightweather":"阵雨","daytemp":"30","nighttemp":"25",
+"daywind":"东南","nightwind":"东南","daypower":"1-3","nightpower":"1-3","daytemp_float":"30.0","nighttemp_float":"25.0"},
+{"date":"2024-05-23","week":"4","dayweather":"阵雨","nightweather":"多云","daytemp":"31","nighttemp":"25",
+"daywind":"南","nightwind":"南","daypower":"1-3","nightpower":"1-3","daytemp_float":"31.0","nighttemp_float":"25.0"}]}]}
+""")
+
+
+def forecast_data(adcode, reporttime=None):
+    """返回数据中的预报，换成指定的 adcode 和发布时间"""
+    data = copy.deepcopy(RECORDED_RESPONSE['forecasts'][0])
+    data['adcode'] = adcode
+    if reporttime:
+        data['reporttime'] = reporttime
+    return data
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return value, size
+
+
+def check_redraw_without_fetch(adcodes):
+    """重绘 1000 次预报，返回期间发起的请求数"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from gui.weather_client import get_weather_client
+    from gui.weather_widget import WeatherWidget
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    client = get_weather_client()
+    store = ForecastStore()
+    for adcode in adcodes:
+        store.update(parse_forecast(forecast_data(adcode)))
+    client.set_forecast_store(store)
+    widget = WeatherWidget()
+    widget.forecast_visible = True
+    widget._adcode_rows = {adcode: [0] for adcode in adcodes[:1]}
+    requests_before = client._next_id
+    for _ in range(1000):
+        widget.show_forecast(adcodes[0])
+        widget.repaint()
+    app.processEvents()
+    return client._next_id - requests_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="天气预报存储基准测试")
+    parser.add_argument("-a", "--adcodes", type=int, default=100, help="地区数量")
+    parser.add_argument("-n", "--number", type=int, default=10000, help="解析次数")
+    args = parser.parse_args()
+
+    data = forecast_data("440306")
+    start = time.perf_counter()
+    for _ in range(args.number):
+        parse_forecast(data)
+    parse_us = (time.perf_counter() - start) / args.number * 1e6
+
+    adcodes = [str(440300 + i) for i in range(args.adcodes)]
+    raw, raw_memory = measure_memory(lambda: {adcode: forecast_data(adcode) for adcode in adcodes})
+    store = ForecastStore()
+    _, store_memory = measure_memory(
+        lambda: [store.update(parse_forecast(raw[adcode])) for adcode in adcodes])
+    raw_bytes = len(json.dumps({'entries': {adcode: {'data': item, 'fetched_at': time.time()}
+                                            for adcode, item in raw.items()}},
+                               ensure_ascii=False).encode('utf-8'))
+    store_bytes = len(store.dumps().encode('utf-8'))
+
+    # 同一份预报重复获取，再获取一份更新的预报
+    unchanged = sum(store.update(parse_forecast(forecast_data(adcode))) for adcode in adcodes)
+    newer = sum(store.update(parse_forecast(forecast_data(adcode, "2024-05-20 18:03:07")))
+                for adcode in adcodes)
+
+    print(f"解析: {parse_us:.1f} us/次")
+    print(f"{args.adcodes} 个地区，磁盘: 原样 {raw_bytes / 1024:.1f} KB，精简 {store_bytes / 1024:.1f} KB；"
+          f"内存: 原样 {raw_memory / 1024:.1f} KB，精简 {store_memory / 1024:.1f} KB")
+    print(f"reporttime 不变时替换 {unchanged} 个，变新后替换 {newer} 个")
+    print(f"重绘 1000 次发起请求 {check_redraw_without_fetch(adcodes)} 次")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
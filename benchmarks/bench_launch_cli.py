@@ -0,0 +1,90 @@
+"""比较命令行模式与界面模式从进程启动到全部程序启动完成的耗时
+
+两种方式都在新进程中运行，使用同一份临时配置，被启动的程序是当前 Python 解释器
+（标准输入为空，启动后立即退出）。耗时在父进程中计时，从创建子进程算起，
+到子进程报告最后一个程序启动完成为止。
+用法: python benchmarks/bench_launch_cli.py [-n 次数] [-p 程序数量]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 界面模式：创建主窗口后立即点击“启动程序”，启动完成时输出一行
+GUI_SCRIPT = """
+import os, sys
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, {root!r})
+from PyQt6.QtCore import QTimer
+from gui.app import App
+
+app = App({config!r})
+window = app.window
+
+
+def start():
+    window.on_start_programs()
+    window.launch_worker.finished.connect(lambda results: (print("done", flush=True), app.app.quit()))
+
+
+QTimer.singleShot(0, start)
+app.run()
+"""
+
+
+def write_config(directory, count):
+    """生成启动 count 个程序的配置（不超过 10 个，避免界面弹出确认框）"""
+    config_path = os.path.join(directory, 'config.json')
+    programs = [{'name': f'program{i}', 'path': sys.executable} for i in range(count)]
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump({'programs': programs}, f)
+    return config_path
+
+
+def measure(command, is_done):
+    """从创建子进程到输出满足 is_done 的一行所用的时间 (ms)"""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True, encoding='utf-8')
+    elapsed = None
+    for line in process.stdout:
+        if is_done(line):
+            elapsed = (time.perf_counter() - start) * 1000
+            break
+    process.stdout.close()
+    process.wait()
+    if elapsed is None:
+        raise RuntimeError(f"子进程没有报告启动完成: {command}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="命令行模式与界面模式启动耗时对比")
+    parser.add_argument("-n", "--number", type=int, default=5, help="重复次数")
+    parser.add_argument("-p", "--programs", type=int, default=8, help="启动的程序数量（1-10）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = write_config(directory, max(1, min(10, args.programs)))
+        modes = {
+            "cli": ([sys.executable, os.path.join(ROOT, 'main.py'), '--launch',
+                     '--config', config_path, '--json'],
+                    lambda line: line.startswith('{')),
+            "gui": ([sys.executable, "-c", GUI_SCRIPT.format(root=ROOT, config=config_path)],
+                    lambda line: line.strip() == "done"),
+        }
+
+        print(f"{'模式':<8}{'平均(ms)':>12}{'最快(ms)':>12}")
+        for mode, (command, is_done) in modes.items():
+            results = [measure(command, is_done) for _ in range(args.number)]
+            print(f"{mode:<8}{sum(results) / len(results):>12.1f}{min(results):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""比较逐行创建控件与 model/delegate 两种程序列表的加载耗时和内存
+
+每种实现、每个规模都在单独的进程中测量，互不影响。
+用法: python benchmarks/bench_program_list.py [-s 10 1000 10000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程脚本：构建列表并显示，处理完事件后输出耗时 (ms) 和常驻内存 (KB)
+CHILD_SCRIPT = """
+import json, os, sys, time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, {root!r})
+
+
+def rss_kb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QApplication, QHBoxLayout, QLabel, QListView,
+                             QListWidget, QListWidgetItem, QPushButton, QWidget)
+
+app = QApplication(sys.argv)
+programs = [{{'name': f'program{{i}}.exe', 'path': f'C:/Program Files/Vendor/app{{i}}/program{{i}}.exe'}}
+            for i in range({size})]
+base_rss = rss_kb()
+start = time.perf_counter()
+
+if {kind!r} == 'widget':
+    # 旧实现：每行一个 QWidget，包含两个 QLabel 和一个 QPushButton
+    view = QListWidget()
+    for program in programs:
+        item = QListWidgetItem()
+        item.setData(Qt.ItemDataRole.UserRole, program)
+        item_widget = QWidget()
+        layout = QHBoxLayout()
+        layout.setContentsMargins(15, 5, 15, 5)
+        layout.setSpacing(10)
+        for text, width in ((program['name'], 220), (program['path'], 400)):
+            label = QLabel(text)
+            label.setFixedWidth(width)
+            layout.addWidget(label)
+        delete_btn = QPushButton("删除")
+        delete_btn.setFixedWidth(80)
+        delete_btn.setStyleSheet("QPushButton {{ border: none; color: #FF4444; }}")
+        layout.addWidget(delete_btn)
+        layout.addStretch()
+        item_widget.setLayout(layout)
+        item.setSizeHint(item_widget.sizeHint())
+        view.addItem(item)
+        view.setItemWidget(item, item_widget)
+else:
+    from gui.program_model import ProgramItemDelegate, ProgramListModel
+    view = QListView()
+    view.setUniformItemSizes(True)
+    model = ProgramListModel(parent=view)
+    view.setModel(model)
+    view.setItemDelegate(ProgramItemDelegate(view))
+    model.set_programs(programs)
+
+view.resize(900, 600)
+view.show()
+app.processEvents()
+elapsed = (time.perf_counter() - start) * 1000
+rss = rss_kb()
+print(json.dumps({{'ms': elapsed, 'rss': rss, 'delta': None if rss is None else rss - base_rss}}))
+"""
+
+
+def measure(kind, size):
+    """在新进程中测量一次"""
+    script = CHILD_SCRIPT.format(root=ROOT, kind=kind, size=size)
+    output = subprocess.run([sys.executable, "-c", script],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def format_kb(value):
+    return "n/a" if value is None else f"{value:.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="程序列表加载基准测试")
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=[10, 1000, 10000],
+                        help="程序数量")
+    args = parser.parse_args()
+
+    print(f"{'实现':<8}{'数量':>8}{'耗时(ms)':>12}{'内存(KB)':>12}{'增量(KB)':>12}")
+    for size in args.sizes:
+        for kind in ("widget", "model"):
+            result = measure(kind, size)
+            print(f"{kind:<8}{size:>8}{result['ms']:>12.1f}"
+                  f"{format_kb(result['rss']):>12}{format_kb(result['delta']):>12}")
+
+
+if __name__ == "__main__":
+    main()
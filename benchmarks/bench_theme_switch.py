@@ -0,0 +1,118 @@
+"""比较旧的逐控件样式表与主题样式表两种方式切换主题的耗时
+
+legacy: 旧实现，每行一个带样式表的控件，切换时重新拼接样式表并设置到主窗口。
+engine: 当前实现，MainWindow.apply_theme 设置按主题缓存的程序级样式表，列表由 delegate 绘制。
+每种实现、每个规模都在单独的进程中测量，每次切换后同步重绘整个窗口，
+输出第一次切换（样式表尚未缓存）和之后各次切换的中位数。
+用法: python benchmarks/bench_theme_switch.py [-s 1000 10000] [-n 20]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程脚本：创建窗口和列表，依次切换主题，输出每次切换的耗时 (ms)
+CHILD_SCRIPT = """
+import json, os, statistics, sys, tempfile, time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, {root!r})
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QApplication, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+                             QMainWindow, QPushButton, QWidget)
+
+app = QApplication(sys.argv)
+programs = [{{'name': f'program{{i}}.exe', 'path': f'C:/Program Files/Vendor/app{{i}}/program{{i}}.exe'}}
+            for i in range({size})]
+themes = ["默认主题", "黑色主题", "绿色主题"]
+
+if {kind!r} == 'legacy':
+    LEGACY_COLORS = {{
+        "默认主题": ("white", "#ddd", "#eee", "#f5f5f5", "white", "#ddd"),
+        "黑色主题": ("#2b2b2b", "#444", "#444", "#444", "#4a4a4a", "#555"),
+        "绿色主题": ("#e8f5e9", "#c8e6c9", "#c8e6c9", "#f1f8e9", "#81c784", "none"),
+    }}
+
+    def legacy_stylesheet(theme):
+        # 与旧的 apply_theme 一样，每次切换都重新拼接
+        window_bg, list_border, row_border, hover, button_bg, button_border = LEGACY_COLORS[theme]
+        sheet = "QMainWindow {{ background-color: " + window_bg + "; }}"
+        sheet += "QListView {{ border: 1px solid " + list_border + "; }}"
+        sheet += "QListView::item {{ border-bottom: 1px solid " + row_border + "; }}"
+        sheet += "QListView::item:hover {{ background-color: " + hover + "; }}"
+        sheet += "QPushButton {{ background-color: " + button_bg + "; border: 1px solid " + button_border + "; }}"
+        sheet += "QLabel {{ color: #333; }}"
+        return sheet + "QMessageBox, QInputDialog, QDialog {{ background-color: white; }}"
+
+    window = QMainWindow()
+    view = QListWidget()
+    for program in programs:
+        item = QListWidgetItem()
+        item_widget = QWidget()
+        layout = QHBoxLayout(item_widget)
+        layout.setContentsMargins(15, 5, 15, 5)
+        for text, width in ((program['name'], 220), (program['path'], 400)):
+            label = QLabel(text)
+            label.setFixedWidth(width)
+            label.setStyleSheet("QLabel {{ color: #333; font-size: 13px; }}")
+            layout.addWidget(label)
+        delete_btn = QPushButton("删除")
+        delete_btn.setFixedWidth(80)
+        delete_btn.setStyleSheet("QPushButton {{ border: none; color: #FF4444; }}"
+                                 "QPushButton:hover {{ color: white; background-color: #FF4444; }}")
+        layout.addWidget(delete_btn)
+        layout.addStretch()
+        item.setSizeHint(item_widget.sizeHint())
+        view.addItem(item)
+        view.setItemWidget(item, item_widget)
+    window.setCentralWidget(view)
+    switch = lambda theme: window.setStyleSheet(legacy_stylesheet(theme))
+else:
+    from gui.main_frame import MainWindow
+    config_dir = tempfile.mkdtemp()
+    window = MainWindow(None, os.path.join(config_dir, 'config.json'))
+    window.program_model.set_programs(programs)
+    switch = window.apply_theme
+
+window.resize(1100, 700)
+window.show()
+app.processEvents()
+
+timings = []
+for index in range({number}):
+    theme = themes[(index + 1) % len(themes)]
+    start = time.perf_counter()
+    switch(theme)
+    window.repaint()
+    app.processEvents()
+    timings.append((time.perf_counter() - start) * 1000)
+print(json.dumps({{'first': timings[0], 'median': statistics.median(timings[1:] or timings)}}))
+"""
+
+
+def measure(kind, size, number):
+    """在新进程中测量一次"""
+    script = CHILD_SCRIPT.format(root=ROOT, kind=kind, size=size, number=number)
+    output = subprocess.run([sys.executable, "-c", script],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="主题切换基准测试")
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=[1000], help="程序数量")
+    parser.add_argument("-n", "--number", type=int, default=20, help="每个进程中切换主题的次数")
+    args = parser.parse_args()
+
+    print(f"{'实现':<8}{'数量':>8}{'首次(ms)':>12}{'中位数(ms)':>12}")
+    for size in args.sizes:
+        for kind in ("legacy", "engine"):
+            result = measure(kind, size, max(2, args.number))
+            print(f"{kind:<8}{size:>8}{result['first']:>12.1f}{result['median']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
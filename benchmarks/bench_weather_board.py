@@ -0,0 +1,120 @@
+"""比较逐个请求与天气面板并发刷新多个位置的耗时
+
+在本地启动一个模拟的高德天气接口（每次请求固定延迟），通过 NM_AMAP_BASE_URL 指向它。
+serial: 旧的方式，每个位置依次请求一次。
+board: WeatherWidget.update_weather_info，按 adcode 合并重复的位置后在后台同时请求，
+       从调用到最后一行更新完成计时。
+用法: python benchmarks/bench_weather_board.py [--delay-ms 毫秒] [-n 次数]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 深圳市宝安区重复两次、广州市用两种写法，合并后是 5 个地区
+LOCATIONS = [
+    {'province': "广东省", 'city': "深圳市", 'district': "宝安区"},
+    {'province': "广东省", 'city': "深圳市", 'district': "南山区"},
+    {'province': "广东省", 'city': "深圳市", 'district': "宝安区"},
+    {'province': "广东省", 'city': "广州市", 'district': ""},
+    {'province': "广东省", 'city': "广州市"},
+    {'province': "浙江省", 'city': "杭州市", 'district': "西湖区"},
+    {'province': "江苏省", 'city': "南京市", 'district': "玄武区"},
+]
+
+
+class MockWeatherHandler(BaseHTTPRequestHandler):
+    delay = 0.2
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with MockWeatherHandler.lock:
+            MockWeatherHandler.requests += 1
+        time.sleep(self.delay)
+        adcode = parse_qs(urlparse(self.path).query).get('city', [''])[0]
+        body = json.dumps({'status': '1', 'lives': [{
+            'adcode': adcode, 'temperature': '25', 'winddirection': '南', 'windpower': '≤3',
+            'humidity': '60', 'weather': '晴', 'reporttime': '2024-01-01 12:00:00'}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="天气面板并发刷新基准测试")
+    parser.add_argument("--delay-ms", type=float, default=200, help="模拟接口每次请求的延迟 (ms)")
+    parser.add_argument("-n", "--number", type=int, default=5, help="运行次数，取中位数")
+    args = parser.parse_args()
+
+    MockWeatherHandler.delay = args.delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockWeatherHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["NM_AMAP_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, ROOT)
+
+    from PyQt6.QtCore import QEventLoop
+    from PyQt6.QtWidgets import QApplication
+    from gui.weather_client import get_weather_client
+    from gui.weather_widget import WeatherWidget
+    from utils.weather import get_adcode_by_location, get_weather_info
+    from utils.weather_cache import WeatherCache
+
+    app = QApplication(sys.argv)
+    client = get_weather_client()
+    widget = WeatherWidget()
+    widget.set_api_key("benchmark")
+    widget.set_locations(LOCATIONS)
+    # 建立连接，不计入测量
+    get_weather_info("110000", "benchmark")
+
+    serial, board, board_requests = [], [], []
+    for _ in range(max(1, args.number)):
+        start = time.perf_counter()
+        for location in LOCATIONS:
+            adcode = get_adcode_by_location(location['province'], location['city'],
+                                            location.get('district') or None)
+            get_weather_info(adcode, "benchmark")
+        serial.append((time.perf_counter() - start) * 1000)
+
+        # 每次都从空缓存开始
+        client.set_cache(WeatherCache())
+        requests_before = MockWeatherHandler.requests
+        loop = QEventLoop()
+
+        def on_finished(*_):
+            # 面板的槽先连接，先于这里处理结果
+            if not widget._weather_requests:
+                loop.quit()
+
+        client.finished.connect(on_finished)
+        start = time.perf_counter()
+        widget.update_weather_info()
+        loop.exec()
+        board.append((time.perf_counter() - start) * 1000)
+        client.finished.disconnect(on_finished)
+        board_requests.append(MockWeatherHandler.requests - requests_before)
+
+    server.shutdown()
+    print(f"位置 {len(LOCATIONS)} 个，模拟接口延迟 {args.delay_ms:.0f} ms")
+    print(f"serial: {statistics.median(serial):.0f} ms，请求 {len(LOCATIONS)} 次")
+    print(f"board:  {statistics.median(board):.0f} ms，请求 {board_requests[-1]} 次")
+    del app
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
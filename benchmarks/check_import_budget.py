@@ -0,0 +1,76 @@
+"""检查界面首次绘制前的导入耗时是否超出预算
+
+用 python -X importtime 导入界面入口 (gui.app) 及 main.py 用到的模块（包括单实例检查），取多次运行的中位数。
+超出预算，或导入了只有启用天气后才需要的模块时，以非零退出码结束，可以放在构建脚本中作为回归检查。
+tests/test_import_budget.py 用同样的检查在测试中运行。
+用法: python benchmarks/check_import_budget.py [--budget-ms 毫秒] [-n 次数]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 首次绘制前导入的模块
+ENTRY_MODULES = ("argparse", "utils.single_instance", "multiprocessing.connection", "gui.app")
+# 默认预算 (ms)，包含 PyQt6 本身的导入
+DEFAULT_BUDGET_MS = 150
+# 首次绘制前不应该出现的模块：网络请求和拼音词典只在启用天气、打开对话框时才需要
+FORBIDDEN_MODULES = ("requests", "urllib3", "charset_normalizer", "pypinyin",
+                     "gui.weather_widget", "gui.launch_stats_dialog", "concurrent.futures")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_importtime():
+    """运行一次，返回 {模块: (自身耗时 us, 累计耗时 us, 缩进层级)}"""
+    script = f"import {', '.join(ENTRY_MODULES)}"
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stderr
+    modules = {}
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent))
+    return modules
+
+
+def import_total_ms(modules):
+    """入口模块是顶层导入，它们的累计耗时之和即总耗时 (ms)"""
+    return sum(modules[name][1] for name in ENTRY_MODULES if name in modules) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="界面启动导入耗时预算检查")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="导入耗时预算 (ms)")
+    parser.add_argument("-n", "--number", type=int, default=5, help="运行次数，取中位数")
+    parser.add_argument("--top", type=int, default=10, help="列出自身耗时最多的模块数量")
+    args = parser.parse_args()
+
+    runs = [run_importtime() for _ in range(max(1, args.number))]
+    total_ms = statistics.median(import_total_ms(modules) for modules in runs)
+
+    last = runs[-1]
+    print(f"{'模块':<40}{'自身(ms)':>10}{'累计(ms)':>10}")
+    for name, (self_us, cumulative_us, _) in sorted(last.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{name:<40}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+    print(f"\n导入总耗时（中位数）: {total_ms:.1f} ms，预算: {args.budget_ms:.0f} ms")
+
+    failed = False
+    forbidden = [name for name in FORBIDDEN_MODULES if name in last]
+    if forbidden:
+        print(f"首次绘制前不应导入: {', '.join(forbidden)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("导入耗时超出预算")
+        failed = True
+    print("失败" if failed else "通过")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
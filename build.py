@@ -1,6 +1,24 @@
-import PyInstaller.__main__
+import argparse
+import json
 import os
 import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# 打包方式 -> (spec 文件, 生成的可执行文件)
+EXE_SUFFIX = '.exe' if sys.platform == 'win32' else ''
+VARIANTS = {
+    # 单文件：分发方便，但每次启动都要先把全部内容解压到临时目录
+    'onefile': ('NM启动器.spec', os.path.join('dist', 'NM启动器' + EXE_SUFFIX)),
+    # 快速启动：目录模式，字节码优化，不打包运行时用不到的资源
+    'fast': ('NM启动器_fast.spec', os.path.join('dist', 'NM启动器_fast', 'NM启动器_fast' + EXE_SUFFIX)),
+}
+
+# 基准测试中单次启动的超时时间 (秒)
+BENCHMARK_TIMEOUT = 60
 
 def clean_build_folders():
     """清理构建文件夹"""
@@ -10,22 +28,110 @@ def clean_build_folders():
             shutil.rmtree(folder)
             print(f"已删除 {folder} 文件夹")
 
-def build():
+def build(variants=('onefile',)):
     """执行打包"""
+    import PyInstaller.__main__
+
     print("开始打包...")
-    
+
     # 清理旧的构建文件
     clean_build_folders()
-    
-    # 使用 spec 文件打包
-    PyInstaller.__main__.run([
-        'NM启动器.spec',
-        '--clean',  # 清理临时文件
-        '--noconfirm',  # 不询问确认
-    ])
-    
+
+    for variant in variants:
+        spec_file, executable = VARIANTS[variant]
+        print(f"正在打包 {variant} ({spec_file})...")
+        # 使用 spec 文件打包
+        PyInstaller.__main__.run([
+            spec_file,
+            '--clean',  # 清理临时文件
+            '--noconfirm',  # 不询问确认
+        ])
+        print(f"{variant} 打包完成：{executable}")
+
     print("打包完成！")
     print("可执行文件位于 dist 目录下")
 
+def drop_file_cache():
+    """尽量清空系统文件缓存（仅 Linux 且有权限时），返回是否成功"""
+    try:
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f:
+            f.write('3\n')
+        return True
+    except (AttributeError, OSError):
+        return False
+
+def run_once(executable, report_path):
+    """启动一次并在首次绘制后退出，返回 (进程耗时 ms, 首次绘制 ms)"""
+    start = time.perf_counter()
+    subprocess.run([executable, '--profile-startup', report_path, '--profile-exit'],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   timeout=BENCHMARK_TIMEOUT, check=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    with open(report_path, 'r', encoding='utf-8') as f:
+        first_paint_ms = json.load(f)['total_ms']
+    return wall_ms, first_paint_ms
+
+def copy_variant(variant, target_dir):
+    """把打包结果复制到新目录，返回其中的可执行文件路径"""
+    executable = VARIANTS[variant][1]
+    if variant == 'onefile':
+        return shutil.copy2(executable, target_dir)
+    folder = os.path.dirname(executable)
+    copied = shutil.copytree(folder, os.path.join(target_dir, os.path.basename(folder)))
+    return os.path.join(copied, os.path.basename(executable))
+
+def benchmark(variants, cold_runs=3, warm_runs=5):
+    """比较各打包方式的冷启动和热启动耗时
+
+    冷启动：每次把打包结果复制到新目录再运行（新文件会被杀毒软件重新扫描，
+    有权限时还会清空文件缓存）；热启动：在同一位置连续运行，丢弃第一次。
+    耗时取中位数，首次绘制时间来自 --profile-startup 报告（从进程创建算起）。
+    """
+    print(f"{'方式':<10}{'冷启动(ms)':>12}{'冷首绘(ms)':>12}{'热启动(ms)':>12}{'热首绘(ms)':>12}")
+    for variant in variants:
+        if not os.path.exists(VARIANTS[variant][1]):
+            print(f"{variant:<10}未找到 {VARIANTS[variant][1]}，请先打包")
+            continue
+        with tempfile.TemporaryDirectory() as work_dir:
+            report_path = os.path.join(work_dir, 'startup_profile.json')
+
+            cold = []
+            dropped = True
+            for index in range(cold_runs):
+                run_dir = os.path.join(work_dir, f'cold{index}')
+                os.makedirs(run_dir)
+                executable = copy_variant(variant, run_dir)
+                dropped = drop_file_cache() and dropped
+                cold.append(run_once(executable, report_path))
+
+            executable = os.path.abspath(VARIANTS[variant][1])
+            run_once(executable, report_path)
+            warm = [run_once(executable, report_path) for _ in range(warm_runs)]
+
+        median = lambda results, column: statistics.median(result[column] for result in results)
+        print(f"{variant:<10}{median(cold, 0):>12.0f}{median(cold, 1):>12.0f}"
+              f"{median(warm, 0):>12.0f}{median(warm, 1):>12.0f}")
+        if not dropped:
+            print(f"{'':<10}（没有权限清空文件缓存，冷启动时文件可能仍在系统缓存中）")
+
+def main():
+    parser = argparse.ArgumentParser(description="打包 NM启动器")
+    parser.add_argument("--variant", choices=list(VARIANTS) + ['all'],
+                        help="打包方式：onefile 单文件（打包时的默认值），fast 快速启动目录版，"
+                             "all 全部（基准测试时的默认值）")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="不打包，测量已打包版本的冷启动和热启动耗时")
+    parser.add_argument("--cold-runs", type=int, default=3, help="冷启动测量次数")
+    parser.add_argument("--warm-runs", type=int, default=5, help="热启动测量次数")
+    args = parser.parse_args()
+
+    variant = args.variant or ('all' if args.benchmark else 'onefile')
+    variants = list(VARIANTS) if variant == 'all' else [variant]
+    if args.benchmark:
+        benchmark(variants, max(1, args.cold_runs), max(1, args.warm_runs))
+    else:
+        build(variants)
+
 if __name__ == "__main__":
-    build() 
\ No newline at end of file
+    main()
@@ -1,30 +1,198 @@
+import argparse
 import json
 import os
-from typing import Dict, List, Optional
-import requests
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.amap_client import get_amap_client
+from utils.city_binary import write_city_binary
+from utils.config import atomic_write
+from utils.xlsx import XlsxError, iter_xlsx_rows
+
+# 按省份获取时同时请求的省份数
+DEFAULT_PROVINCE_WORKERS = 4
+# 已完成省份的断点目录，全部完成后删除
+DEFAULT_CHECKPOINT_DIR = "city_data.parts"
+# 随程序发布的行政区划表，列为 中文名、adcode、citycode
+DEFAULT_XLSX_PATH = os.path.join("resources", "adcode.xlsx")
+
+
+def province_node(province: Dict) -> Dict:
+    """把接口返回的一个省份转换为 city_data.json 中的结构"""
+    return {
+        "name": province["name"],
+        "adcode": province["adcode"],
+        "cities": {
+            city["name"]: {
+                "name": city["name"],
+                "adcode": city["adcode"],
+                "districts": {
+                    district["name"]: {"name": district["name"], "adcode": district["adcode"]}
+                    for district in city.get("districts", [])
+                },
+            }
+            for city in province.get("districts", [])
+        },
+    }
+
+
+def is_adcode(value) -> bool:
+    """是否为 6 位数字的 adcode"""
+    return isinstance(value, str) and len(value) == 6 and value.isdigit()
+
+
+def build_city_data_from_rows(rows: Iterable[List[Optional[str]]]) -> Dict[str, Dict]:
+    """根据 adcode 的层级（省 2 位、市 2 位、区县 2 位）把行政区划表的各行组织成 city_data.json 的结构
+
+    第一行是表头，按列名找到“中文名”和“adcode”两列。
+    - 后四位为 0 的是省级，后两位为 0 的是市级，其余为区县，挂在前四位相同的市下面；
+    - 没有市级的省份（直辖市、特别行政区）下面只有一个与省份同名的市，区县都挂在它下面；
+    - 找不到所属市的区县（省直辖的县级市，例如济源市、仙桃市）作为市级。
+    """
+    rows = iter(rows)
+    header = [str(value or "").strip() for value in next(rows, [])]
+    name_column = header.index("中文名") if "中文名" in header else 0
+    adcode_column = header.index("adcode") if "adcode" in header else 1
+
+    provinces: Dict[str, Dict] = {}
+    city_rows = []
+    district_rows = []
+    for row in rows:
+        if len(row) <= max(name_column, adcode_column):
+            continue
+        name, adcode = (row[name_column] or "").strip(), (row[adcode_column] or "").strip()
+        if not name or not is_adcode(adcode):
+            continue
+        if adcode.endswith("0000"):
+            provinces[adcode[:2]] = {"name": name, "adcode": adcode, "cities": {}}
+        elif adcode.endswith("00"):
+            city_rows.append((name, adcode))
+        else:
+            district_rows.append((name, adcode))
+
+    cities: Dict[str, Dict] = {}
+    for name, adcode in city_rows:
+        province = provinces.get(adcode[:2])
+        if province is None:
+            print(f"找不到 {name}（{adcode}）所属的省份，已跳过")
+            continue
+        cities[adcode] = province["cities"][name] = {"name": name, "adcode": adcode, "districts": {}}
+    with_cities = {adcode[:2] for adcode in cities}
+
+    for name, adcode in district_rows:
+        city = cities.get(adcode[:4] + "00")
+        province = provinces.get(adcode[:2])
+        if city is None and province is not None:
+            if adcode[:2] in with_cities:
+                province["cities"][name] = {"name": name, "adcode": adcode, "districts": {}}
+                continue
+            city = province["cities"].setdefault(
+                province["name"], {"name": province["name"], "adcode": province["adcode"], "districts": {}})
+        if city is None:
+            print(f"找不到 {name}（{adcode}）所属的省份，已跳过")
+            continue
+        city["districts"][name] = {"name": name, "adcode": adcode}
+
+    return {province["name"]: province for province in provinces.values()}
+
+
+def flatten_city_data(city_data: Iterable[Tuple[str, Dict]]) -> Dict[str, str]:
+    """展开为 {adcode: "省 市 区"}，同一 adcode 出现多次时保留第一次"""
+    flat: Dict[str, str] = {}
+    for province, province_data in city_data:
+        flat.setdefault(province_data.get("adcode"), province)
+        for city, city_info in province_data.get("cities", {}).items():
+            flat.setdefault(city_info.get("adcode"), f"{province} {city}")
+            for district, district_info in city_info.get("districts", {}).items():
+                flat.setdefault(district_info.get("adcode"), f"{province} {city} {district}")
+    flat.pop(None, None)
+    return flat
+
+
+def diff_city_data(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[Dict]]:
+    """比较两份展开后的城市数据，返回新增、删除和改名（含调整上级）的 adcode"""
+    return {
+        "added": [{"adcode": adcode, "name": new[adcode]}
+                  for adcode in sorted(new.keys() - old.keys())],
+        "removed": [{"adcode": adcode, "name": old[adcode]}
+                    for adcode in sorted(old.keys() - new.keys())],
+        "renamed": [{"adcode": adcode, "old": old[adcode], "new": new[adcode]}
+                    for adcode in sorted(old.keys() & new.keys()) if old[adcode] != new[adcode]],
+    }
+
+
+def load_flat_city_data(json_path: str) -> Dict[str, str]:
+    """读取已有的城市数据并展开，文件不存在或无法读取时返回空字典"""
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return flatten_city_data(json.load(f).items())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"读取已有的城市数据失败: {str(e)}")
+        return {}
+
+
+def read_checkpoint(path: str):
+    """读取断点文件，无法读取或不是有效的 JSON 时返回 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class CityJsonWriter:
+    """按省份逐个写出 city_data.json，格式与 json.dump(indent=2) 相同
+
+    先写入临时文件，commit 时替换目标文件，中途失败不会破坏原有文件。
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.temp_path = output_path + ".tmp"
+        self._file = open(self.temp_path, 'w', encoding='utf-8')
+        self._file.write("{")
+        self._count = 0
+
+    def write(self, name: str, node: Dict):
+        body = json.dumps(node, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self._file.write(f"{',' if self._count else ''}\n  {json.dumps(name, ensure_ascii=False)}: {body}")
+        self._count += 1
+
+    def commit(self):
+        self._file.write("\n}" if self._count else "}")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.temp_path, self.output_path)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
 
 class CityDataGenerator:
     """城市数据生成器"""
     
-    API_URL = "https://restapi.amap.com/v3/config/district"
-    
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.city_data: Dict[str, Dict] = {}
         
-    def fetch_district_data(self, keywords: str = "中国") -> Optional[List[Dict]]:
-        """获取行政区划数据"""
+    def fetch_district_data(self, keywords: str = "中国", subdistrict: int = 3) -> Optional[List[Dict]]:
+        """获取行政区划数据，subdistrict 为下级行政区的层数"""
         params = {
             "key": self.api_key,
             "keywords": keywords,
-            "subdistrict": 3,  # 获取三级行政区划
+            "subdistrict": subdistrict,  # 默认获取三级行政区划
             "extensions": "base"
         }
         
         try:
-            response = requests.get(self.API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = get_amap_client().get("district", params)
             
             if data["status"] == "1" and data["districts"]:
                 return data["districts"]
@@ -37,26 +205,7 @@ class CityDataGenerator:
     def process_district_data(self, districts: List[Dict]):
         """处理行政区划数据"""
         for province in districts[0]["districts"]:
-            province_name = province["name"]
-            self.city_data[province_name] = {
-                "adcode": province["adcode"],
-                "cities": {}
-            }
-            
-            # 处理城市
-            for city in province["districts"]:
-                city_name = city["name"]
-                self.city_data[province_name]["cities"][city_name] = {
-                    "adcode": city["adcode"],
-                    "districts": {}
-                }
-                
-                # 处理区县
-                for district in city["districts"]:
-                    district_name = district["name"]
-                    self.city_data[province_name]["cities"][city_name]["districts"][district_name] = {
-                        "adcode": district["adcode"]
-                    }
+            self.city_data[province["name"]] = province_node(province)
                     
     def save_data(self, output_path: str):
         """保存城市数据到文件"""
@@ -67,6 +216,17 @@ class CityDataGenerator:
             print(f"城市数据已保存到: {output_path}")
         except Exception as e:
             print(f"保存城市数据失败: {str(e)}")
+            return
+
+        self.save_binary(os.path.splitext(output_path)[0] + ".bin")
+
+    def save_binary(self, output_path: str):
+        """保存二进制格式的城市数据，供 utils.weather 通过 mmap 读取"""
+        try:
+            write_city_binary(self.city_data, output_path)
+            print(f"二进制城市数据已保存到: {output_path}")
+        except Exception as e:
+            print(f"保存二进制城市数据失败: {str(e)}")
             
     def generate(self, output_path: str) -> bool:
         """生成城市数据"""
@@ -88,17 +248,261 @@ class CityDataGenerator:
         
         return True
 
+    def generate_from_xlsx(self, xlsx_path: str, output_path: str) -> Optional[Dict[str, List[Dict]]]:
+        """不请求接口，从行政区划表生成城市数据，返回与原有数据的差异，失败时返回 None
+
+        表格按行流式读取，不加载整个工作簿。
+        """
+        try:
+            self.city_data = build_city_data_from_rows(iter_xlsx_rows(xlsx_path))
+        except (OSError, XlsxError) as e:
+            print(f"读取行政区划表失败: {str(e)}")
+            return None
+        if not self.city_data:
+            print("行政区划表中没有数据")
+            return None
+
+        old = load_flat_city_data(output_path)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        writer = CityJsonWriter(output_path)
+        try:
+            for name, node in self.city_data.items():
+                writer.write(name, node)
+            writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+        print(f"城市数据已保存到: {output_path}")
+        self.save_binary(os.path.splitext(output_path)[0] + ".bin")
+        return diff_city_data(old, flatten_city_data(self.city_data.items()))
+
+    def fetch_province(self, province: Dict) -> Optional[Dict]:
+        """获取一个省份的城市和区县，失败时返回 None"""
+        districts = self.fetch_district_data(province["adcode"], subdistrict=2)
+        for item in districts or []:
+            # 按 adcode 查询，只取完全匹配的一项
+            if item.get("adcode") == province["adcode"]:
+                return province_node(item)
+        return None
+
+    def load_province_list(self, checkpoint_dir: str) -> Optional[List[Dict]]:
+        """获取省份列表，续传时使用断点中保存的列表，保证顺序和范围不变
+
+        断点中的列表无法读取或格式不对时重新获取。
+        """
+        list_path = os.path.join(checkpoint_dir, "provinces.json")
+        if os.path.exists(list_path):
+            provinces = read_checkpoint(list_path)
+            if (isinstance(provinces, list) and provinces
+                    and all(isinstance(item, dict) and isinstance(item.get("name"), str)
+                            and is_adcode(item.get("adcode")) for item in provinces)):
+                return provinces
+            print(f"断点中的省份列表 {list_path} 无法使用，重新获取")
+        districts = self.fetch_district_data(subdistrict=1)
+        if not districts:
+            return None
+        provinces = [{"name": item["name"], "adcode": item["adcode"]}
+                     for item in districts[0]["districts"]]
+        atomic_write(list_path, json.dumps(provinces, ensure_ascii=False).encode('utf-8'))
+        return provinces
+
+    def generate_by_province(self, output_path: str, max_workers: int = DEFAULT_PROVINCE_WORKERS,
+                             checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR,
+                             restart: bool = False) -> Optional[Dict[str, List[Dict]]]:
+        """按省份并发获取城市数据，返回与原有数据的差异，有省份失败时返回 None
+
+        每个完成的省份立即保存到 checkpoint_dir，失败后再次运行只获取未完成的省份；
+        restart 为 True 时忽略已有的断点。省份按列表顺序写入输出文件，前面的省份完成后就写出，
+        全部完成后才替换原有文件并删除断点。
+        """
+        if restart and os.path.isdir(checkpoint_dir):
+            # 只删除断点文件：provinces.json 和 <adcode>.json
+            for name in os.listdir(checkpoint_dir):
+                if name == "provinces.json" or (name.endswith(".json") and name[:-5].isdigit()):
+                    os.remove(os.path.join(checkpoint_dir, name))
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+        provinces = self.load_province_list(checkpoint_dir)
+        if not provinces:
+            print("获取省份列表失败")
+            return None
+
+        def checkpoint_path(province):
+            return os.path.join(checkpoint_dir, f"{province['adcode']}.json")
+
+        def load(index):
+            """读取已完成省份的断点，无法读取或内容不对时返回 None"""
+            node = read_checkpoint(checkpoint_path(provinces[index]))
+            if (not isinstance(node, dict) or node.get("adcode") != provinces[index]["adcode"]
+                    or not isinstance(node.get("cities"), dict)):
+                return None
+            return node
+
+        def fetch(index):
+            node = self.fetch_province(provinces[index])
+            if node is not None:
+                atomic_write(checkpoint_path(provinces[index]),
+                             json.dumps(node, ensure_ascii=False).encode('utf-8'))
+            return index, node
+
+        # 损坏的断点（例如被其他程序改写）当作未完成，重新获取
+        done = []
+        for index, province in enumerate(provinces):
+            finished = os.path.exists(checkpoint_path(province))
+            if finished and load(index) is None:
+                print(f"{province['name']} 的断点无法读取，重新获取")
+                os.remove(checkpoint_path(province))
+                finished = False
+            done.append(finished)
+        pending = [index for index, finished in enumerate(done) if not finished]
+        print(f"共 {len(provinces)} 个省份，已完成 {len(provinces) - len(pending)} 个，"
+              f"需要获取 {len(pending)} 个")
+
+        old = load_flat_city_data(output_path)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        writer = CityJsonWriter(output_path)
+        self.city_data = {}
+        # 按顺序写出：ready 中保存已完成、但前面还有省份未完成的数据
+        ready: Dict[int, Dict] = {}
+        next_index = 0
+        failed = []
+
+        def write_ready():
+            nonlocal next_index
+            while next_index < len(provinces) and (next_index in ready or done[next_index]):
+                node = ready.pop(next_index, None) or load(next_index)
+                writer.write(provinces[next_index]["name"], node)
+                self.city_data[provinces[next_index]["name"]] = node
+                next_index += 1
+
+        try:
+            write_ready()
+            if pending:
+                workers = max(1, min(max_workers, len(pending)))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="city-data") as executor:
+                    for future in as_completed([executor.submit(fetch, index) for index in pending]):
+                        index, node = future.result()
+                        if node is None:
+                            failed.append(provinces[index]["name"])
+                            continue
+                        print(f"已获取 {provinces[index]['name']}")
+                        done[index] = True
+                        ready[index] = node
+                        write_ready()
+            if failed:
+                print(f"以下省份获取失败，再次运行将继续获取（--restart 重新获取全部）：{'、'.join(failed)}")
+                writer.abort()
+                return None
+            writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+        print(f"城市数据已保存到: {output_path}")
+        self.save_binary(os.path.splitext(output_path)[0] + ".bin")
+
+        for province in provinces:
+            os.remove(checkpoint_path(province))
+        os.remove(os.path.join(checkpoint_dir, "provinces.json"))
+        try:
+            os.rmdir(checkpoint_dir)
+        except OSError:
+            pass
+        return diff_city_data(old, flatten_city_data(self.city_data.items()))
+
+
+def print_diff(diff: Dict[str, List[Dict]], limit: int = 20):
+    """打印差异摘要"""
+    print(f"与原有数据相比：新增 {len(diff['added'])} 个，删除 {len(diff['removed'])} 个，"
+          f"改名 {len(diff['renamed'])} 个")
+    for item in diff["added"][:limit]:
+        print(f"  + {item['adcode']} {item['name']}")
+    for item in diff["removed"][:limit]:
+        print(f"  - {item['adcode']} {item['name']}")
+    for item in diff["renamed"][:limit]:
+        print(f"  * {item['adcode']} {item['old']} -> {item['new']}")
+
+
+def report_diff(diff: Dict[str, List[Dict]], diff_path: Optional[str] = None):
+    """打印差异，指定路径时同时保存为 JSON"""
+    print_diff(diff)
+    if diff_path:
+        with open(diff_path, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, ensure_ascii=False, indent=2)
+        print(f"差异已保存到: {diff_path}")
+
+
+def compile_data(json_path: str) -> bool:
+    """将已有的城市数据 JSON 编译为二进制格式"""
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            city_data = json.load(f)
+    except Exception as e:
+        print(f"读取城市数据失败: {str(e)}")
+        return False
+
+    generator = CityDataGenerator(api_key="")
+    generator.city_data = city_data
+    generator.save_binary(os.path.splitext(json_path)[0] + ".bin")
+    return True
+
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="生成城市数据")
+    parser.add_argument("--compile", action="store_true",
+                        help="不请求接口，只把已有的 city_data.json 编译为二进制格式")
+    parser.add_argument("--by-province", action="store_true",
+                        help="按省份并发获取，中断或失败后再次运行只获取未完成的省份")
+    parser.add_argument("--workers", type=int, default=DEFAULT_PROVINCE_WORKERS,
+                        help="按省份获取时同时请求的省份数")
+    parser.add_argument("--checkpoint-dir", default=DEFAULT_CHECKPOINT_DIR, help="断点目录")
+    parser.add_argument("--restart", action="store_true", help="忽略已有的断点，重新获取全部省份")
+    parser.add_argument("--diff", metavar="PATH", help="把与原有数据的差异写入 JSON 文件")
+    parser.add_argument("--from-xlsx", nargs="?", const=DEFAULT_XLSX_PATH, metavar="XLSX",
+                        help="不请求接口，从行政区划表生成，默认使用 resources/adcode.xlsx")
+    args = parser.parse_args()
+
     # 高德地图API密钥
     API_KEY = "your_api_key_here"  # 替换为你的API密钥
     
     # 输出文件路径
     output_path = os.path.join("resources", "city_data.json")
+
+    if args.compile:
+        if compile_data(output_path):
+            print("城市数据编译完成！")
+        else:
+            print("城市数据编译失败！")
+        return
+
+    if args.from_xlsx:
+        # 同时统计耗时和 Python 内存分配的峰值（开启跟踪会让耗时略有增加）
+        tracemalloc.start()
+        start = time.perf_counter()
+        diff = CityDataGenerator(api_key="").generate_from_xlsx(args.from_xlsx, output_path)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if diff is None:
+            print("城市数据生成失败！")
+            return
+        report_diff(diff, args.diff)
+        print(f"耗时 {elapsed * 1000:.0f} ms，内存峰值 {peak / 1024 / 1024:.1f} MB")
+        print("城市数据生成完成！")
+        return
     
     # 生成城市数据
     generator = CityDataGenerator(API_KEY)
+    if args.by_province:
+        diff = generator.generate_by_province(output_path, args.workers, args.checkpoint_dir,
+                                              args.restart)
+        if diff is None:
+            print("城市数据生成失败！")
+            return
+        report_diff(diff, args.diff)
+        print("城市数据生成完成！")
+        return
+
     if generator.generate(output_path):
         print("城市数据生成完成！")
     else:
@@ -1,16 +1,54 @@
+from PyQt6.QtCore import QEvent, QObject, QTimer
 from PyQt6.QtWidgets import QApplication
 from gui.main_frame import MainWindow
+from utils.startup_profile import get_startup_profiler, startup_mark
 import sys
 import os
 
+
+class FirstPaintWatcher(QObject):
+    """第一次绘制完成后记录 first_paint 并写出启动计时报告"""
+
+    def __init__(self, app, profiler):
+        super().__init__(app)
+        self.app = app
+        self.profiler = profiler
+        self._painted = False
+        app.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if not self._painted and event.type() == QEvent.Type.Paint:
+            self._painted = True
+            self.app.removeEventFilter(self)
+            # 这一轮绘制处理完后再记录
+            QTimer.singleShot(0, self.finish)
+        return False
+
+    def finish(self):
+        startup_mark("first_paint")
+        report = self.profiler.write()
+        print(f"启动计时：首次绘制 {report['total_ms']:.0f} ms，报告已保存到 {os.path.abspath(self.profiler.report_path)}")
+        if self.profiler.exit_after_report:
+            self.app.quit()
+
+
 class App:
-    def __init__(self):
+    def __init__(self, config_path=None, instance_server=None):
         self.app = QApplication(sys.argv)
+        startup_mark("qapplication")
+        profiler = get_startup_profiler()
+        if profiler is not None:
+            self.paint_watcher = FirstPaintWatcher(self.app, profiler)
         # 使用相对路径获取图标
         base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         icon_path = os.path.join(base_path, 'resources', 'nm.ico')
-        self.window = MainWindow(icon_path)
+        self.window = MainWindow(icon_path, config_path)
+        startup_mark("main_window")
         self.window.show()
+        startup_mark("show")
+        # 窗口创建好后才处理其他进程转发来的命令
+        if instance_server is not None:
+            instance_server.on_command = self.window.handle_instance_command
         
     def run(self):
-        return self.app.exec()
\ No newline at end of file
+        return self.app.exec()
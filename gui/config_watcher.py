@@ -0,0 +1,61 @@
+import os
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+# 文件停止变化多久后才重新加载 (ms)，避免读到写了一半的文件
+RELOAD_DELAY_MS = 300
+
+
+class ConfigWatcher(QObject):
+    """监视配置文件的外部修改，内容变化时发出 changed(config_data)
+
+    同时监视文件和所在目录：原子替换会让文件监视失效，目录监视可以发现新文件，
+    之后再把文件重新加入监视。自己写入的内容由 ConfigManager 按哈希忽略。
+    """
+
+    changed = pyqtSignal(object)
+
+    def __init__(self, config_manager, parent=None, delay_ms=RELOAD_DELAY_MS):
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self._signature = self._stat()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._reload)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._watch()
+
+    def _stat(self):
+        """配置文件的修改时间和大小，文件不存在时返回 None"""
+        try:
+            stat = os.stat(self.config_manager.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _watch(self):
+        path = self.config_manager.config_path
+        directory = os.path.dirname(path)
+        if os.path.isdir(directory) and directory not in self._watcher.directories():
+            self._watcher.addPath(directory)
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+    def _schedule(self, _path):
+        # 每次变化都重新计时，连续写入只触发一次加载
+        self._timer.start()
+
+    def _reload(self):
+        self._watch()
+        # 目录中其他文件（启动记录、天气缓存）变化时配置文件不变，直接跳过
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+        config_data = self.config_manager.reload_config()
+        if config_data is not None:
+            self.changed.emit(config_data)
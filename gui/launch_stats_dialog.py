@@ -0,0 +1,70 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget,
+                           QTableWidgetItem, QPushButton, QLabel, QHeaderView)
+from PyQt6.QtCore import Qt
+
+
+def format_ms(value):
+    """格式化毫秒数"""
+    if value is None:
+        return "-"
+    if value >= 1000:
+        return f"{value / 1000:.1f} s"
+    return f"{value:.0f} ms"
+
+
+class LaunchStatsDialog(QDialog):
+    """按程序显示启动耗时的 p50/p95 和失败情况"""
+
+    HEADERS = ["程序名称", "启动次数", "失败次数", "启动耗时 p50", "启动耗时 p95",
+               "就绪耗时 p50", "就绪耗时 p95", "最近错误"]
+
+    def __init__(self, telemetry, parent=None):
+        super().__init__(parent)
+        self.telemetry = telemetry
+        self.setWindowTitle("启动统计")
+        self.resize(900, 400)
+
+        layout = QVBoxLayout(self)
+        tip = QLabel("启动耗时为调用启动到进程创建完成，就绪耗时为到程序可以响应输入或满足就绪条件。")
+        tip.setWordWrap(True)
+        layout.addWidget(tip)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(
+            len(self.HEADERS) - 1, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("刷新")
+        refresh_button.clicked.connect(self.refresh)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        button_layout.addStretch()
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        """重新读取启动记录"""
+        # 就绪最慢的排在前面，方便调整顺序或删除
+        summary = sorted(self.telemetry.summary(),
+                         key=lambda row: row['ready_p95'] or row['spawn_p95'] or 0, reverse=True)
+        self.table.setRowCount(len(summary))
+        for row, stats in enumerate(summary):
+            values = [stats['name'], str(stats['count']), str(stats['failures']),
+                      format_ms(stats['spawn_p50']), format_ms(stats['spawn_p95']),
+                      format_ms(stats['ready_p50']), format_ms(stats['ready_p95']),
+                      stats['last_error'] or ""]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 0:
+                    item.setToolTip(stats['path'])
+                elif 0 < column < len(values) - 1:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
@@ -0,0 +1,39 @@
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal
+from utils.launcher import LaunchEngine
+
+
+class LaunchWorker(QObject):
+    """在后台线程运行 LaunchEngine，并通过信号把进度送回界面"""
+
+    # 单个程序的启动结果
+    progress = pyqtSignal(object)
+    # 全部结果列表
+    finished = pyqtSignal(object)
+
+    def __init__(self, plan, max_workers, parent=None, pacer=None, telemetry=None, supervisor=None):
+        super().__init__(parent)
+        self.engine = LaunchEngine(None, max_workers, on_progress=self.progress.emit,
+                                   plan=plan, pacer=pacer, telemetry=telemetry,
+                                   supervisor=supervisor)
+        self._thread = None
+
+    def start(self):
+        """开始启动"""
+        self._thread = threading.Thread(target=self._run, name="launch-worker", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """取消尚未开始的启动"""
+        self.engine.cancel()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        results = []
+        try:
+            results = self.engine.run()
+        finally:
+            # 出错时也要通知界面，否则启动按钮一直不可用
+            self.finished.emit(results)
@@ -1,23 +1,31 @@
 import sys
 import os
+import queue
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from PyQt6.QtWidgets import (QMainWindow, QWidget, QPushButton, QVBoxLayout, 
-                           QHBoxLayout, QListWidget, QFileDialog, QMessageBox,
-                           QLabel, QSplitter, QInputDialog, QListWidgetItem,
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton, QVBoxLayout, 
+                           QHBoxLayout, QListView, QFileDialog, QMessageBox,
+                           QLabel, QSplitter,
                            QComboBox, QDialog)
-from PyQt6.QtCore import Qt, QTimer, QDateTime
-from PyQt6.QtGui import QIcon, QColor
+from PyQt6.QtCore import Qt, QTimer, QDateTime, pyqtSignal
+from PyQt6.QtGui import QIcon
 from utils.config import ConfigManager
-from utils.weather import (get_weather_info, get_weather_by_city, 
-                         get_province_list, get_cities_by_province,
-                         get_districts_by_city, get_adcode_by_location,
-                         is_municipality)
-import subprocess
-from gui.weather_widget import WeatherWidget  # 添加导入
+from gui.program_model import ProgramListModel, ProgramItemDelegate
+from gui.config_watcher import ConfigWatcher
+from gui.program_meta_worker import ProgramMetaWorker
+from gui.theme import DEFAULT_THEME, THEMES, compile_stylesheet, get_theme
+from utils.launch_stats import LaunchTelemetry
+from utils.program_meta import STATUS_CHANGED, STATUS_MISSING, ProgramMetaCache
+from utils.single_instance import HANDLER_TIMEOUT
+from utils.startup_profile import startup_mark
 
 class MainWindow(QMainWindow):
-    def __init__(self, icon_path):
+    # 进程监管事件，从监管线程转到主线程处理
+    supervisor_event = pyqtSignal(object)
+    # 其他进程转发来的命令，从单实例监听线程转到主线程处理
+    instance_command = pyqtSignal(object)
+
+    def __init__(self, icon_path, config_path=None):
         super().__init__()
         self.setWindowTitle("🐮🐴启动器")
         self.setMinimumSize(1000, 600)  # 增加最小宽度到1000
@@ -26,7 +34,17 @@ class MainWindow(QMainWindow):
             self.setWindowIcon(QIcon(icon_path))
 
         # 配置管理
-        self.config_manager = ConfigManager()  # 不再传入固定路径
+        self.config_manager = ConfigManager(config_path)  # 默认使用程序目录下的 config.json
+        self.config_data = {}
+        self.launch_worker = None
+        # 第一次启动程序时创建
+        self.process_supervisor = None
+        self.supervisor_event.connect(self.on_supervisor_event)
+        # 主线程处理完后通过队列回复，监听线程最多等待 HANDLER_TIMEOUT 秒，不会阻塞在 emit 中
+        self.instance_command.connect(self.on_instance_command, Qt.ConnectionType.QueuedConnection)
+        # 启动记录保存在配置文件旁边
+        self.launch_telemetry = LaunchTelemetry(
+            self.config_manager.get_sibling_path('launch_stats.jsonl'))
         
         # 主窗口布局
         central_widget = QWidget()
@@ -52,25 +70,18 @@ class MainWindow(QMainWindow):
             ("💾 保存程序", self.on_save_programs),
             ("🗑 清除所有", self.on_clear_all),
             ("🎨 切换主题", self.on_choose_theme),
-            ("🌤 天气显示", self.toggle_weather)
+            ("🌤 天气显示", self.toggle_weather),
+            ("📊 启动统计", self.on_show_launch_stats)
         ]
         
         for text, handler in buttons_data:
             btn = QPushButton(text)
             btn.setMinimumHeight(40)  # 增加按钮高度
-            btn.setStyleSheet("""
-                QPushButton {
-                    font-size: 14px;
-                    padding: 5px;
-                    border-radius: 5px;
-                }
-                QPushButton:hover {
-                    background-color: #4a90e2;
-                    color: white;
-                }
-            """)
+            btn.setObjectName("navButton")
             btn.clicked.connect(handler)
             left_layout.addWidget(btn)
+            if handler == self.on_start_programs:
+                self.start_button = btn
         
         left_layout.addStretch()  # 添加弹性空间
         
@@ -83,9 +94,9 @@ class MainWindow(QMainWindow):
         # 设置右侧面板的最小宽度
         right_panel.setMinimumWidth(700)  # 增加最小宽度
         
-        # 天气信息
-        self.weather_widget = WeatherWidget()
-        self.weather_widget.hide()  # 默认隐藏天气组件
+        # 天气信息，启用天气时才创建（见 ensure_weather_widget）
+        self.weather_widget = None
+        self.right_layout = right_layout
         
         # 程序列表区域
         list_container = QWidget()
@@ -95,13 +106,7 @@ class MainWindow(QMainWindow):
         
         # 表头容器
         header_container = QWidget()
-        header_container.setStyleSheet("""
-            QWidget {
-                background-color: #f5f5f5;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-        """)
+        header_container.setObjectName("listHeader")
         header_layout = QHBoxLayout(header_container)
         header_layout.setContentsMargins(15, 12, 15, 12)
         header_layout.setSpacing(10)  # 设置间距与列表项一致
@@ -110,40 +115,18 @@ class MainWindow(QMainWindow):
         name_header = QLabel("程序名称")
         name_header.setFixedWidth(220)  # 增加宽度
         name_header.setMinimumWidth(220)
-        name_header.setStyleSheet("""
-            QLabel {
-                color: #666;
-                font-size: 14px;
-                font-weight: bold;
-                background: transparent;
-            }
-        """)
+        name_header.setObjectName("listHeaderLabel")
         
         path_header = QLabel("程序路径")
         path_header.setFixedWidth(400)  # 增加宽度
         path_header.setMinimumWidth(400)
-        path_header.setStyleSheet("""
-            QLabel {
-                color: #666;
-                font-size: 14px;
-                font-weight: bold;
-                background: transparent;
-            }
-        """)
+        path_header.setObjectName("listHeaderLabel")
         
         operation_header = QLabel("操作")
         operation_header.setFixedWidth(80)
         operation_header.setMinimumWidth(80)
-        operation_header.setStyleSheet("""
-            QLabel {
-                color: #666;
-                font-size: 14px;
-                font-weight: bold;
-                background: transparent;
-                padding: 0;
-                qproperty-alignment: AlignCenter;
-            }
-        """)
+        operation_header.setObjectName("listHeaderLabel")
+        operation_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # 添加一个弹性空间，确保右对齐
         header_layout.addWidget(name_header)
@@ -152,44 +135,23 @@ class MainWindow(QMainWindow):
         header_layout.addStretch()
         
         # 程序列表
-        self.programs_list = QListWidget()
+        self.program_model = ProgramListModel(parent=self)
+        self.programs_list = QListView()
+        self.programs_list.setModel(self.program_model)
+        self.program_delegate = ProgramItemDelegate(self.programs_list)
+        self.program_delegate.deleteRequested.connect(self.remove_program)
+        self.programs_list.doubleClicked.connect(self.on_item_double_clicked)
+        self.programs_list.setItemDelegate(self.program_delegate)
+        # 所有行高度相同，布局时不必逐行计算
+        self.programs_list.setUniformItemSizes(True)
         self.programs_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.programs_list.setSizeAdjustPolicy(QListWidget.SizeAdjustPolicy.AdjustToContents)
-        self.programs_list.setResizeMode(QListWidget.ResizeMode.Adjust)
-        self.programs_list.setStyleSheet("""
-            QListWidget {
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                background-color: white;
-                outline: none;
-                text-align: center;
-            }
-            QListWidget::item {
-                padding: 0;
-                border-bottom: 1px solid #eee;
-                background-color: transparent;
-            }
-            QListWidget::item:last-child {
-                border-bottom: none;
-            }
-            QListWidget::item:hover {
-                background-color: #f8f9fa;
-            }
-            QListWidget::item:selected {
-                background-color: transparent;
-                color: black;
-            }
-            QListWidget::item:focus {
-                background-color: transparent;
-                outline: none;
-            }
-        """)
+        self.programs_list.setResizeMode(QListView.ResizeMode.Adjust)
+        self.programs_list.setObjectName("programList")
         
         list_layout.addWidget(header_container)
         list_layout.addWidget(self.programs_list)
         
         # 添加到右侧布局
-        right_layout.addWidget(self.weather_widget)
         right_layout.addWidget(list_container)
         
         # 添加到分割器
@@ -204,12 +166,7 @@ class MainWindow(QMainWindow):
         
         # 添加时间标签到状态栏右侧
         self.time_label = QLabel()
-        self.time_label.setStyleSheet("""
-            QLabel {
-                color: #666666;
-                padding: 0 10px;
-            }
-        """)
+        self.time_label.setObjectName("timeLabel")
         self.statusBar().addPermanentWidget(self.time_label)
         
         # 创建定时器更新时间
@@ -218,16 +175,61 @@ class MainWindow(QMainWindow):
         self.timer.start(1000)  # 每秒更新一次
         self.update_time()  # 立即更新一次时间
         
-        self.current_theme = "深蓝主题"  # 添加默认主题
+        # 程序文件信息缓存，列表显示后在后台重新检查
+        self.program_meta = ProgramMetaCache(self.config_manager.get_sibling_path('program_meta.json'))
+        self.meta_worker = ProgramMetaWorker(self.program_meta, self)
+        self.meta_worker.updated.connect(self.program_model.update_meta)
+
+        self.current_theme = DEFAULT_THEME
+        startup_mark("build_ui")
         self.load_config()
         self.update_weather_info()
+        startup_mark("weather_request")
+
+        # 配置文件被外部修改时自动重新加载
+        self.config_watcher = ConfigWatcher(self.config_manager, self)
+        self.config_watcher.changed.connect(self.on_config_changed)
+        startup_mark("config_watcher")
+
+    def ensure_weather_widget(self):
+        """获取天气组件，第一次使用时才加载天气相关模块并创建"""
+        if self.weather_widget is None:
+            from gui.weather_widget import WeatherWidget
+            from gui.weather_client import get_weather_client
+            from utils.weather_cache import WeatherCache, DEFAULT_WEATHER_TTL
+            from utils.forecast import ForecastStore
+
+            # 天气缓存和预报保存在配置文件旁边，启动时先显示上一次的数据
+            cache_path = self.config_manager.get_sibling_path('weather_cache.json')
+            ttl = self.config_data.get('weather_cache_ttl', DEFAULT_WEATHER_TTL)
+            get_weather_client().set_cache(WeatherCache(cache_path, ttl))
+            get_weather_client().set_forecast_store(
+                ForecastStore(self.config_manager.get_sibling_path('forecast_cache.json')))
+
+            self.weather_widget = WeatherWidget()
+            self.weather_widget.hide()  # 默认隐藏天气组件
+
+            # 加载天气 API key
+            if 'weather_api_key' in self.config_data:
+                self.weather_widget.set_api_key(self.config_data['weather_api_key'])
+
+            # 加载天气位置，旧版本的配置只有一个 weather_location
+            locations = self.config_data.get('weather_locations')
+            if not locations and self.config_data.get('weather_location'):
+                locations = [self.config_data['weather_location']]
+            if locations:
+                self.weather_widget.set_locations(locations)
+            self.weather_widget.set_forecast_visible(self.config_data.get('weather_forecast', False))
+
+            self.right_layout.insertWidget(0, self.weather_widget)
+        return self.weather_widget
 
     def toggle_weather(self):
         """切换天气组件的显示状态"""
-        if self.weather_widget.isVisible():
+        if self.weather_widget is not None and self.weather_widget.isVisible():
             self.weather_widget.hide()
         else:
-            self.weather_widget.show()
+            self.ensure_weather_widget().show()
             # 只在显示时且有 API key 时更新天气
             if self.weather_widget.api_key:
                 self.weather_widget.update_weather_info()
@@ -239,119 +241,193 @@ class MainWindow(QMainWindow):
             "",
             "可执行文件 (*.exe)"
         )
-        for file_path in files:
-            program_name = os.path.basename(file_path)
-            item, item_widget = self.create_program_item(program_name, file_path)
-            self.programs_list.addItem(item)
-            self.programs_list.setItemWidget(item, item_widget)
+        self.program_model.append_programs(
+            {'name': os.path.basename(file_path), 'path': file_path} for file_path in files)
+        self.refresh_program_meta(files)
             
         self.save_config()
 
-    def create_label(self, text: str, width: int) -> QLabel:
-        """创建统一样式的标签"""
-        label = QLabel(text)
-        label.setFixedWidth(width)
-        label.setMinimumWidth(width)
-        return label
-
-    def create_delete_button(self) -> QPushButton:
-        """创建统一样式的删除按钮"""
-        delete_btn = QPushButton("删除")
-        delete_btn.setFixedWidth(80)
-        delete_btn.setMinimumWidth(80)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                border: none;
-                color: #FF4444;
-                font-size: 14px;
-                background-color: transparent;
-                padding: 0;
-                margin: 0;
-                qproperty-alignment: AlignCenter;
-            }
-            QPushButton:hover {
-                color: white;
-                background-color: #FF4444;
-                border-radius: 4px;
-            }
-        """)
-        return delete_btn
-
-    def create_program_item(self, name: str, path: str) -> tuple[QListWidgetItem, QWidget]:
-        """创建程序列表项"""
-        item = QListWidgetItem()
-        item_widget = QWidget()
-        
-        layout = QHBoxLayout()
-        layout.setContentsMargins(15, 5, 15, 5)
-        layout.setSpacing(10)
-        
-        # 使用辅助方法创建标签和按钮
-        name_label = self.create_label(name, 220)
-        path_label = self.create_label(path, 400)
-        delete_btn = self.create_delete_button()
-        delete_btn.clicked.connect(lambda: self.remove_program(item))
-        
-        layout.addWidget(name_label)
-        layout.addWidget(path_label)
-        layout.addWidget(delete_btn)
-        layout.addStretch()
-        
-        item_widget.setLayout(layout)
-        item.setSizeHint(item_widget.sizeHint())
-        
-        return item, item_widget
-
-    def remove_program(self, item):
-        row = self.programs_list.row(item)
-        self.programs_list.takeItem(row)
+    def refresh_program_meta(self, paths=None):
+        """先按缓存标出文件状态，再在后台重新检查，不指定 paths 时检查整个列表"""
+        if paths is None:
+            paths = [program['path'] for program in self.program_model.programs()]
+            self.program_meta.prune(paths)
+        cached = {}
+        for path in paths:
+            entry = self.program_meta.get(path)
+            if entry is not None:
+                cached[path] = entry
+        self.program_model.update_meta(cached)
+        # 等列表显示出来后再开始检查
+        QTimer.singleShot(0, lambda: self.meta_worker.revalidate(paths))
+
+    def remove_program(self, row):
+        self.program_model.remove_row(row)
         self.save_config()
 
     def on_start_programs(self):
-        if self.programs_list.count() == 0:
+        if self.launch_worker is not None:
+            return
+
+        if self.program_model.rowCount() == 0:
             QMessageBox.information(self, "提示", "请先选择需要启动的程序。")
             return
             
-        if self.programs_list.count() > 10:
+        self.start_programs(self.get_programs_data())
+
+    def start_programs(self, programs, confirm=True):
+        """在后台启动这些程序，正在启动时返回 False"""
+        if self.launch_worker is not None:
+            return False
+
+        if confirm and len(programs) > 10:
             reply = QMessageBox.question(self, "确认启动", 
                                        "您即将启动超过10个程序。是否继续？",
                                        QMessageBox.StandardButton.Yes | 
                                        QMessageBox.StandardButton.No)
             if reply == QMessageBox.StandardButton.No:
-                return
+                return False
                 
-        for i in range(self.programs_list.count()):
-            item = self.programs_list.item(i)
-            widget = self.programs_list.itemWidget(item)
-            path_label = widget.layout().itemAt(1).widget()
-            program_path = path_label.text()
-            
+        # 启动相关的模块在第一次启动时才导入
+        from gui.launch_worker import LaunchWorker
+        from utils.launcher import DEFAULT_LAUNCH_CONCURRENCY
+        from utils.launch_plan import LaunchPlan, LaunchPlanError
+        from utils.pressure import create_pacer
+        from utils.supervisor import ProcessSupervisor, create_restart_policy
+
+        try:
+            plan = LaunchPlan(programs)
+        except LaunchPlanError as e:
+            QMessageBox.warning(self, "启动依赖有误", f"{str(e)}\n\n将忽略依赖设置，直接启动全部程序。")
+            plan = LaunchPlan(programs, use_dependencies=False)
+
+        # 在后台线程启动，界面保持响应，失败信息最后统一显示
+        concurrency = self.config_data.get('launch_concurrency', DEFAULT_LAUNCH_CONCURRENCY)
+        # 启用 launch_pacing 时根据系统压力逐个放行
+        pacer = create_pacer(self.config_data.get('launch_pacing'))
+        # 监管启动的进程：已在运行的程序不再重复启动，配置了 restart_on_crash 的程序崩溃后自动重启
+        if self.process_supervisor is None:
+            self.process_supervisor = ProcessSupervisor(on_event=self.supervisor_event.emit)
+        self.process_supervisor.policy = create_restart_policy(self.config_data.get('restart_policy'))
+        self.launch_worker = LaunchWorker(plan, concurrency, self, pacer, self.launch_telemetry,
+                                          self.process_supervisor)
+        self.launch_worker.progress.connect(self.on_launch_progress)
+        self.launch_worker.finished.connect(self.on_launch_finished)
+        self._launch_done = 0
+        self._launch_total = len(programs)
+        self.start_button.setEnabled(False)
+        self.statusBar().showMessage(f"正在启动程序 0/{self._launch_total}...")
+        self.launch_worker.start()
+        return True
+
+    def on_launch_progress(self, result):
+        """显示单个程序的启动进度"""
+        self._launch_done += 1
+        state = ("已在运行" if result.skipped else "已启动") if result.ok else "启动失败"
+        self.statusBar().showMessage(
+            f"正在启动程序 {self._launch_done}/{self._launch_total}：{result.name} {state}")
+
+    def on_launch_finished(self, results):
+        """全部启动完成后汇总结果"""
+        from utils.launcher import LaunchEngine
+
+        self.start_button.setEnabled(True)
+        self.launch_worker = None
+        failures = LaunchEngine.failures(results)
+        skipped = sum(1 for result in results if result.skipped)
+        self.statusBar().showMessage(
+            f"启动完成：成功 {len(results) - len(failures) - skipped} 个，"
+            f"已在运行 {skipped} 个，失败 {len(failures)} 个")
+        if failures:
+            details = "\n".join(f"{result.path}\n错误信息：{result.error}" for result in failures)
+            QMessageBox.critical(self, "启动失败",
+                                 f"以下 {len(failures)} 个程序无法启动：\n\n{details}")
+
+    def on_supervisor_event(self, event):
+        """在状态栏显示崩溃和自动重启的情况"""
+        from utils.supervisor import (EVENT_GAVE_UP, EVENT_RESTART_FAILED, EVENT_RESTARTED,
+                                      EVENT_RESTARTING)
+
+        if event.kind == EVENT_RESTARTING:
+            self.statusBar().showMessage(
+                f"{event.name} 异常退出（退出码 {event.exit_code}），{event.delay:.0f} 秒后第 {event.restarts} 次重新启动")
+        elif event.kind == EVENT_RESTARTED:
+            self.statusBar().showMessage(f"{event.name} 已重新启动", 5000)
+        elif event.kind == EVENT_RESTART_FAILED:
+            self.statusBar().showMessage(f"{event.name} 重新启动失败：{event.error}")
+        elif event.kind == EVENT_GAVE_UP:
+            self.statusBar().showMessage(
+                f"{event.name} 短时间内已崩溃 {event.restarts + 1} 次，不再自动重启")
+
+    def handle_instance_command(self, message):
+        """处理其他进程转发来的命令，在单实例监听线程中调用，返回回复
+
+        主线程没有及时处理（例如正在显示对话框或已经退出）时回复已转发，命令稍后仍会执行。
+        """
+        replies = queue.Queue(maxsize=1)
+        self.instance_command.emit((dict(message), replies))
+        try:
+            return replies.get(timeout=HANDLER_TIMEOUT)
+        except queue.Empty:
+            return {'ok': True, 'pending': True}
+
+    def on_instance_command(self, request):
+        message, replies = request
+        replies.put_nowait(self.run_instance_command(message))
+
+    def run_instance_command(self, message):
+        """在主线程中执行转发来的命令，返回回复"""
+        command = message.get('command')
+        if command == 'show':
+            self.show_and_activate()
+            reply = {'ok': True}
+        elif command == 'launch':
+            reply = self.launch_forwarded(message.get('profile'))
+        elif command == 'reload':
+            config_data = self.config_manager.reload_config()
+            if config_data is None:
+                reply = {'ok': True, 'message': "配置文件没有变化"}
+            else:
+                self.on_config_changed(config_data)
+                reply = {'ok': True, 'message': "已重新加载配置"}
+        else:
+            reply = {'ok': False, 'error': f"不支持的命令：{command}"}
+        return reply
+
+    def show_and_activate(self):
+        """把窗口显示到最前面"""
+        if self.isMinimized():
+            self.showNormal()
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def launch_forwarded(self, profile=None):
+        """按转发来的命令启动程序，不再弹出确认"""
+        from utils.launch_plan import LaunchPlanError, select_profile
+
+        if self.launch_worker is not None:
+            return {'ok': False, 'error': "正在启动程序，请稍后再试"}
+        programs = self.get_programs_data()
+        if profile:
             try:
-                subprocess.Popen(program_path)
-            except Exception as e:
-                QMessageBox.critical(self, "启动失败", 
-                                   f"无法启动应用程序：{program_path}\n错误信息{str(e)}")
+                programs = select_profile(programs, self.config_data.get('launch_profiles'), profile)
+            except LaunchPlanError as e:
+                return {'ok': False, 'error': str(e)}
+        if not programs:
+            return {'ok': False, 'error': "没有需要启动的程序"}
+        self.start_programs(programs, confirm=False)
+        return {'ok': True, 'message': f"已开始启动 {len(programs)} 个程序"}
+
+    def on_show_launch_stats(self):
+        """显示各程序的启动耗时统计"""
+        from gui.launch_stats_dialog import LaunchStatsDialog
+        LaunchStatsDialog(self.launch_telemetry, self).exec()
 
     def get_programs_data(self):
         """获取程序列表数据"""
-        programs = []
-        try:
-            for i in range(self.programs_list.count()):
-                item = self.programs_list.item(i)
-                widget = self.programs_list.itemWidget(item)
-                if widget and widget.layout():
-                    name_label = widget.layout().itemAt(0).widget()
-                    path_label = widget.layout().itemAt(1).widget()
-                    
-                    if name_label and path_label:
-                        programs.append({
-                            'name': name_label.text(),
-                            'path': path_label.text()
-                        })
-        except Exception as e:
-            print(f"获取程序数据时发生错误: {str(e)}")
-        
-        return programs
+        return self.program_model.programs()
 
     def on_save_programs(self):
         """保存程序列表"""
@@ -363,34 +439,10 @@ class MainWindow(QMainWindow):
         save_button = reply.addButton("保存", QMessageBox.ButtonRole.YesRole)
         cancel_button = reply.addButton("取消", QMessageBox.ButtonRole.NoRole)
         
-        reply.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QLabel {
-                color: #333;
-                font-size: 14px;
-                padding: 10px;
-            }
-            QPushButton {
-                background-color: white;
-                border: 1px solid #ddd;
-                padding: 5px 20px;
-                border-radius: 3px;
-                font-size: 13px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #4a90e2;
-                color: white;
-                border: 1px solid #4a90e2;
-            }
-        """)
-        
         reply.exec()
         
         if reply.clickedButton() == save_button:
-            if self.save_config():  # 检查保存是否成功
+            if self.save_config(immediate=True):  # 检查保存是否成功
                 QMessageBox.information(self, "保存成功", "程序列表已保存！")
             else:
                 QMessageBox.warning(self, "保存失败", "保存程序列表时发生错误！")
@@ -406,39 +458,14 @@ class MainWindow(QMainWindow):
         clear_button = reply.addButton("清除", QMessageBox.ButtonRole.YesRole)
         cancel_button = reply.addButton("取消", QMessageBox.ButtonRole.NoRole)
         
-        # 设置对话框样式
-        reply.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QLabel {
-                color: #333;
-                font-size: 14px;
-                padding: 10px;
-            }
-            QPushButton {
-                background-color: white;
-                border: 1px solid #ddd;
-                padding: 5px 20px;
-                border-radius: 3px;
-                font-size: 13px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #4a90e2;
-                color: white;
-                border: 1px solid #4a90e2;
-            }
-        """)
-        
         reply.exec()
         
         if reply.clickedButton() == clear_button:
-            self.programs_list.clear()
+            self.program_model.clear()
 
     def on_choose_theme(self):
         """选择主题"""
-        themes = ["默认主题", "黑色主题", "绿色主题"]
+        themes = list(THEMES)
         current_index = themes.index(self.current_theme) if self.current_theme in themes else 0
         
         # 创建自定义对话框
@@ -451,39 +478,13 @@ class MainWindow(QMainWindow):
         
         # 添加标签
         label = QLabel("请选择主题方案：")
-        label.setStyleSheet("""
-            color: #333;
-            font-size: 14px;
-            padding: 10px;
-        """)
+        label.setObjectName("dialogPrompt")
         layout.addWidget(label)
         
         # 添加下拉框
         combo = QComboBox()
         combo.addItems(themes)
         combo.setCurrentIndex(current_index)
-        combo.setStyleSheet("""
-            QComboBox {
-                background-color: white;
-                border: 1px solid #ddd;
-                padding: 5px;
-                border-radius: 3px;
-                min-width: 200px;
-                font-size: 13px;
-            }
-            QComboBox:hover {
-                border: 1px solid #4a90e2;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                image: url(resources/down-arrow.png);
-                width: 12px;
-                height: 12px;
-            }
-        """)
         layout.addWidget(combo)
         
         # 添加按钮布局
@@ -492,40 +493,10 @@ class MainWindow(QMainWindow):
         # 确定按钮
         ok_button = QPushButton("确定")
         ok_button.clicked.connect(dialog.accept)
-        ok_button.setStyleSheet("""
-            QPushButton {
-                background-color: white;
-                border: 1px solid #ddd;
-                padding: 5px 20px;
-                border-radius: 3px;
-                font-size: 13px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #4a90e2;
-                color: white;
-                border: 1px solid #4a90e2;
-            }
-        """)
         
         # 取消按钮
         cancel_button = QPushButton("取消")
         cancel_button.clicked.connect(dialog.reject)
-        cancel_button.setStyleSheet("""
-            QPushButton {
-                background-color: white;
-                border: 1px solid #ddd;
-                padding: 5px 20px;
-                border-radius: 3px;
-                font-size: 13px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #4a90e2;
-                color: white;
-                border: 1px solid #4a90e2;
-            }
-        """)
         
         button_layout.addStretch()
         button_layout.addWidget(ok_button)
@@ -533,13 +504,6 @@ class MainWindow(QMainWindow):
         
         layout.addLayout(button_layout)
         
-        # 设置对话框样式
-        dialog.setStyleSheet("""
-            QDialog {
-                background-color: white;
-            }
-        """)
-        
         # 显示对话框
         if dialog.exec() == QDialog.DialogCode.Accepted:
             theme = combo.currentText()
@@ -549,219 +513,126 @@ class MainWindow(QMainWindow):
                 # 保存配置
                 self.save_config()
 
-    def save_config(self):
-        """保存配置到文件"""
+    def save_config(self, immediate=False):
+        """保存配置，默认合并短时间内的多次修改后在后台写入，immediate 为 True 时立即写入"""
         try:
-            config_data = {
+            # 保留配置文件中界面不直接管理的项
+            config_data = dict(self.config_data)
+            config_data.update({
                 'theme': getattr(self, 'current_theme', '默认主题'),
                 'programs': self.get_programs_data(),
-                'weather_visible': self.weather_widget.isVisible(),
-                'weather_api_key': self.weather_widget.api_key  # 保存 API key
-            }
-            
-            # 保存前先验证数据
-            if not config_data['programs']:
-                print("警告：没有要保存的程序数据")
-                
-            # 使用 config_manager 的路径
-            print(f"配置文件路径: {self.config_manager.config_path}")
-            print(f"要保存的数据: {config_data}")
-            
-            success = self.config_manager.save_config(config_data)
-            if not success:
-                print("保存配置失败")
-                return False
-                
+                'weather_visible': False
+            })
+            # 天气组件还没有创建时，沿用配置中原有的 API key 和位置
+            if self.weather_widget is not None:
+                config_data.update({
+                    'weather_visible': self.weather_widget.isVisible(),
+                    'weather_api_key': self.weather_widget.api_key,  # 保存 API key
+                    'weather_locations': self.weather_widget.get_locations(),
+                    'weather_forecast': self.weather_widget.forecast_visible,
+                    # 旧版本只读取第一个位置
+                    'weather_location': self.weather_widget.get_location()
+                })
+
+            if immediate:
+                return self.config_manager.save_config(config_data)
+            self.config_manager.schedule_save(config_data)
             return True
-            
+
         except Exception as e:
             print(f"保存配置时发生错误: {str(e)}")
             return False
 
+    def closeEvent(self, event):
+        # 退出前写入尚未保存的修改
+        self.config_manager.flush()
+        if self.weather_widget is not None:
+            from gui.weather_client import get_weather_client
+            get_weather_client().flush()
+        # 已启动的程序继续运行，只停止监管
+        if self.process_supervisor is not None:
+            self.process_supervisor.shutdown()
+        super().closeEvent(event)
+
     def load_config(self):
         config_data = self.config_manager.load_config()
+        startup_mark("config_read")
         if not config_data:
+            self.apply_theme(self.current_theme)
             return
+        self.config_data = config_data
 
-        if 'theme' in config_data:
-            self.current_theme = config_data['theme']
-            self.apply_theme(self.current_theme)
+        if self.config_manager.config_recovered:
+            QMessageBox.warning(self, "配置已恢复",
+                                f"配置文件已损坏，已使用备份：\n{self.config_manager.backup_path}")
 
+        if self.config_manager.config_error:
+            QMessageBox.warning(self, "启动依赖有误",
+                                f"{self.config_manager.config_error}\n\n启动时将忽略依赖设置。")
+
+        self.current_theme = config_data.get('theme', DEFAULT_THEME)
+        self.apply_theme(self.current_theme)
+        startup_mark("apply_theme")
+
+        # 不在这里检查文件是否存在，网络驱动器上会阻塞界面；找不到的程序在列表中标出，不会被删除
         if 'programs' in config_data:
-            self.programs_list.clear()
-            for program in config_data['programs']:
-                if os.path.exists(program['path']):
-                    item, item_widget = self.create_program_item(program['name'], program['path'])
-                    self.programs_list.addItem(item)
-                    self.programs_list.setItemWidget(item, item_widget)
+            self.program_model.set_programs(config_data['programs'])
+            self.refresh_program_meta()
+        startup_mark("load_programs")
     
-        # 加载天气组件状态
-        if 'weather_visible' in config_data:
-            if config_data['weather_visible']:
-                self.weather_widget.show()
-            else:
-                self.weather_widget.hide()
+        # 加载天气组件状态，未启用天气时不创建组件，也不加载网络请求相关的模块
+        if config_data.get('weather_visible'):
+            self.ensure_weather_widget().show()
+        elif self.weather_widget is not None:
+            self.weather_widget.hide()
+        startup_mark("weather_panel")
 
-        # 加载天气 API key
-        if 'weather_api_key' in config_data:
-            self.weather_widget.set_api_key(config_data['weather_api_key'])
+    def on_config_changed(self, config_data):
+        """应用外部修改后的配置，程序列表只更新变化的部分"""
+        self.config_data = config_data
+
+        theme = config_data.get('theme')
+        if theme and theme != self.current_theme:
+            self.current_theme = theme
+            self.apply_theme(theme)
+
+        self.program_model.reconcile(config_data.get('programs', []))
+        self.refresh_program_meta()
+
+        if self.config_manager.config_error:
+            self.statusBar().showMessage(f"配置文件已更新，启动依赖有误：{self.config_manager.config_error}")
+        else:
+            self.statusBar().showMessage("配置文件已更新", 5000)
 
     def update_weather_info(self):
         """更新当前选中地区的天气信息"""
         # 直接调用 WeatherWidget 的更新方法
-        self.weather_widget.update_weather_info()
+        if self.weather_widget is not None:
+            self.weather_widget.update_weather_info()
 
     def apply_theme(self, theme_name):
-        if theme_name == "黑色主题":
-            self.setStyleSheet("""
-                QMainWindow { background-color: #2b2b2b; }
-                QWidget#centralWidget { color: white; }
-                QListWidget { 
-                    background-color: #3b3b3b; 
-                    color: white;
-                    border: 1px solid #444;
-                }
-                QListWidget::item { 
-                    background-color: #3b3b3b;
-                    border-bottom: 1px solid #444;
-                }
-                QListWidget::item:hover { 
-                    background-color: #444;
-                }
-                QPushButton { 
-                    background-color: #4a4a4a; 
-                    color: white;
-                    border: 1px solid #555;
-                }
-                QPushButton:hover {
-                    background-color: #555;
-                }
-                QLabel { 
-                    color: white; 
-                }
-                .weather-widget {
-                    background-color: #4a4a4a;
-                    color: white;
-                }
-            """)
-            
-            # 单独设置天气组件样式
-            self.weather_widget.setStyleSheet("""
-                QWidget {
-                    background-color: #4a4a4a;
-                    color: white;
-                    border-radius: 5px;
-                }
-                QLabel {
-                    color: white;
-                }
-                QComboBox {
-                    color: white;
-                    background-color: #3b3b3b;
-                    border: 1px solid #555;
-                }
-                QComboBox:hover {
-                    border: 1px solid #666;
-                }
-            """)
-            self.time_label.setStyleSheet("color: #aaaaaa; padding: 0 10px;")
-            
-        elif theme_name == "绿色主题":
-            self.setStyleSheet("""
-                QMainWindow { background-color: #e8f5e9; }
-                QListWidget { 
-                    background-color: white;
-                    border: 1px solid #c8e6c9;
-                }
-                QListWidget::item { 
-                    background-color: white;
-                    border-bottom: 1px solid #c8e6c9;
-                }
-                QListWidget::item:hover { 
-                    background-color: #f1f8e9;
-                }
-                QPushButton { 
-                    background-color: #81c784;
-                    color: white;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #66bb6a;
-                }
-                .weather-widget {
-                    background-color: #66bb6a;
-                }
-            """)
-            self.time_label.setStyleSheet("color: #2e7d32; padding: 0 10px;")
-            
-        else:  
-            self.setStyleSheet("""
-                QMainWindow { background-color: white; }
-                QListWidget { 
-                    background-color: white;
-                    border: 1px solid #ddd;
-                }
-                QListWidget::item { 
-                    background-color: white;
-                    border-bottom: 1px solid #eee;
-                }
-                QListWidget::item:hover { 
-                    background-color: #f5f5f5;
-                }
-                QPushButton { 
-                    background-color: white;
-                    border: 1px solid #ddd;
-                }
-                QPushButton:hover {
-                    background-color: #4a90e2;
-                    color: white;
-                }
-            """)
-            self.time_label.setStyleSheet("color: #666666; padding: 0 10px;")
-        
-        # 更新天气组件题
-        self.weather_widget.set_theme(theme_name)
-        
-        # 设置对话框的全局样式
-        self.setStyleSheet(self.styleSheet() + """
-            QMessageBox, QInputDialog, QDialog {
-                background-color: white;
-            }
-            QMessageBox QLabel, QInputDialog QLabel, QDialog QLabel {
-                color: #333333;
-            }
-            QMessageBox QPushButton, QInputDialog QPushButton, QDialog QPushButton {
-                background-color: white;
-                color: #333333;
-                border: 1px solid #ddd;
-                padding: 5px 15px;
-                border-radius: 3px;
-            }
-            QMessageBox QPushButton:hover, QInputDialog QPushButton:hover, QDialog QPushButton:hover {
-                background-color: #4a90e2;
-                color: white;
-                border: 1px solid #4a90e2;
-            }
-            QDialog QComboBox {
-                background-color: white;
-                color: #333333;
-                border: 1px solid #ddd;
-                padding: 5px;
-                border-radius: 3px;
-            }
-            QDialog QComboBox:hover {
-                border: 1px solid #4a90e2;
-            }
-        """)
-
-    def on_item_double_clicked(self, item):
-        # 由于我现在使用了定义的表项布局，击事件可以改为显示程序详细信息
-        widget = self.programs_list.itemWidget(item)
-        name_label = widget.layout().itemAt(0).widget()
-        path_label = widget.layout().itemAt(1).widget()
-        
-        message = f"程序名称：{name_label.text()}\n程序路径：{path_label.text()}"
+        """切换主题，整个程序共用一份按主题缓存的样式表"""
+        stylesheet = compile_stylesheet(theme_name)
+        app = QApplication.instance()
+        if app.styleSheet() != stylesheet:
+            app.setStyleSheet(stylesheet)
+        # 列表内容由 delegate 绘制，颜色直接取主题中的值
+        self.program_delegate.set_theme(get_theme(theme_name))
+        self.programs_list.viewport().update()
+
+    def on_item_double_clicked(self, index):
+        # 显示程序详细信息
+        program = self.program_model.program(index.row())
+        message = f"程序名称：{program['name']}\n程序路径：{program['path']}"
+        meta = self.program_model.meta(program['path'])
+        if meta is not None and meta.status == STATUS_MISSING:
+            message += "\n\n找不到该文件，请确认路径或网络驱动器是否可用。"
+        elif meta is not None and meta.status == STATUS_CHANGED:
+            message += "\n\n该文件在上次检查后有变化（可能已更新）。"
         QMessageBox.information(self, "程序信息", message)
+        # 用户看过之后不再标记文件变化
+        if meta is not None and meta.status == STATUS_CHANGED and self.program_meta.acknowledge(program['path']):
+            self.program_model.update_meta({program['path']: self.program_meta.get(program['path'])})
 
     def update_time(self):
         current_time = QDateTime.currentDateTime()
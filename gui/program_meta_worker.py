@@ -0,0 +1,119 @@
+import base64
+import threading
+from PyQt6.QtCore import QBuffer, QFileInfo, QIODevice, QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QFileIconProvider
+from utils.program_meta import DEFAULT_META_WORKERS
+
+ICON_SIZE = 16
+# 合并检查结果后再更新界面的间隔 (ms)
+UPDATE_INTERVAL_MS = 100
+
+
+def extract_icon(path):
+    """提取文件图标，返回 PNG 数据 (base64)，失败时返回 None，需在主线程调用"""
+    pixmap = QFileIconProvider().icon(QFileInfo(path)).pixmap(ICON_SIZE, ICON_SIZE)
+    if pixmap.isNull():
+        return None
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if not pixmap.save(buffer, "PNG"):
+        return None
+    return base64.b64encode(bytes(buffer.data())).decode('ascii')
+
+
+class ProgramMetaWorker(QObject):
+    """在后台线程池中检查程序文件，并把结果送回界面
+
+    结果每隔 UPDATE_INTERVAL_MS 合并成一次 updated 信号，避免逐个刷新列表。
+    QFileIconProvider 只能在主线程使用，缺少图标的文件检查完后在主线程中逐个提取，每次事件循环只提取一个。
+    检查进行中再次调用 revalidate 时，新的路径在本轮结束后检查。
+    """
+
+    # {路径: ProgramMeta}
+    updated = pyqtSignal(object)
+    _checked = pyqtSignal(object)
+    _done = pyqtSignal()
+
+    def __init__(self, cache, parent=None, max_workers=DEFAULT_META_WORKERS):
+        super().__init__(parent)
+        self.cache = cache
+        self.max_workers = max_workers
+        self._thread = None
+        self._queued = []
+        self._pending = {}
+        self._icon_queue = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(UPDATE_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
+        self._icon_timer = QTimer(self)
+        self._icon_timer.timeout.connect(self._extract_next_icon)
+        self._checked.connect(self._on_checked)
+        self._done.connect(self._on_done)
+
+    def revalidate(self, paths):
+        """在后台重新检查这些文件"""
+        self._queued.extend(paths)
+        if not self.is_running():
+            self._start()
+
+    def is_running(self):
+        return self._thread is not None
+
+    def _start(self):
+        paths = list(dict.fromkeys(self._queued))
+        self._queued = []
+        if not paths:
+            return
+        self._thread = threading.Thread(target=self._run, args=(paths,),
+                                        name="program-meta-worker", daemon=True)
+        self._thread.start()
+
+    def _run(self, paths):
+        try:
+            # 信号在工作线程发出，由 Qt 排队到主线程处理
+            self.cache.revalidate(paths, on_result=self._checked.emit, max_workers=self.max_workers)
+        except Exception as e:
+            print(f"检查程序文件失败: {str(e)}")
+        try:
+            self._done.emit()
+        except RuntimeError:
+            # 应用退出时对象可能已经释放
+            pass
+
+    def _on_checked(self, entry):
+        self._pending[entry.path] = entry
+        if entry.exists and entry.icon is None and entry.path not in self._icon_queue:
+            self._icon_queue.append(entry.path)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _on_done(self):
+        self._thread = None
+        self._flush()
+        if self._icon_queue and not self._icon_timer.isActive():
+            self._icon_timer.start(0)
+        if self._queued:
+            self._start()
+
+    def _flush(self):
+        self._flush_timer.stop()
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            self.updated.emit(pending)
+
+    def _extract_next_icon(self):
+        if not self._icon_queue:
+            self._icon_timer.stop()
+            self._flush()
+            self.cache.save()
+            return
+        path = self._icon_queue.pop(0)
+        icon = extract_icon(path)
+        if icon is not None:
+            self.cache.set_icon(path, icon)
+            entry = self.cache.get(path)
+            if entry is not None:
+                self._pending[path] = entry
+                if not self._flush_timer.isActive():
+                    self._flush_timer.start()
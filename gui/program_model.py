@@ -0,0 +1,285 @@
+import base64
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QEvent, QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QPainter, QPainterPath, QPixmap
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+from utils.program_meta import STATUS_CHANGED, STATUS_MISSING, STATUS_UNKNOWN
+
+# 文件状态在列表中显示的标记
+STATUS_TAGS = {STATUS_MISSING: "文件不存在", STATUS_CHANGED: "文件已变化"}
+
+
+class ProgramListModel(QAbstractListModel):
+    """程序列表数据，每一行是一个程序配置字典
+
+    文件信息 (utils.program_meta.ProgramMeta) 按路径单独保存，提供状态和图标，图标在第一次绘制时才解码。
+    """
+
+    ProgramRole = Qt.ItemDataRole.UserRole + 1
+    PathRole = Qt.ItemDataRole.UserRole + 2
+    StatusRole = Qt.ItemDataRole.UserRole + 3
+
+    def __init__(self, programs=None, parent=None):
+        super().__init__(parent)
+        self._programs = [dict(program) for program in programs or []]
+        self._meta = {}
+        self._icons = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._programs)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._programs):
+            return None
+        program = self._programs[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return program['name']
+        if role == self.PathRole:
+            return program['path']
+        if role == self.ProgramRole:
+            return program
+        if role == self.StatusRole:
+            meta = self._meta.get(program['path'])
+            return meta.status if meta is not None else STATUS_UNKNOWN
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon(program['path'])
+        if role == Qt.ItemDataRole.ToolTipRole:
+            tag = STATUS_TAGS.get(self.data(index, self.StatusRole))
+            return f"{program['path']}\n{tag}" if tag else program['path']
+        return None
+
+    def _icon(self, path):
+        """文件图标，没有时返回 None"""
+        if path not in self._icons:
+            meta = self._meta.get(path)
+            icon = None
+            if meta is not None and meta.icon:
+                pixmap = QPixmap()
+                if pixmap.loadFromData(base64.b64decode(meta.icon), "PNG"):
+                    icon = QIcon(pixmap)
+            self._icons[path] = icon
+        return self._icons[path]
+
+    def meta(self, path):
+        """路径对应的文件信息，没有时返回 None"""
+        return self._meta.get(path)
+
+    def update_meta(self, entries):
+        """更新文件信息 {路径: ProgramMeta}，只刷新受影响的行"""
+        if not entries:
+            return
+        self._meta.update(entries)
+        for path in entries:
+            self._icons.pop(path, None)
+        rows = [row for row, program in enumerate(self._programs) if program['path'] in entries]
+        if rows:
+            self.dataChanged.emit(self.index(rows[0]), self.index(rows[-1]))
+
+    def program(self, row):
+        """指定行的程序配置"""
+        return self._programs[row]
+
+    def programs(self):
+        """全部程序配置的副本"""
+        return [dict(program) for program in self._programs]
+
+    def set_programs(self, programs):
+        """替换全部程序"""
+        self.beginResetModel()
+        self._programs = [dict(program) for program in programs]
+        self.endResetModel()
+
+    def append_programs(self, programs):
+        """在末尾添加程序"""
+        programs = [dict(program) for program in programs]
+        if not programs:
+            return
+        first = len(self._programs)
+        self.beginInsertRows(QModelIndex(), first, first + len(programs) - 1)
+        self._programs.extend(programs)
+        self.endInsertRows()
+
+    def append_program(self, program):
+        """在末尾添加一个程序"""
+        self.append_programs([program])
+
+    def remove_row(self, row):
+        """删除指定行"""
+        if not 0 <= row < len(self._programs):
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._programs[row]
+        self.endRemoveRows()
+
+    def clear(self):
+        """清空列表"""
+        self.set_programs([])
+
+    def reconcile(self, programs):
+        """把列表调整为 programs，只删除、移动、插入和更新有变化的行
+
+        以路径识别同一个程序，不重置模型，视图的滚动位置和选中状态得以保留。
+        """
+        programs = [dict(program) for program in programs]
+
+        # 删除新列表中不存在（或数量多出来）的行，从后往前删除连续的区间
+        remaining = {}
+        for program in programs:
+            remaining[program['path']] = remaining.get(program['path'], 0) + 1
+        keep = []
+        for program in self._programs:
+            count = remaining.get(program['path'], 0)
+            keep.append(count > 0)
+            if count:
+                remaining[program['path']] = count - 1
+        row = len(self._programs) - 1
+        while row >= 0:
+            if keep[row]:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and not keep[row]:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self._programs[row + 1:last + 1]
+            self.endRemoveRows()
+
+        # 逐个位置对齐：相同则按需更新，后面有相同路径的行就移过来，否则插入
+        for row, program in enumerate(programs):
+            current = self._programs[row] if row < len(self._programs) else None
+            if current is None or current['path'] != program['path']:
+                source = next((i for i in range(row + 1, len(self._programs))
+                               if self._programs[i]['path'] == program['path']), None)
+                if source is None:
+                    self.beginInsertRows(QModelIndex(), row, row)
+                    self._programs.insert(row, program)
+                    self.endInsertRows()
+                    continue
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), row)
+                self._programs.insert(row, self._programs.pop(source))
+                self.endMoveRows()
+            if self._programs[row] != program:
+                self._programs[row] = program
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+
+class ProgramItemDelegate(QStyledItemDelegate):
+    """绘制程序列表的一行：名称、路径和删除按钮
+
+    列宽与表头保持一致，删除按钮只是绘制出来的区域，点击时发出 deleteRequested。
+    """
+
+    deleteRequested = pyqtSignal(int)
+
+    ROW_HEIGHT = 40
+    MARGIN = 15
+    SPACING = 10
+    NAME_WIDTH = 220
+    PATH_WIDTH = 400
+    BUTTON_WIDTH = 80
+    DELETE_COLOR = QColor("#FF4444")
+    WARNING_COLOR = QColor("#e67700")
+    ICON_SIZE = 16
+
+    def __init__(self, view):
+        super().__init__(view)
+        self._hover_row = -1
+        self.delete_color = self.DELETE_COLOR
+        self.delete_hover_text_color = QColor("white")
+        self.warning_color = self.WARNING_COLOR
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+
+    def set_theme(self, theme):
+        """使用主题 (gui.theme 中的颜色) 绘制删除按钮，文字颜色来自列表的样式表"""
+        self.delete_color = QColor(theme['delete'])
+        self.delete_hover_text_color = QColor(theme['delete_hover_text'])
+        self.warning_color = QColor(theme['warning'])
+
+    def _column_rects(self, rect):
+        """名称、路径、删除按钮三个区域"""
+        x = rect.left() + self.MARGIN
+        name_rect = QRect(x, rect.top(), self.NAME_WIDTH, rect.height())
+        x += self.NAME_WIDTH + self.SPACING
+        path_rect = QRect(x, rect.top(), self.PATH_WIDTH, rect.height())
+        x += self.PATH_WIDTH + self.SPACING
+        button_rect = QRect(x, rect.top() + 5, self.BUTTON_WIDTH, rect.height() - 10)
+        return name_rect, path_rect, button_rect
+
+    def sizeHint(self, option, index):
+        width = self.MARGIN * 2 + self.NAME_WIDTH + self.PATH_WIDTH + self.BUTTON_WIDTH + self.SPACING * 2
+        return QSize(width, self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # 背景、分隔线和悬停效果由样式表中的 ::item 规则负责，文字自己绘制
+        style = option.widget.style() if option.widget else None
+        if style is not None:
+            item_option = QStyleOptionViewItem(option)
+            self.initStyleOption(item_option, index)
+            item_option.text = ""
+            item_option.icon = QIcon()
+            item_option.features &= ~QStyleOptionViewItem.ViewItemFeature.HasDecoration
+            style.drawControl(QStyle.ControlElement.CE_ItemViewItem, item_option, painter, option.widget)
+
+        name_rect, path_rect, button_rect = self._column_rects(option.rect)
+        metrics = option.fontMetrics
+        align = Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft
+        # 名称前的文件图标
+        icon = index.data(Qt.ItemDataRole.DecorationRole)
+        if icon is not None:
+            icon.paint(painter, QRect(name_rect.left(), name_rect.center().y() - self.ICON_SIZE // 2,
+                                      self.ICON_SIZE, self.ICON_SIZE))
+        name_rect.setLeft(name_rect.left() + self.ICON_SIZE + 6)
+
+        # 文件不存在或有变化时，在路径右侧标出
+        tag = STATUS_TAGS.get(index.data(ProgramListModel.StatusRole))
+        if tag:
+            tag_width = metrics.horizontalAdvance(tag) + self.SPACING
+            painter.setPen(self.warning_color)
+            painter.drawText(path_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight, tag)
+            path_rect.setRight(path_rect.right() - tag_width)
+
+        painter.setPen(option.palette.color(option.palette.ColorRole.Text))
+        painter.drawText(name_rect, align, metrics.elidedText(
+            index.data(Qt.ItemDataRole.DisplayRole), Qt.TextElideMode.ElideRight, name_rect.width()))
+        painter.drawText(path_rect, align, metrics.elidedText(
+            index.data(ProgramListModel.PathRole), Qt.TextElideMode.ElideMiddle, path_rect.width()))
+
+        # 删除按钮，悬停时红底白字
+        if index.row() == self._hover_row:
+            path = QPainterPath()
+            path.addRoundedRect(button_rect.toRectF(), 4, 4)
+            painter.fillPath(path, self.delete_color)
+            painter.setPen(self.delete_hover_text_color)
+        else:
+            painter.setPen(self.delete_color)
+        painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, "删除")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonRelease):
+            _, _, button_rect = self._column_rects(option.rect)
+            inside = button_rect.contains(event.position().toPoint())
+            hover_row = index.row() if inside else -1
+            if hover_row != self._hover_row:
+                self._hover_row = hover_row
+                if option.widget:
+                    option.widget.viewport().update()
+            if (event_type == QEvent.Type.MouseButtonRelease and inside
+                    and event.button() == Qt.MouseButton.LeftButton):
+                self.deleteRequested.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def eventFilter(self, watched, event):
+        # 鼠标离开列表时清除删除按钮的悬停状态
+        if event.type() == QEvent.Type.Leave and self._hover_row != -1:
+            self._hover_row = -1
+            watched.update()
+        return False
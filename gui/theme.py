@@ -0,0 +1,206 @@
+"""主题
+
+每个主题只定义一组颜色，启动或切换主题时把颜色填入同一份样式表模板，得到整个程序共用的样式表，
+按主题缓存。控件不再各自设置样式表，只设置 objectName，由样式表中的 #名称 选择器匹配。
+本模块不导入 PyQt6。
+"""
+from functools import lru_cache
+from string import Template
+
+DEFAULT_THEME = "默认主题"
+
+THEMES = {
+    "默认主题": {
+        'window_bg': "#ffffff",
+        'text': "#333333",
+        'status_text': "#666666",
+        'button_bg': "#ffffff",
+        'button_text': "#333333",
+        'button_border': "#dddddd",
+        'button_hover_bg': "#4a90e2",
+        'button_hover_text': "#ffffff",
+        'header_bg': "#f5f5f5",
+        'header_text': "#666666",
+        'list_bg': "#ffffff",
+        'list_text': "#333333",
+        'list_border': "#dddddd",
+        'row_border': "#eeeeee",
+        'row_hover': "#f8f9fa",
+        'delete': "#FF4444",
+        'delete_hover_text': "#ffffff",
+        'warning': "#e67700",
+        'weather_bg': "#f8f9fa",
+        'weather_border': "#e9ecef",
+        'weather_text': "#495057",
+        'weather_hover': "#228be6",
+        'weather_separator': "#dee2e6",
+    },
+    "黑色主题": {
+        'window_bg': "#2b2b2b",
+        'text': "#dddddd",
+        'status_text': "#aaaaaa",
+        'button_bg': "#4a4a4a",
+        'button_text': "#ffffff",
+        'button_border': "#555555",
+        'button_hover_bg': "#4a90e2",
+        'button_hover_text': "#ffffff",
+        'header_bg': "#333333",
+        'header_text': "#aaaaaa",
+        'list_bg': "#3b3b3b",
+        'list_text': "#ffffff",
+        'list_border': "#444444",
+        'row_border': "#444444",
+        'row_hover': "#444444",
+        'delete': "#FF6666",
+        'delete_hover_text': "#ffffff",
+        'warning': "#ffa94d",
+        'weather_bg': "#4a4a4a",
+        'weather_border': "#555555",
+        'weather_text': "#dee2e6",
+        'weather_hover': "#74c0fc",
+        'weather_separator': "#666666",
+    },
+    "绿色主题": {
+        'window_bg': "#e8f5e9",
+        'text': "#2e7d32",
+        'status_text': "#2e7d32",
+        'button_bg': "#81c784",
+        'button_text': "#ffffff",
+        'button_border': "#81c784",
+        'button_hover_bg': "#66bb6a",
+        'button_hover_text': "#ffffff",
+        'header_bg': "#f1f8e9",
+        'header_text': "#558b2f",
+        'list_bg': "#ffffff",
+        'list_text': "#333333",
+        'list_border': "#c8e6c9",
+        'row_border': "#c8e6c9",
+        'row_hover': "#f1f8e9",
+        'delete': "#FF4444",
+        'delete_hover_text': "#ffffff",
+        'warning': "#ef6c00",
+        'weather_bg': "#f1f8e9",
+        'weather_border': "#c8e6c9",
+        'weather_text': "#2e7d32",
+        'weather_hover': "#66bb6a",
+        'weather_separator': "#c8e6c9",
+    },
+}
+
+# 对话框在所有主题下都是白底
+DIALOG_COLORS = {
+    'dialog_bg': "#ffffff",
+    'dialog_text': "#333333",
+    'dialog_border': "#dddddd",
+    'dialog_accent': "#4a90e2",
+}
+
+_STYLESHEET = Template("""
+QMainWindow { background-color: $window_bg; }
+QStatusBar { color: $text; }
+QLabel#timeLabel { color: $status_text; padding: 0 10px; }
+
+QPushButton#navButton {
+    font-size: 14px;
+    padding: 5px;
+    border-radius: 5px;
+    background-color: $button_bg;
+    color: $button_text;
+    border: 1px solid $button_border;
+}
+QPushButton#navButton:hover {
+    background-color: $button_hover_bg;
+    color: $button_hover_text;
+    border: 1px solid $button_hover_bg;
+}
+
+QWidget#listHeader {
+    background-color: $header_bg;
+    border-top-left-radius: 4px;
+    border-top-right-radius: 4px;
+}
+QLabel#listHeaderLabel {
+    color: $header_text;
+    font-size: 14px;
+    font-weight: bold;
+    background: transparent;
+}
+
+QListView#programList {
+    border: 1px solid $list_border;
+    border-radius: 4px;
+    background-color: $list_bg;
+    color: $list_text;
+    outline: none;
+}
+QListView#programList::item {
+    padding: 0;
+    border-bottom: 1px solid $row_border;
+    background-color: transparent;
+}
+QListView#programList::item:hover { background-color: $row_hover; }
+QListView#programList::item:selected, QListView#programList::item:focus {
+    background-color: transparent;
+    color: $list_text;
+}
+
+QWidget#weatherContainer {
+    background-color: $weather_bg;
+    border: 1px solid $weather_border;
+    border-radius: 8px;
+}
+QPushButton#weatherSettings {
+    border: none;
+    background: transparent;
+    font-size: 16px;
+    padding: 0;
+    margin: 0;
+    color: $weather_text;
+}
+QPushButton#weatherSettings:hover { color: $weather_hover; }
+QLabel#weatherLocation, QLabel#weatherInfo { font-size: 15px; color: $weather_text; }
+QLabel#weatherLocation { font-weight: 500; }
+QLabel#weatherSeparator { color: $weather_separator; margin: 0 10px; font-size: 15px; }
+QLabel#weatherForecast { font-size: 13px; color: $weather_text; }
+
+QDialog { background-color: $dialog_bg; }
+QDialog QLabel { color: $dialog_text; font-size: 14px; }
+QMessageBox QLabel, QLabel#dialogPrompt { padding: 10px; }
+QDialog QPushButton {
+    background-color: $dialog_bg;
+    color: $dialog_text;
+    border: 1px solid $dialog_border;
+    padding: 5px 20px;
+    border-radius: 3px;
+    font-size: 13px;
+    min-width: 80px;
+}
+QDialog QPushButton:hover {
+    background-color: $dialog_accent;
+    color: $dialog_bg;
+    border: 1px solid $dialog_accent;
+}
+QDialog QPushButton:disabled { color: #999999; }
+QDialog QComboBox, QDialog QLineEdit {
+    background-color: $dialog_bg;
+    color: $dialog_text;
+    border: 1px solid $dialog_border;
+    padding: 5px;
+    border-radius: 3px;
+    font-size: 13px;
+}
+QDialog QComboBox:hover, QDialog QLineEdit:focus { border: 1px solid $dialog_accent; }
+QDialog QComboBox::drop-down { border: none; width: 20px; }
+QDialog QGroupBox { font-weight: bold; padding-top: 12px; margin-top: 12px; }
+""")
+
+
+def get_theme(theme_name):
+    """主题的颜色，未知主题使用默认主题"""
+    return THEMES.get(theme_name, THEMES[DEFAULT_THEME])
+
+
+@lru_cache(maxsize=None)
+def compile_stylesheet(theme_name):
+    """生成主题对应的整个程序的样式表，每个主题只生成一次"""
+    return _STYLESHEET.substitute(get_theme(theme_name), **DIALOG_COLORS)
@@ -0,0 +1,158 @@
+from PyQt6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+from utils.forecast import ForecastStore, parse_forecast
+from utils.weather import get_weather_info
+from utils.weather_cache import WeatherCache
+
+# 同时进行的天气请求数，与 AmapClient 的连接池大小一致
+MAX_WEATHER_REQUESTS = 8
+
+
+class _WeatherTask(QRunnable):
+    """在线程池中执行的天气请求"""
+
+    def __init__(self, client, request_id, adcode, api_key, extensions):
+        super().__init__()
+        self.client = client
+        self.request_id = request_id
+        self.adcode = adcode
+        self.api_key = api_key
+        self.extensions = extensions
+        self.cancelled = False
+        # 是否真正发出了请求（开始前就被取消的任务不会发出）
+        self.issued = False
+
+    def run(self):
+        weather_info = None
+        if not self.cancelled:
+            self.issued = True
+            weather_info = get_weather_info(self.adcode, self.api_key, self.extensions,
+                                            cancelled=self.is_cancelled)
+        try:
+            # 已取消的任务也要通知，客户端才能释放它；信号在工作线程发出，由 Qt 排队到主线程处理
+            self.client._task_finished.emit(self.request_id, weather_info)
+        except RuntimeError:
+            # 应用退出时客户端可能已经释放
+            pass
+
+    def is_cancelled(self):
+        return self.cancelled
+
+
+class WeatherClient(QObject):
+    """异步天气客户端
+
+    请求在后台线程执行，结果通过 finished 信号回到主线程。
+    新的请求不会自动取消旧请求，调用方需要时先调用 cancel。
+    同一个客户端由多个组件共享，各组件只处理自己发起的请求编号。
+    请求成功的结果会写入 cache，是否使用缓存由调用方决定。
+    天气预报由 fetch_forecast 获取，保存在所有组件共用的 forecasts 中，
+    内容有更新（reporttime 变新）时发出 forecast_updated(adcode)。
+    """
+
+    # (请求编号, 天气信息或 None)
+    finished = pyqtSignal(int, object)
+    forecast_updated = pyqtSignal(str)
+    _task_finished = pyqtSignal(int, object)
+
+    def __init__(self, parent=None, max_threads=MAX_WEATHER_REQUESTS):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._next_id = 0
+        self._tasks = {}
+        self.cache = WeatherCache()
+        self.forecasts = ForecastStore()
+        # adcode -> 进行中的预报请求编号
+        self._forecast_requests = {}
+        self._task_finished.connect(self._on_task_finished)
+
+    def set_cache(self, cache):
+        """替换天气缓存"""
+        self.cache = cache
+
+    def set_forecast_store(self, store):
+        """替换天气预报存储"""
+        self.forecasts = store
+
+    def flush(self):
+        """写入尚未保存的数据，退出前调用"""
+        self.cache.flush()
+        self.forecasts.flush()
+
+    def fetch_forecast(self, adcode, api_key):
+        """需要时获取天气预报，返回请求编号
+
+        最近确认过的地区不再请求，返回 None；同一地区已有请求在进行时返回该请求的编号。
+        """
+        if adcode in self._forecast_requests:
+            return self._forecast_requests[adcode]
+        if self.forecasts.is_fresh(adcode):
+            return None
+        request_id = self.fetch(adcode, api_key, "all")
+        self._forecast_requests[adcode] = request_id
+        return request_id
+
+    def fetch(self, adcode, api_key, extensions="base"):
+        """发起天气请求，返回请求编号"""
+        self._next_id += 1
+        task = _WeatherTask(self, self._next_id, adcode, api_key, extensions)
+        # 任务对象由我们持有，避免执行完后被 Qt 删除
+        task.setAutoDelete(False)
+        self._tasks[self._next_id] = task
+        self._pool.start(task)
+        return self._next_id
+
+    def cancel(self, request_id=None):
+        """取消指定请求，不指定时取消全部未完成的请求
+
+        尚未开始的请求直接从线程池移除，正在进行的请求不再重试，在超时内结束，结果不再通知。
+        """
+        request_ids = list(self._tasks) if request_id is None else [request_id]
+        for rid in request_ids:
+            task = self._tasks.get(rid)
+            if task is not None:
+                task.cancelled = True
+                # 正在执行的任务要等它结束后再释放
+                if self._pool.tryTake(task):
+                    del self._tasks[rid]
+                    if self._forecast_requests.get(task.adcode) == rid:
+                        del self._forecast_requests[task.adcode]
+
+    def is_pending(self, request_id):
+        """请求是否仍未完成"""
+        task = self._tasks.get(request_id)
+        return task is not None and not task.cancelled
+
+    def _on_task_finished(self, request_id, weather_info):
+        task = self._tasks.pop(request_id, None)
+        if task is None:
+            return
+        if self._forecast_requests.get(task.adcode) == request_id:
+            del self._forecast_requests[task.adcode]
+        if task.issued:
+            self.cache.record_fetch()
+        if weather_info and task.extensions == "all":
+            forecast = parse_forecast(weather_info)
+            if forecast is not None:
+                # 按请求的 adcode 保存，界面也按它查询
+                forecast.adcode = task.adcode
+            if forecast is not None and self.forecasts.update(forecast):
+                self.forecast_updated.emit(forecast.adcode)
+        elif weather_info:
+            # 取消的请求也已经花费了一次调用，结果同样写入缓存
+            self.cache.put(task.adcode, weather_info, task.extensions)
+        # 已取消的请求到这里才释放，结果不再通知
+        if not task.cancelled:
+            self.finished.emit(request_id, weather_info)
+
+
+_weather_client = None
+
+
+def get_weather_client():
+    """获取全局共享的天气客户端，需在主线程中首次调用"""
+    global _weather_client
+    if _weather_client is None:
+        # 挂在 QApplication 下，随应用一起释放
+        _weather_client = WeatherClient(QCoreApplication.instance())
+    return _weather_client
@@ -1,28 +1,38 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QPushButton, QDialog, QComboBox, QLineEdit, 
-                           QGroupBox, QMessageBox)
+                           QGroupBox, QMessageBox, QListWidget, QListWidgetItem,
+                           QGridLayout, QCheckBox)
 from PyQt6.QtCore import Qt
-from utils.weather import (get_weather_info, get_weather_by_city, 
-                         get_province_list, get_cities_by_province,
-                         get_districts_by_city, get_adcode_by_location,
-                         is_municipality)
+from utils.weather import (get_province_list, get_cities_by_province,
+                         get_districts_by_city, is_municipality, DEFAULT_WEATHER_LOCATION,
+                         group_locations_by_adcode, location_name,
+                         normalize_locations)
+from utils.city_search import prepare_city_search_index, search_locations
+from utils.forecast import format_day
+from gui.weather_client import get_weather_client
 
 class LocationDialog(QDialog):
-    def __init__(self, parent=None, api_key=None):
+    """设置 API Key 和要显示天气的位置
+
+    位置列表中选中的一项与省市区下拉框同步：选中时载入下拉框，修改下拉框时更新该项。
+    """
+
+    def __init__(self, parent=None, api_key=None, locations=None, forecast_visible=False):
         super().__init__(parent)
         self.api_key = api_key
+        self.weather_client = get_weather_client()
+        self.weather_client.finished.connect(self.on_verify_finished)
+        self._verify_request = None
+        self._verify_key = None
+        # 正在把位置载入下拉框，这期间的变化不写回列表
+        self._loading_location = False
         self.setup_ui()
         
         # 设置初始位置
-        if parent and isinstance(parent, WeatherWidget):
-            self.province_combo.setCurrentText(parent.current_province)
-            # 触发省份变化，加载城市列表
-            self.on_province_changed(parent.current_province)
-            self.city_combo.setCurrentText(parent.current_city)
-            # 触发城市变化，加载区县列表
-            self.on_city_changed(parent.current_city)
-            if parent.current_district:
-                self.district_combo.setCurrentText(parent.current_district)
+        for location in normalize_locations(locations) or [dict(DEFAULT_WEATHER_LOCATION)]:
+            self.add_location_item(location)
+        self.location_list.setCurrentRow(0)
+        self.forecast_check.setChecked(forecast_visible)
 
     def setup_ui(self):
         self.setWindowTitle("天气设置")
@@ -37,11 +47,11 @@ class LocationDialog(QDialog):
         api_input_layout = QHBoxLayout()
         self.api_input = QLineEdit(self.api_key if self.api_key else "")
         self.api_input.setPlaceholderText("请输入高德地图 API Key")
-        verify_btn = QPushButton("验证")
-        verify_btn.clicked.connect(self.verify_api_key)
+        self.verify_btn = QPushButton("验证")
+        self.verify_btn.clicked.connect(self.verify_api_key)
         
         api_input_layout.addWidget(self.api_input)
-        api_input_layout.addWidget(verify_btn)
+        api_input_layout.addWidget(self.verify_btn)
         
         # API Key 说明文本
         api_info = QLabel(
@@ -61,6 +71,20 @@ class LocationDialog(QDialog):
         location_group = QGroupBox("位置设置")
         location_layout = QVBoxLayout()
         
+        # 位置搜索
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索省份、城市或区县（支持拼音、首字母和 adcode）")
+        self.search_input.textChanged.connect(self.on_search_changed)
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(160)
+        self.search_results.itemClicked.connect(self.on_search_result_selected)
+        self.search_results.itemActivated.connect(self.on_search_result_selected)
+        self.search_results.hide()
+        location_layout.addWidget(self.search_input)
+        location_layout.addWidget(self.search_results)
+        # 打开对话框时就开始构建搜索索引，输入时无需等待
+        prepare_city_search_index()
+        
         # 省份选择
         province_layout = QHBoxLayout()
         province_label = QLabel("省份")
@@ -85,9 +109,31 @@ class LocationDialog(QDialog):
         district_layout.addWidget(district_label)
         district_layout.addWidget(self.district_combo)
         
+        # 要显示天气的位置列表
+        self.location_list = QListWidget()
+        self.location_list.setMaximumHeight(120)
+        self.location_list.currentRowChanged.connect(self.on_location_selected)
+        list_buttons = QHBoxLayout()
+        add_button = QPushButton("添加位置")
+        add_button.clicked.connect(self.on_add_location)
+        self.remove_button = QPushButton("删除位置")
+        self.remove_button.clicked.connect(self.on_remove_location)
+        list_buttons.addStretch()
+        list_buttons.addWidget(add_button)
+        list_buttons.addWidget(self.remove_button)
+
+        # 下拉框的变化写回选中的位置（省份变化会依次引起城市、区县变化）
+        self.city_combo.currentTextChanged.connect(self.update_current_location)
+        self.district_combo.currentTextChanged.connect(self.update_current_location)
+
         location_layout.addLayout(province_layout)
         location_layout.addLayout(city_layout)
         location_layout.addLayout(district_layout)
+        location_layout.addWidget(QLabel("显示天气的位置"))
+        location_layout.addWidget(self.location_list)
+        location_layout.addLayout(list_buttons)
+        self.forecast_check = QCheckBox("显示未来几天的天气预报")
+        location_layout.addWidget(self.forecast_check)
         location_group.setLayout(location_layout)
         layout.addWidget(location_group)
         
@@ -104,25 +150,6 @@ class LocationDialog(QDialog):
         button_layout.addWidget(cancel_button)
         layout.addLayout(button_layout)
         
-        self.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                padding-top: 12px;
-                margin-top: 12px;
-            }
-            QLabel {
-                font-size: 14px;
-            }
-            QLineEdit, QComboBox {
-                padding: 5px;
-                font-size: 14px;
-            }
-            QPushButton {
-                padding: 6px 12px;
-                font-size: 14px;
-            }
-        """)
-        
     def verify_api_key(self):
         """验证 API Key 是否有效"""
         key = self.api_input.text().strip()
@@ -130,22 +157,122 @@ class LocationDialog(QDialog):
             QMessageBox.warning(self, "验证失败", "请输入 API Key")
             return
             
-        # 尝试使用该 key 获取天气信息
+        # 使用北京的 adcode 进行测试，请求在后台执行
+        self.weather_client.cancel(self._verify_request)
+        self._verify_key = key
+        self._verify_request = self.weather_client.fetch('110100', key)
+        self.verify_btn.setEnabled(False)
+        self.verify_btn.setText("验证中...")
+
+    def on_verify_finished(self, request_id, weather_info):
+        """处理 API Key 验证结果"""
+        if request_id != self._verify_request:
+            return
+        self._verify_request = None
+        self.verify_btn.setEnabled(True)
+        self.verify_btn.setText("验证")
+        if weather_info:
+            QMessageBox.information(self, "验证成功", "API Key 有效！")
+            self.api_key = self._verify_key
+        else:
+            QMessageBox.warning(self, "验证失败", "API Key 无效或网络不可用，请检查后重试")
+
+    def done(self, result):
+        """关闭对话框时取消未完成的验证请求，并断开与共享天气客户端的连接"""
+        self.weather_client.cancel(self._verify_request)
+        self._verify_request = None
         try:
-            # 使用北京的 adcode 进行测试
-            weather_info = get_weather_info('110100', key)
-            if weather_info:
-                QMessageBox.information(self, "验证成功", "API Key 有效！")
-                self.api_key = key
-            else:
-                QMessageBox.warning(self, "验证失败", "API Key 无效，请检查后重试")
-        except Exception as e:
-            QMessageBox.warning(self, "验证失败", f"验证过程出错：{str(e)}")
+            self.weather_client.finished.disconnect(self.on_verify_finished)
+        except TypeError:
+            # 已经断开
+            pass
+        super().done(result)
 
     def get_api_key(self):
         """获取当前设置的 API Key"""
         return self.api_input.text().strip()
 
+    def get_locations(self):
+        """获取位置列表"""
+        return [self.location_list.item(row).data(Qt.ItemDataRole.UserRole)
+                for row in range(self.location_list.count())]
+
+    def get_forecast_visible(self):
+        """是否显示天气预报"""
+        return self.forecast_check.isChecked()
+
+    def selected_location(self):
+        """下拉框中选中的位置"""
+        return {'province': self.province_combo.currentText(),
+                'city': self.city_combo.currentText(),
+                'district': self.district_combo.currentText()}
+
+    def add_location_item(self, location):
+        item = QListWidgetItem(location_name(location))
+        item.setData(Qt.ItemDataRole.UserRole, location)
+        self.location_list.addItem(item)
+        self.remove_button.setEnabled(self.location_list.count() > 1)
+
+    def on_add_location(self):
+        """添加一个位置，初始为当前选中的位置，之后通过下拉框修改"""
+        self.add_location_item(self.selected_location())
+        self.location_list.setCurrentRow(self.location_list.count() - 1)
+
+    def on_remove_location(self):
+        """删除选中的位置，至少保留一个"""
+        row = self.location_list.currentRow()
+        if row < 0 or self.location_list.count() <= 1:
+            return
+        self.location_list.takeItem(row)
+        self.remove_button.setEnabled(self.location_list.count() > 1)
+
+    def on_location_selected(self, row):
+        """把选中的位置载入下拉框"""
+        if row < 0:
+            return
+        location = self.location_list.item(row).data(Qt.ItemDataRole.UserRole)
+        self._loading_location = True
+        try:
+            self.province_combo.setCurrentText(location['province'])
+            # 触发省份变化，加载城市列表
+            self.on_province_changed(location['province'])
+            self.city_combo.setCurrentText(location['city'])
+            # 触发城市变化，加载区县列表
+            self.on_city_changed(location['city'])
+            if location.get('district'):
+                self.district_combo.setCurrentText(location['district'])
+        finally:
+            self._loading_location = False
+
+    def update_current_location(self, _text=None):
+        """把下拉框的选择写回列表中选中的位置"""
+        item = self.location_list.currentItem()
+        if self._loading_location or item is None or not self.city_combo.currentText():
+            return
+        location = self.selected_location()
+        item.setData(Qt.ItemDataRole.UserRole, location)
+        item.setText(location_name(location))
+
+    def on_search_changed(self, text):
+        """根据输入内容更新搜索结果"""
+        self.search_results.clear()
+        results = search_locations(text)
+        for result in results:
+            item = QListWidgetItem(f"{result.display_name}  ({result.adcode})")
+            item.setData(Qt.ItemDataRole.UserRole, result)
+            self.search_results.addItem(item)
+        self.search_results.setVisible(bool(results))
+
+    def on_search_result_selected(self, item):
+        """选中搜索结果后同步到省市区下拉框"""
+        result = item.data(Qt.ItemDataRole.UserRole)
+        self.province_combo.setCurrentText(result.province)
+        if result.city:
+            self.city_combo.setCurrentText(result.city)
+        if result.district:
+            self.district_combo.setCurrentText(result.district)
+        self.search_results.hide()
+
     def on_province_changed(self, province):
         """处理省份选择变化"""
         self.city_combo.clear()
@@ -165,12 +292,27 @@ class LocationDialog(QDialog):
         self.district_combo.addItems(districts)
 
 class WeatherWidget(QWidget):
+    """天气面板，每个位置一行
+
+    刷新时按 adcode 合并重复的位置，不同地区的请求同时在后台进行，每个结果返回后立即更新对应的行，
+    全部刷新完所需的时间约等于最慢的一个请求。
+    显示天气预报时，每行下面再显示一行预报。预报只在刷新时按需获取，显示时只读取天气客户端中保存的数据。
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.api_key = None
-        self.current_province = "广东省"
-        self.current_city = "深圳市"
-        self.current_district = "宝安区"
+        self.locations = [dict(DEFAULT_WEATHER_LOCATION)]
+        self.forecast_visible = False
+        self.weather_client = get_weather_client()
+        self.weather_client.finished.connect(self.on_weather_received)
+        self.weather_client.forecast_updated.connect(self.on_forecast_updated)
+        # 请求编号 -> adcode
+        self._weather_requests = {}
+        # adcode -> 显示该地区天气的行号
+        self._adcode_rows = {}
+        # 每行的 (位置标签, 分隔线, 天气标签, 预报标签)
+        self._rows = []
         self.setup_ui()
         
     def setup_ui(self):
@@ -181,81 +323,59 @@ class WeatherWidget(QWidget):
         # 创建一个带背景的容器
         container = QWidget()
         container.setObjectName("weatherContainer")
-        container.setStyleSheet("""
-            #weatherContainer {
-                background-color: #f8f9fa;
-                border: 1px solid #e9ecef;
-                border-radius: 8px;
-            }
-        """)
         
         # 容器的内部布局
         layout = QHBoxLayout(container)
         layout.setContentsMargins(15, 12, 15, 12)  # 内部边距
         layout.setSpacing(15)  # 增加组件间距
         
-        # 左侧信息区域（位置和天气）
-        info_layout = QHBoxLayout()
-        info_layout.setSpacing(20)  # 位置和天气信息之间的间距
-        
-        # 位置信息容器
-        location_container = QWidget()
-        location_layout = QHBoxLayout(location_container)
-        location_layout.setContentsMargins(0, 0, 0, 0)
-        location_layout.setSpacing(8)
-        
         # 设置按钮
         self.settings_btn = QPushButton("📍")
         self.settings_btn.setCursor(Qt.CursorShape.PointingHandCursor)  # 鼠标悬停时显示手型
         self.settings_btn.clicked.connect(self.show_location_dialog)
-        self.settings_btn.setStyleSheet("""
-            QPushButton {
-                border: none;
-                background: transparent;
-                font-size: 16px;
-                padding: 0;
-                margin: 0;
-                color: #495057;
-            }
-            QPushButton:hover {
-                color: #228be6;
-            }
-        """)
+        self.settings_btn.setObjectName("weatherSettings")
         
-        # 当前位置显示
-        self.location_label = QLabel(f"{self.current_province} {self.current_city} {self.current_district}")
-        self.location_label.setStyleSheet("""
-            font-size: 15px;
-            color: #495057;
-            font-weight: 500;
-        """)
-        
-        location_layout.addWidget(self.settings_btn)
-        location_layout.addWidget(self.location_label)
-        
-        # 分隔线
-        separator = QLabel("|")
-        separator.setStyleSheet("""
-            color: #dee2e6;
-            margin: 0 10px;
-            font-size: 15px;
-        """)
-        
-        # 天气信息
-        self.weather_label = QLabel("点击📍设置天气信息")
-        self.weather_label.setStyleSheet("""
-            font-size: 15px;
-            color: #495057;
-        """)
+        # 每个位置一行：位置 | 天气，各行的列对齐，预报显示在天气下面
+        self.rows_layout = QGridLayout()
+        self.rows_layout.setContentsMargins(0, 0, 0, 0)
+        self.rows_layout.setHorizontalSpacing(8)
+        self.rows_layout.setVerticalSpacing(6)
+        self.rows_layout.setColumnStretch(3, 1)
         
         # 组装布局
-        info_layout.addWidget(location_container)
-        info_layout.addWidget(separator)
-        info_layout.addWidget(self.weather_label)
-        info_layout.addStretch()
-        
-        layout.addLayout(info_layout)
+        layout.addWidget(self.settings_btn, 0, Qt.AlignmentFlag.AlignTop)
+        layout.addLayout(self.rows_layout, 1)
         main_layout.addWidget(container)
+        self.rebuild_rows()
+
+    def rebuild_rows(self):
+        """按位置列表重新创建各行"""
+        for labels in self._rows:
+            for label in labels:
+                self.rows_layout.removeWidget(label)
+                label.deleteLater()
+        self._rows = []
+        # 行号已经变化，等下次刷新时重新对应
+        self._adcode_rows = {}
+        for row, location in enumerate(self.locations):
+            # 当前位置显示
+            location_label = QLabel(location_name(location))
+            location_label.setObjectName("weatherLocation")
+            # 分隔线
+            separator = QLabel("|")
+            separator.setObjectName("weatherSeparator")
+            # 天气信息
+            weather_label = QLabel("点击📍设置天气信息")
+            weather_label.setObjectName("weatherInfo")
+            # 天气预报
+            forecast_label = QLabel()
+            forecast_label.setObjectName("weatherForecast")
+            forecast_label.setVisible(self.forecast_visible)
+            self.rows_layout.addWidget(location_label, row * 2, 0)
+            self.rows_layout.addWidget(separator, row * 2, 1)
+            self.rows_layout.addWidget(weather_label, row * 2, 2)
+            self.rows_layout.addWidget(forecast_label, row * 2 + 1, 2, 1, 2)
+            self._rows.append((location_label, separator, weather_label, forecast_label))
         
     def save_api_key(self):
         """保存 API key 到配置文件"""
@@ -265,138 +385,161 @@ class WeatherWidget(QWidget):
             main_window.save_config()
             
     def show_location_dialog(self):
-        dialog = LocationDialog(self, self.api_key)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            # 获取并保存新的 API Key
+        dialog = LocationDialog(self, self.api_key, self.locations, self.forecast_visible)
+        try:
+            if dialog.exec() != QDialog.DialogCode.Accepted:
+                return
+            # 获取新的 API Key
             new_key = dialog.get_api_key()
             if new_key:
                 self.api_key = new_key
-                self.save_api_key()
-            
+
             # 更新位置信息
-            self.current_province = dialog.province_combo.currentText()
-            self.current_city = dialog.city_combo.currentText()
-            self.current_district = dialog.district_combo.currentText()
-            
-            # 更新显示
-            location_text = f"{self.current_province} {self.current_city}"
-            if self.current_district:
-                location_text = f"{self.current_province} {self.current_city} {self.current_district}"
-            self.location_label.setText(location_text)
-            
-            # 更新天气信息
-            self.update_weather_info()
+            self.set_locations(dialog.get_locations())
+            self.set_forecast_visible(dialog.get_forecast_visible())
+        finally:
+            # 对话框的父对象是本控件，不删除会一直留在内存中
+            dialog.deleteLater()
+        # API Key 和位置一起保存到配置文件
+        self.save_api_key()
+
+        # 更新天气信息
+        self.update_weather_info()
+
+    def set_row_text(self, rows, text):
+        for row in rows:
+            self._rows[row][2].setText(text)
     
     def update_weather_info(self):
-        """更新天气信息"""
+        """更新全部位置的天气信息，请求在后台同时进行，不阻塞界面"""
         if not self.api_key:
-            self.weather_label.setText("请先设置 API Key")
+            self.cancel_requests()
+            self.set_row_text(range(len(self._rows)), "请先设置 API Key")
             return
-            
-        try:
-            if self.current_district:
-                adcode = get_adcode_by_location(
-                    self.current_province, 
-                    self.current_city,
-                    self.current_district,
-                    self.api_key
-                )
+
+        groups, unresolved = group_locations_by_adcode(self.locations)
+        self.set_row_text(unresolved, "无法获取天气信息")
+        self._adcode_rows = groups
+
+        # 位置已经改变，不再需要的请求结果直接丢弃；仍需要的地区沿用进行中的请求
+        pending = {}
+        for request_id, adcode in self._weather_requests.items():
+            if adcode in groups and adcode not in pending.values():
+                pending[request_id] = adcode
+            else:
+                self.weather_client.cancel(request_id)
+        self._weather_requests = pending
+
+        # 先显示缓存的数据，过期或没有缓存时再到后台刷新
+        cache = self.weather_client.cache
+        for adcode, rows in groups.items():
+            entry = cache.lookup(adcode)
+            if entry is not None:
+                self.show_weather(rows, entry.data, entry.age)
+                if cache.is_fresh(entry):
+                    continue
             else:
-                adcode = get_adcode_by_location(
-                    self.current_province, 
-                    self.current_city,
-                    api_key=self.api_key
-                )
-                
-            if adcode:
-                weather_info = get_weather_info(adcode, self.api_key)
-                if weather_info:
-                    self.weather_label.setText(
-                        f"🌡️ {weather_info['temperature']}°C  💨 {weather_info['winddirection']}风"
-                        f"{weather_info['windpower']}级  💧 {weather_info['humidity']}%  "
-                        f"⛅ {weather_info['weather']}")
-                    return
-                else:
-                    self.weather_label.setText("API Key 无效，请重新设置")
-                    return
-                    
-            self.weather_label.setText("无法获取天气信息")
-        except Exception as e:
-            self.weather_label.setText(f"获取天气信息失败：{str(e)}")
+                self.set_row_text(rows, "⏳ 正在获取天气信息...")
+            if adcode not in self._weather_requests.values():
+                self._weather_requests[self.weather_client.fetch(adcode, self.api_key)] = adcode
+        self.update_cache_tooltip()
+        self.update_forecasts()
+
+    def update_forecasts(self):
+        """显示保存的天气预报，需要时到后台获取"""
+        if not self.forecast_visible:
+            return
+        rows = set()
+        for adcode, adcode_rows in self._adcode_rows.items():
+            rows.update(adcode_rows)
+            self.show_forecast(adcode)
+            if self.api_key:
+                self.weather_client.fetch_forecast(adcode, self.api_key)
+        for row, labels in enumerate(self._rows):
+            if row not in rows:
+                labels[3].clear()
+
+    def on_forecast_updated(self, adcode):
+        """天气预报有更新"""
+        if self.forecast_visible:
+            self.show_forecast(adcode)
+
+    def show_forecast(self, adcode):
+        """在对应的行显示天气预报，只读取保存的数据"""
+        rows = self._adcode_rows.get(adcode)
+        if not rows:
+            return
+        forecast = self.weather_client.forecasts.get(adcode)
+        if forecast is None:
+            text, tooltip = "⏳ 正在获取天气预报...", ""
+        else:
+            text = "  ".join(format_day(day) for day in forecast.days)
+            tooltip = f"预报发布于 {forecast.reporttime}"
+        for row in rows:
+            self._rows[row][3].setText(text)
+            self._rows[row][3].setToolTip(tooltip)
+
+    def set_forecast_visible(self, visible):
+        """设置是否显示天气预报"""
+        self.forecast_visible = bool(visible)
+        for labels in self._rows:
+            labels[3].setVisible(self.forecast_visible)
+        self.update_forecasts()
+
+    def cancel_requests(self):
+        """取消本面板未完成的请求"""
+        for request_id in self._weather_requests:
+            self.weather_client.cancel(request_id)
+        self._weather_requests = {}
+
+    def on_weather_received(self, request_id, weather_info):
+        """显示后台请求返回的天气信息"""
+        adcode = self._weather_requests.pop(request_id, None)
+        if adcode is None:
+            return
+        rows = self._adcode_rows.get(adcode, [])
+        if weather_info:
+            self.show_weather(rows, weather_info)
+        else:
+            self.set_row_text([row for row in rows if self._rows[row][2].text().startswith("⏳")],
+                              "获取天气信息失败，请检查 API Key 和网络")
+        self.update_cache_tooltip()
+
+    def show_weather(self, rows, weather_info, age=0):
+        """在这些行显示天气信息，age 为缓存数据的秒数"""
+        text = (f"🌡️ {weather_info['temperature']}°C  💨 {weather_info['winddirection']}风"
+                f"{weather_info['windpower']}级  💧 {weather_info['humidity']}%  "
+                f"⛅ {weather_info['weather']}")
+        if age >= 60:
+            text += f"  （{int(age // 60)}分钟前）"
+        self.set_row_text(rows, text)
+
+    def update_cache_tooltip(self):
+        """在天气信息的提示中显示缓存统计"""
+        stats = self.weather_client.cache.stats()
+        tooltip = (f"缓存命中 {stats['hits']} 次，过期后刷新 {stats['stale']} 次，"
+                   f"未命中 {stats['misses']} 次\n"
+                   f"实际请求接口 {stats['fetches']} 次，命中率 {stats['hit_rate']:.0%}")
+        for labels in self._rows:
+            labels[2].setToolTip(tooltip)
+
+    def set_locations(self, locations):
+        """设置要显示天气的位置列表，为空时使用默认位置"""
+        self.locations = normalize_locations(locations) or [dict(DEFAULT_WEATHER_LOCATION)]
+        self.rebuild_rows()
+
+    def get_locations(self):
+        """获取位置列表"""
+        return [dict(location) for location in self.locations]
+
+    def set_location(self, province, city, district=None):
+        """只显示一个位置"""
+        self.set_locations([{'province': province, 'city': city, 'district': district}])
+
+    def get_location(self):
+        """获取第一个位置"""
+        return dict(self.locations[0])
 
     def set_api_key(self, key):
         """设置 API key"""
         self.api_key = key
-
-    def set_theme(self, theme_name):
-        """设置主题"""
-        if theme_name == "暗夜主题":
-            container_style = """
-                #weatherContainer {
-                    background-color: #343a40;
-                    border: 1px solid #495057;
-                    border-radius: 8px;
-                }
-            """
-            text_color = "#dee2e6"
-            hover_color = "#74c0fc"
-        else:
-            container_style = """
-                #weatherContainer {
-                    background-color: #f8f9fa;
-                    border: 1px solid #e9ecef;
-                    border-radius: 8px;
-                }
-            """
-            text_color = "#495057"
-            hover_color = "#228be6"
-
-        self.setStyleSheet(container_style)
-        
-        self.location_label.setStyleSheet(f"""
-            font-size: 15px;
-            color: {text_color};
-            font-weight: 500;
-        """)
-        
-        self.weather_label.setStyleSheet(f"""
-            font-size: 15px;
-            color: {text_color};
-        """)
-        
-        self.settings_btn.setStyleSheet(f"""
-            QPushButton {{
-                border: none;
-                background: transparent;
-                font-size: 16px;
-                padding: 0;
-                margin: 0;
-                color: {text_color};
-            }}
-            QPushButton:hover {{
-                color: {hover_color};
-            }}
-        """)
-
-    def create_delete_button(self) -> QPushButton:
-        """创建统一样式的删除按钮"""
-        delete_btn = QPushButton("删除")
-        delete_btn.setFixedWidth(80)
-        delete_btn.setMinimumWidth(80)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                border: none;
-                color: #FF4444;
-                font-size: 14px;
-                background-color: transparent;
-                padding: 0;
-                margin: 0;
-                text-align: center;
-            }
-            QPushButton:hover {
-                color: white;
-                background-color: #FF4444;
-                border-radius: 4px;
-            }
-        """)
-        return delete_btn
\ No newline at end of file
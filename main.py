@@ -1,4 +1,9 @@
-from gui.app import App
+import time
+
+# 尽早记录进程开始的时间，命令行模式据此统计启动耗时
+START_TIME = time.perf_counter()
+
+import argparse
 import sys
 import traceback
 import os
@@ -23,10 +28,99 @@ def show_error(error_msg):
     
     return 1
 
+def parse_args(argv=None):
+    """解析命令行参数，不认识的参数留给 Qt"""
+    parser = argparse.ArgumentParser(prog="main.py", description="🐮🐴启动器", allow_abbrev=False)
+    parser.add_argument("--launch", nargs="?", const="", metavar="PROFILE",
+                        help="不打开界面直接启动程序，可指定 launch_profiles 中的方案")
+    parser.add_argument("--config", help="配置文件路径，默认使用程序目录下的 config.json")
+    parser.add_argument("--json", action="store_true", help="以 JSON 格式输出启动结果")
+    parser.add_argument("--reload", action="store_true", help="让正在运行的启动器重新加载配置文件")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="不转发给正在运行的启动器，总是在当前进程中运行")
+    parser.add_argument("--profile-startup", nargs="?", const="", metavar="REPORT",
+                        default=os.environ.get("NM_PROFILE_STARTUP"),
+                        help="记录启动各阶段耗时，首次绘制后写出 JSON 报告")
+    parser.add_argument("--startup-trace", metavar="PATH", default=os.environ.get("NM_STARTUP_TRACE"),
+                        help="同时输出 Chrome trace 文件")
+    parser.add_argument("--profile-exit", action="store_true",
+                        help="写出启动计时报告后立即退出，用于基准测试")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+def instance_address(config_path):
+    """配置文件对应的单实例监听地址，无法安全监听时返回 None"""
+    from utils.config import ConfigManager
+    from utils.single_instance import instance_address as address_of
+    return address_of(ConfigManager(config_path).config_path)
+
+def forward(address, command, **params):
+    """把命令转发给正在运行的启动器，返回退出码，没有正在运行的启动器时返回 None"""
+    from utils.single_instance import send_command
+    reply = send_command(address, command, **params)
+    if reply is None:
+        return None
+    if not reply.get('ok'):
+        print(f"启动器已在运行，执行失败：{reply.get('error')}")
+        return 1
+    if reply.get('pending'):
+        print("已转发给正在运行的启动器")
+    else:
+        print(f"已转发给正在运行的启动器：{reply.get('message') or '已显示窗口'}")
+    return 0
+
 def main():
     try:
-        app = App()
-        return app.run()
+        args = parse_args(sys.argv[1:])
+        # 已有启动器在运行时把命令转发给它，当前进程不初始化界面
+        single_instance = not args.new_instance and not args.profile_exit
+        address = instance_address(args.config) if single_instance or args.reload else None
+        if address is None:
+            # 无法安全监听时按 --new-instance 运行
+            single_instance = False
+        if args.reload:
+            code = forward(address, 'reload')
+            if code is None:
+                print("没有正在运行的启动器")
+                return 1
+            return code
+
+        if args.launch is not None:
+            # --json 需要每个程序的启动结果，只能在当前进程中启动
+            if single_instance and not args.json:
+                code = forward(address, 'launch', profile=args.launch or None)
+                if code is not None:
+                    return code
+            # 命令行模式不导入界面相关的模块
+            from utils.cli import run_launch
+            return run_launch(args.launch, args.config, args.json, START_TIME)
+
+        instance_server = None
+        if single_instance:
+            from utils.single_instance import InstanceServer
+            code = forward(address, 'show')
+            if code is not None:
+                return code
+            instance_server = InstanceServer(address)
+            if not instance_server.start():
+                # 另一个实例刚好同时启动，已经让它显示窗口
+                print("启动器已在运行")
+                return 0
+
+        if args.profile_startup is not None or args.startup_trace:
+            from utils.startup_profile import start_startup_profiler
+            report_path = args.profile_startup if args.profile_startup not in (None, "", "1") else None
+            start_startup_profiler(START_TIME, report_path, args.startup_trace, args.profile_exit)
+
+        from gui.app import App
+        from utils.startup_profile import startup_mark
+        startup_mark("import_gui")
+        app = App(args.config, instance_server)
+        try:
+            return app.run()
+        finally:
+            if instance_server is not None:
+                instance_server.close()
     except Exception as e:
         error_msg = f"错误信息：\n{str(e)}\n\n详细堆栈：\n{traceback.format_exc()}"
         return show_error(error_msg)
@@ -0,0 +1,13 @@
+"""共用的测试夹具"""
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    """界面测试共用的 QApplication，不需要显示器"""
+    pytest.importorskip("PyQt6")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
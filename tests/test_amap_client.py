@@ -0,0 +1,158 @@
+"""高德接口客户端：在本地模拟服务器上检查重试、退避、超时和连接复用"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import amap_client
+from utils.amap_client import AmapCancelled, AmapClient, AmapError
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # 保持长连接
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            response = self.server.responses.pop(0) if self.server.responses else (200, {'status': '1'})
+        status, body = response
+        if status == 'sleep':
+            # 测试中 time.sleep 被替换了，这里用 Event 等待
+            threading.Event().wait(body)
+            status, body = 200, {'status': '1'}
+        data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.connections = 0
+    # 依次返回的 (状态码, 内容)，用完后返回 200
+    server.responses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """记录退避等待的时间，不真正等待"""
+    calls = []
+    monkeypatch.setattr(amap_client.time, 'sleep', calls.append)
+    return calls
+
+
+@pytest.fixture
+def client(server):
+    client = AmapClient(f"http://127.0.0.1:{server.server_address[1]}",
+                        endpoints={'weather': ("/v3/weather/weatherInfo", (1, 0.3), 2)})
+    yield client
+    client.close()
+
+
+def test_success(client, server):
+    assert client.get('weather', {'city': "110000"}) == {'status': '1'}
+    assert server.requests == 1
+
+
+def test_retry_on_5xx_then_success(client, server, sleeps):
+    server.responses = [(503, {}), (502, {})]
+    assert client.get('weather', {}) == {'status': '1'}
+    assert server.requests == 3
+    assert len(sleeps) == 2
+
+
+def test_retries_exhausted(client, server, sleeps):
+    server.responses = [(500, {})] * 5
+    with pytest.raises(AmapError, match="500"):
+        client.get('weather', {})
+    # 第一次请求加 2 次重试
+    assert server.requests == 3
+    assert len(sleeps) == 2
+
+
+def test_4xx_is_not_retried(client, server, sleeps):
+    server.responses = [(403, {})]
+    with pytest.raises(AmapError):
+        client.get('weather', {})
+    assert server.requests == 1
+    assert sleeps == []
+
+
+def test_invalid_json_is_not_retried(client, server, sleeps):
+    server.responses = [(200, b"not json")]
+    with pytest.raises(AmapError, match="JSON"):
+        client.get('weather', {})
+    assert server.requests == 1
+
+
+def test_timeout_is_retried(client, server, sleeps):
+    server.responses = [('sleep', 1.0)]
+    start = time.monotonic()
+    assert client.get('weather', {}) == {'status': '1'}
+    # 读取超时是 0.3 秒，不会等到第一次请求返回
+    assert time.monotonic() - start < 0.9
+    assert server.requests == 2
+    assert len(sleeps) == 1
+
+
+def test_backoff_is_exponential_and_capped(client, server, sleeps, monkeypatch):
+    # 抖动取上限，等待时间为 backoff * 2^n，不超过 max_backoff
+    monkeypatch.setattr(amap_client.random, 'uniform', lambda low, high: high)
+    client.backoff, client.max_backoff = 0.5, 1.5
+    client.endpoints['weather'] = ("/v3/weather/weatherInfo", (1, 0.3), 3)
+    server.responses = [(503, {})] * 3
+    client.get('weather', {})
+    assert sleeps == [0.5, 1.0, 1.5]
+
+
+def test_backoff_jitter_range(client):
+    for attempt in range(6):
+        delay = client.backoff_delay(attempt)
+        assert 0 <= delay <= min(client.max_backoff, client.backoff * 2 ** attempt)
+
+
+def test_keep_alive_reuses_connection(client, server):
+    for _ in range(10):
+        client.get('weather', {})
+    assert server.requests == 10
+    assert server.connections == 1
+
+
+def test_cancel_stops_retrying(client, server):
+    server.responses = [(503, {})] * 5
+    client.backoff, client.max_backoff = 5, 5
+    cancelled = threading.Event()
+
+    def is_cancelled():
+        # 第一次请求之后取消
+        if server.requests:
+            cancelled.set()
+        return cancelled.is_set()
+
+    start = time.monotonic()
+    with pytest.raises(AmapCancelled):
+        client.get('weather', {}, cancelled=is_cancelled)
+    assert server.requests == 1
+    # 不会等完 5 秒的退避
+    assert time.monotonic() - start < 1
@@ -0,0 +1,83 @@
+"""从行政区划表离线生成城市数据：按 adcode 层级组织省、市、区县"""
+import json
+
+from create_city_json import CityDataGenerator, build_city_data_from_rows
+from tests.test_xlsx import write_xlsx
+from utils.xlsx import iter_xlsx_rows
+
+ROWS = [
+    ["中文名", "adcode", "citycode"],
+    ["中华人民共和国", "100000", None],
+    # 直辖市：没有市级，区县挂在与省份同名的市下面
+    ["北京市", "110000", "010"],
+    ["东城区", "110101", "010"],
+    ["西城区", "110102", "010"],
+    # 普通省份
+    ["广东省", "440000", None],
+    ["深圳市", "440300", "0755"],
+    ["宝安区", "440306", "0755"],
+    ["福田区", "440304", "0755"],
+    # 省直辖的县级市：没有所属的市，作为市级
+    ["河南省", "410000", None],
+    ["郑州市", "410100", "0371"],
+    ["中原区", "410102", "0371"],
+    ["济源市", "419001", "1391"],
+    # 特别行政区
+    ["香港特别行政区", "810000", "1852"],
+    ["中西区", "810001", "1852"],
+    # 找不到省份的行，以及 adcode 无效的行
+    ["无主市", "990100", None],
+    ["无主区", "990101", None],
+    ["坏数据", "4403", None],
+    [None, "440305", None],
+]
+
+
+def test_hierarchy_rules(tmp_path):
+    data = build_city_data_from_rows(iter_xlsx_rows(write_xlsx(tmp_path / "adcode.xlsx", ROWS)))
+    assert list(data) == ["中华人民共和国", "北京市", "广东省", "河南省", "香港特别行政区"]
+    assert data["中华人民共和国"]["cities"] == {}
+
+    beijing = data["北京市"]["cities"]
+    assert list(beijing) == ["北京市"]
+    assert beijing["北京市"]["adcode"] == "110000"
+    assert list(beijing["北京市"]["districts"]) == ["东城区", "西城区"]
+
+    shenzhen = data["广东省"]["cities"]["深圳市"]
+    assert shenzhen["adcode"] == "440300"
+    assert {name: info["adcode"] for name, info in shenzhen["districts"].items()} == {
+        "宝安区": "440306", "福田区": "440304"}
+
+    henan = data["河南省"]["cities"]
+    assert list(henan) == ["郑州市", "济源市"]
+    assert henan["济源市"] == {"name": "济源市", "adcode": "419001", "districts": {}}
+    assert list(henan["郑州市"]["districts"]) == ["中原区"]
+
+    hong_kong = data["香港特别行政区"]["cities"]
+    assert list(hong_kong) == ["香港特别行政区"]
+    assert list(hong_kong["香港特别行政区"]["districts"]) == ["中西区"]
+
+
+def test_columns_found_by_header():
+    rows = [["citycode", "adcode", "中文名"], ["0755", "440000", "广东省"], ["0755", "440300", "深圳市"]]
+    data = build_city_data_from_rows(rows)
+    assert list(data["广东省"]["cities"]) == ["深圳市"]
+
+
+def test_generate_from_xlsx(tmp_path):
+    output_path = tmp_path / "resources" / "city_data.json"
+    xlsx_path = write_xlsx(tmp_path / "adcode.xlsx", ROWS)
+    diff = CityDataGenerator(api_key="").generate_from_xlsx(xlsx_path, str(output_path))
+    saved = json.loads(output_path.read_text(encoding='utf-8'))
+    assert saved["河南省"]["cities"]["济源市"]["adcode"] == "419001"
+    assert output_path.with_suffix(".bin").exists()
+    # 表中 14 个有效的 adcode，直辖市、特别行政区的市与省份共用 adcode
+    assert len(diff["added"]) == 14 and not diff["removed"]
+
+
+def test_generate_from_bad_xlsx(tmp_path):
+    xlsx_path = tmp_path / "adcode.xlsx"
+    xlsx_path.write_text("不是 xlsx", encoding='utf-8')
+    output_path = tmp_path / "city_data.json"
+    assert CityDataGenerator(api_key="").generate_from_xlsx(str(xlsx_path), str(output_path)) is None
+    assert not output_path.exists()
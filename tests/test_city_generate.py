@@ -0,0 +1,182 @@
+"""按省份生成城市数据：在模拟的高德行政区划接口上检查失败、续传、重新开始和输出内容"""
+import json
+import os
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import create_city_json
+from create_city_json import CityDataGenerator
+from utils.amap_client import AmapClient
+
+
+def district(name, adcode, children=()):
+    return {"name": name, "adcode": adcode, "districts": list(children)}
+
+
+TREE = district("中华人民共和国", "100000", [
+    district("北京市", "110000", [district("北京城区", "110100", [
+        district("东城区", "110101"), district("西城区", "110102")])]),
+    district("河北省", "130000", [
+        district("石家庄市", "130100", [district("长安区", "130102"), district("桥西区", "130104")]),
+        district("唐山市", "130200", [district("路南区", "130202")])]),
+    district("浙江省", "330000", [
+        district("杭州市", "330100", [district("上城区", "330102"), district("西湖区", "330106")])]),
+    district("广东省", "440000", [
+        district("广州市", "440100", [district("荔湾区", "440103")]),
+        district("深圳市", "440300", [district("罗湖区", "440303"), district("福田区", "440304")])]),
+])
+
+
+def trim(node, depth):
+    """只保留 depth 层下级行政区"""
+    children = [trim(child, depth - 1) for child in node["districts"]] if depth > 0 else []
+    return district(node["name"], node["adcode"], children)
+
+
+class StandInDistrictHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        keywords, depth = query.get("keywords"), int(query.get("subdistrict", 1))
+        server = self.server
+        with server.lock:
+            server.requests[keywords] += 1
+        if keywords in server.failing:
+            body = {"status": "0", "info": "CUQPS_HAS_EXCEEDED_THE_LIMIT", "infocode": "10020"}
+        else:
+            if keywords == "中国":
+                node = TREE
+            else:
+                node = next((item for item in TREE["districts"] if item["adcode"] == keywords), None)
+            body = {"status": "1", "info": "OK", "districts": [trim(node, depth)] if node else []}
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInDistrictHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = Counter()
+    server.failing = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = AmapClient(f"http://127.0.0.1:{server.server_address[1]}", backoff=0)
+    monkeypatch.setattr(create_city_json, 'get_amap_client', lambda: client)
+    yield server
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def paths(tmp_path):
+    output_path = tmp_path / "resources" / "city_data.json"
+    output_path.parent.mkdir()
+    return output_path, tmp_path / "city_data.parts"
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def generate_once(tmp_path):
+    once_path = tmp_path / "once" / "city_data.json"
+    assert CityDataGenerator("test").generate(str(once_path))
+    return read_bytes(once_path)
+
+
+def by_province(output_path, checkpoint_dir, **kwargs):
+    return CityDataGenerator("test").generate_by_province(
+        str(output_path), 2, str(checkpoint_dir), **kwargs)
+
+
+def province_requests(server):
+    return {keywords: count for keywords, count in server.requests.items() if keywords != "中国"}
+
+
+def test_output_is_byte_identical_to_one_shot(server, paths, tmp_path):
+    output_path, checkpoint_dir = paths
+    diff = by_province(output_path, checkpoint_dir)
+    assert read_bytes(output_path) == generate_once(tmp_path)
+    assert os.path.exists(output_path.with_suffix(".bin"))
+    assert not checkpoint_dir.exists()
+    # 4 个省份、6 个市、10 个区县
+    assert len(diff["added"]) == 20 and not diff["removed"] and not diff["renamed"]
+
+
+def test_failure_keeps_output_and_resume_fetches_only_missing(server, paths, tmp_path):
+    output_path, checkpoint_dir = paths
+    output_path.write_text(json.dumps({"旧数据": {"name": "旧数据", "adcode": "990000", "cities": {}}},
+                                      ensure_ascii=False), encoding='utf-8')
+    original = read_bytes(output_path)
+    server.failing = {"130000", "440000"}
+
+    assert by_province(output_path, checkpoint_dir) is None
+    assert read_bytes(output_path) == original
+    assert sorted(os.listdir(checkpoint_dir)) == ["110000.json", "330000.json", "provinces.json"]
+
+    server.failing = set()
+    server.requests.clear()
+    diff = by_province(output_path, checkpoint_dir)
+    assert province_requests(server) == {"130000": 1, "440000": 1}
+    # 省份列表使用断点中保存的
+    assert server.requests["中国"] == 0
+    assert not checkpoint_dir.exists()
+    assert read_bytes(output_path) == generate_once(tmp_path)
+    assert {item["adcode"] for item in diff["removed"]} == {"990000"}
+
+
+def test_restart_ignores_checkpoints(server, paths):
+    output_path, checkpoint_dir = paths
+    server.failing = {"440000"}
+    assert by_province(output_path, checkpoint_dir) is None
+
+    server.failing = set()
+    server.requests.clear()
+    assert by_province(output_path, checkpoint_dir, restart=True) is not None
+    assert server.requests["中国"] == 1
+    assert province_requests(server) == {"110000": 1, "130000": 1, "330000": 1, "440000": 1}
+
+
+def test_corrupt_checkpoint_is_refetched(server, paths, tmp_path):
+    output_path, checkpoint_dir = paths
+    server.failing = {"440000"}
+    assert by_province(output_path, checkpoint_dir) is None
+    # 写到一半的断点，以及内容属于其他省份的断点
+    (checkpoint_dir / "110000.json").write_text('{"name": "北京市", "adc', encoding='utf-8')
+    (checkpoint_dir / "330000.json").write_text(
+        (checkpoint_dir / "130000.json").read_text(encoding='utf-8'), encoding='utf-8')
+
+    server.failing = set()
+    server.requests.clear()
+    assert by_province(output_path, checkpoint_dir) is not None
+    assert province_requests(server) == {"110000": 1, "330000": 1, "440000": 1}
+    assert read_bytes(output_path) == generate_once(tmp_path)
+
+
+def test_corrupt_province_list_is_refetched(server, paths, tmp_path):
+    output_path, checkpoint_dir = paths
+    server.failing = {"440000"}
+    assert by_province(output_path, checkpoint_dir) is None
+    (checkpoint_dir / "provinces.json").write_text('[{"name": "北京市"}]', encoding='utf-8')
+
+    server.failing = set()
+    server.requests.clear()
+    assert by_province(output_path, checkpoint_dir) is not None
+    assert server.requests["中国"] == 1
+    assert province_requests(server) == {"440000": 1}
+    assert read_bytes(output_path) == generate_once(tmp_path)
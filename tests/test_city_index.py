@@ -0,0 +1,48 @@
+"""行政区划索引：按 adcode 查找位置，二进制文件按需展开省份"""
+import pytest
+
+from utils.city_binary import write_city_binary
+from utils.city_index import CityIndex
+
+CITY_DATA = {
+    "北京市": {"adcode": "110000", "cities": {
+        "北京市": {"adcode": "110100", "districts": {"东城区": {"adcode": "110101"}}}}},
+    "广东省": {"adcode": "440000", "cities": {
+        "深圳市": {"adcode": "440300", "districts": {"宝安区": {"adcode": "440306"}}},
+        "广州市": {"adcode": "440100", "districts": {}}}},
+}
+
+
+@pytest.fixture
+def binary_index(tmp_path):
+    path = str(tmp_path / "city_data.bin")
+    write_city_binary(CITY_DATA, path)
+    index = CityIndex.from_binary(path)
+    yield index
+    index._reader.close()
+
+
+def test_location_from_dict():
+    index = CityIndex.from_dict(CITY_DATA)
+    assert index.location("440306") == ("广东省", "深圳市", "宝安区")
+    assert index.location(110100) == ("北京市", "北京市", None)
+    assert index.location("999999") is None
+
+
+def test_location_expands_only_matching_province(binary_index):
+    assert binary_index.location("440306") == ("广东省", "深圳市", "宝安区")
+    assert "北京市" in binary_index._pending
+    assert binary_index.location("999999") is None
+    assert not binary_index._pending
+
+
+def test_location_with_missing_province_adcode(binary_index):
+    binary_index._adcodes[("北京市", None, None)] = None
+    assert binary_index.location("110101") == ("北京市", "北京市", "东城区")
+
+
+def test_city_lists():
+    index = CityIndex.from_dict(CITY_DATA)
+    # 直辖市只返回市本身，其他省份的城市排序
+    assert index.cities("北京市") == ["北京市"]
+    assert index.cities("广东省") == sorted(["深圳市", "广州市"])
@@ -0,0 +1,83 @@
+"""行政区划搜索：匹配名称、拼音、首字母和 adcode，按匹配程度排序"""
+import pytest
+
+from utils import city_search
+from utils.city_index import CityIndex
+from utils.city_search import MATCH_EXACT, MATCH_INFIX, MATCH_PREFIX, CitySearchIndex
+
+CITY_DATA = {
+    "北京市": {"adcode": "110000", "cities": {
+        "北京市": {"adcode": "110100", "districts": {"东城区": {"adcode": "110101"}}}}},
+    "安徽省": {"adcode": "340000", "cities": {
+        "安庆市": {"adcode": "340800", "districts": {"大观区": {"adcode": "340803"}}},
+        "合肥市": {"adcode": "340100", "districts": {"瑶海区": {"adcode": "340102"}}}}},
+    "广东省": {"adcode": "440000", "cities": {
+        "深圳市": {"adcode": "440300", "districts": {
+            "宝安区": {"adcode": "440306"}, "福田区": {"adcode": "440304"}}}}},
+}
+
+# 代替 pypinyin，测试不依赖词典
+PINYIN = {"北": "bei", "京": "jing", "市": "shi", "东": "dong", "城": "cheng", "区": "qu",
+          "安": "an", "徽": "hui", "省": "sheng", "庆": "qing", "大": "da", "观": "guan",
+          "合": "he", "肥": "fei", "瑶": "yao", "海": "hai", "广": "guang", "深": "shen",
+          "圳": "zhen", "宝": "bao", "福": "fu", "田": "tian"}
+
+
+def fake_pinyin(name):
+    return [PINYIN[char] for char in name]
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(city_search, '_load_pinyin', lambda: fake_pinyin)
+    return CitySearchIndex(CityIndex.from_dict(CITY_DATA))
+
+
+def names(results):
+    return [(result.name, result.match) for result in results]
+
+
+def test_exact_before_prefix_before_infix(index):
+    assert names(index.search("安")) == [
+        ("安徽省", MATCH_PREFIX), ("安庆市", MATCH_PREFIX), ("宝安区", MATCH_INFIX)]
+    assert names(index.search("34080")) == [("安庆市", MATCH_PREFIX), ("大观区", MATCH_PREFIX)]
+    assert names(index.search("340803")) == [("大观区", MATCH_EXACT)]
+    assert names(index.search("baoanqu")) == [("宝安区", MATCH_EXACT)]
+
+
+def test_same_match_orders_by_level(index):
+    # 北京市既是省级也是市级，省级在前
+    results = index.search("北京市")
+    assert [(result.city, result.match) for result in results] == [
+        (None, MATCH_EXACT), ("北京市", MATCH_EXACT)]
+
+
+def test_full_pinyin_and_initials(index):
+    assert names(index.search("hefei")) == [("合肥市", MATCH_PREFIX)]
+    assert names(index.search("HFS")) == [("合肥市", MATCH_EXACT)]
+    assert names(index.search("sz s")) == [("深圳市", MATCH_EXACT)]
+    assert names(index.search("tianqu")) == [("福田区", MATCH_INFIX)]
+
+
+def test_adcode_and_display_name(index):
+    (result,) = index.search("440306")
+    assert result.display_name == "广东省 深圳市 宝安区"
+    assert result.adcode == "440306"
+
+
+def test_limit_keeps_best_matches(index):
+    assert len(index.search("a")) == 7
+    assert names(index.search("a", limit=2)) == [("安徽省", MATCH_PREFIX), ("安庆市", MATCH_PREFIX)]
+    assert len(index.search("q", limit=3)) == 3
+
+
+def test_empty_query(index):
+    assert index.search("  ") == []
+
+
+def test_without_pinyin(monkeypatch):
+    monkeypatch.setattr(city_search, '_load_pinyin', lambda: None)
+    index = CitySearchIndex(CityIndex.from_dict(CITY_DATA))
+    assert index.search("hefei") == []
+    assert names(index.search("合肥")) == [("合肥市", MATCH_PREFIX)]
+    assert names(index.search("340100")) == [("合肥市", MATCH_EXACT)]
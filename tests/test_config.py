@@ -0,0 +1,71 @@
+"""配置保存：写入顺序和备份"""
+import json
+import os
+
+from utils.config import ConfigManager
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_stale_delayed_write_is_dropped(tmp_path):
+    manager = ConfigManager(str(tmp_path / "config.json"))
+    manager.schedule_save({'theme': "旧"}, delay=60)
+    # 模拟定时器线程已经取出内容，还没来得及写入
+    with manager._state_lock:
+        manager._cancel_timer()
+        generation, data = manager._pending
+        manager._pending = None
+    assert manager.save_config({'theme': "新"})
+    manager._write(data, generation)
+    assert read(manager.config_path) == {'theme': "新"}
+
+
+def test_delayed_saves_keep_last(tmp_path):
+    manager = ConfigManager(str(tmp_path / "config.json"))
+    for theme in ("一", "二", "三"):
+        manager.schedule_save({'theme': theme}, delay=60)
+    assert manager.flush()
+    assert read(manager.config_path) == {'theme': "三"}
+
+
+def test_reload_drops_pending_write(tmp_path):
+    manager = ConfigManager(str(tmp_path / "config.json"))
+    manager.save_config({'theme': "一"})
+    manager.schedule_save({'theme': "二"}, delay=60)
+    with open(manager.config_path, 'w', encoding='utf-8') as f:
+        json.dump({'theme': "外部"}, f)
+    assert manager.reload_config() == {'theme': "外部"}
+    manager.flush()
+    assert read(manager.config_path) == {'theme': "外部"}
+
+
+def test_backup_only_refreshed_after_external_change(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({'theme': "原有"}), encoding='utf-8')
+    manager = ConfigManager(str(path))
+    manager.load_config()
+
+    manager.save_config({'theme': "一"})
+    assert read(manager.backup_path) == {'theme': "原有"}
+    backup_stat = os.stat(manager.backup_path).st_mtime_ns
+    # 自己写入的内容不再备份
+    manager.save_config({'theme': "二"})
+    assert read(manager.backup_path) == {'theme': "原有"}
+    assert os.stat(manager.backup_path).st_mtime_ns == backup_stat
+
+    # 外部修改过的配置在下次保存前备份
+    path.write_text(json.dumps({'theme': "外部修改"}), encoding='utf-8')
+    manager.save_config({'theme': "三"})
+    assert read(manager.backup_path) == {'theme': "外部修改"}
+    assert read(manager.config_path) == {'theme': "三"}
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    manager = ConfigManager(str(tmp_path / "config.json"))
+    manager.save_config({'theme': "一"})
+    mtime = os.stat(manager.config_path).st_mtime_ns
+    manager.save_config({'theme': "一"})
+    assert os.stat(manager.config_path).st_mtime_ns == mtime
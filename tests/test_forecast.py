@@ -0,0 +1,162 @@
+"""天气预报解析和存储，使用记录下来的高德天气接口 extensions=all 返回数据"""
+import copy
+import json
+import os
+
+import pytest
+
+from utils import forecast as forecast_module
+from utils.forecast import CACHE_VERSION, ForecastDay, ForecastStore, format_day, parse_forecast
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "weather_all.json")
+
+
+@pytest.fixture
+def data():
+    """接口返回中的第一项预报"""
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)['forecasts'][0]
+
+
+def with_reporttime(data, reporttime):
+    data = copy.deepcopy(data)
+    data['reporttime'] = reporttime
+    return data
+
+
+def test_parse_fixture(data):
+    forecast = parse_forecast(data)
+    assert forecast.adcode == "440306"
+    assert forecast.city == "宝安区"
+    assert forecast.reporttime == "2024-05-20 11:03:07"
+    assert len(forecast.days) == 4
+    assert forecast.days[0] == ForecastDay("2024-05-20", "1", "多云", "雷阵雨", 32, 26,
+                                           "南", "南", "1-3", "1-3")
+    assert format_day(forecast.days[0]) == "周一 多云转雷阵雨 26~32°C"
+    assert format_day(forecast.days[2]) == "周三 中雨转阵雨 25~30°C"
+
+
+def test_float_temperatures_are_preferred(data):
+    cast = data['casts'][0]
+    cast['daytemp'], cast['daytemp_float'] = "30", "31.6"
+    cast['nighttemp'], cast['nighttemp_float'] = "26", "25.4"
+    day = parse_forecast(data).days[0]
+    assert (day.day_temp, day.night_temp) == (32, 25)
+
+
+def test_missing_float_temperatures_fall_back(data):
+    cast = data['casts'][1]
+    del cast['daytemp_float'], cast['nighttemp_float']
+    day = parse_forecast(data).days[1]
+    assert (day.day_temp, day.night_temp) == (31, 26)
+
+
+def test_unparsable_temperature_is_none(data):
+    data['casts'][0]['daytemp_float'] = ""
+    data['casts'][0]['daytemp'] = ""
+    assert parse_forecast(data).days[0].day_temp is None
+
+
+def test_missing_casts(data):
+    del data['casts']
+    assert parse_forecast(data) is None
+
+
+@pytest.mark.parametrize("row", ["2024-05-20", None, {'week': "1"}])
+def test_malformed_row(data, row):
+    data['casts'][1] = row
+    assert parse_forecast(data) is None
+
+
+def test_missing_reporttime(data):
+    del data['reporttime']
+    assert parse_forecast(data) is None
+
+
+def test_update_replaces_only_when_reporttime_advances(data):
+    store = ForecastStore()
+    assert store.update(parse_forecast(data))
+    first = store.get("440306")
+    first_checked = first.checked_at
+
+    same = parse_forecast(data)
+    same.days = ()
+    assert not store.update(same)
+    assert store.get("440306") is first
+    assert len(first.days) == 4
+    assert first.checked_at >= first_checked
+
+    assert not store.update(parse_forecast(with_reporttime(data, "2024-05-20 08:03:07")))
+    assert store.get("440306") is first
+
+    newer = parse_forecast(with_reporttime(data, "2024-05-20 18:03:07"))
+    assert store.update(newer)
+    assert store.get("440306") is newer
+
+
+def test_unchanged_update_bumps_checked_at_without_writing(tmp_path, data, monkeypatch):
+    store = ForecastStore(str(tmp_path / "forecast_cache.json"))
+    writes = []
+    real_write = forecast_module.atomic_write
+    monkeypatch.setattr(forecast_module, 'atomic_write',
+                        lambda path, content: (writes.append(path), real_write(path, content)))
+    clock = iter([1000.0, 2000.0])
+    monkeypatch.setattr(forecast_module.time, 'time', lambda: next(clock))
+
+    assert store.update(parse_forecast(data))
+    assert len(writes) == 1
+    assert not store.update(parse_forecast(data))
+    assert store.get("440306").checked_at == 2000.0
+    assert len(writes) == 1
+
+    store.flush()
+    assert len(writes) == 2
+    assert ForecastStore(store.cache_path).get("440306").checked_at == 2000.0
+    store.flush()
+    assert len(writes) == 2
+
+
+def test_save_and_load_round_trip(tmp_path, data):
+    path = str(tmp_path / "forecast_cache.json")
+    store = ForecastStore(path)
+    store.update(parse_forecast(data))
+    other = parse_forecast(data)
+    other.adcode = "110101"
+    store.update(other)
+
+    loaded = ForecastStore(path)
+    for adcode in ("440306", "110101"):
+        original, restored = store.get(adcode), loaded.get(adcode)
+        assert restored.reporttime == original.reporttime
+        assert restored.checked_at == original.checked_at
+        assert restored.days == original.days
+        assert isinstance(restored.days[0], ForecastDay)
+    assert loaded.is_fresh("440306")
+
+
+def test_version_mismatch_is_ignored(tmp_path, data):
+    path = tmp_path / "forecast_cache.json"
+    store = ForecastStore(str(path))
+    store.update(parse_forecast(data))
+    cache_data = json.loads(path.read_text(encoding='utf-8'))
+    cache_data['version'] = CACHE_VERSION + 1
+    path.write_text(json.dumps(cache_data), encoding='utf-8')
+    assert ForecastStore(str(path)).get("440306") is None
+
+
+def test_corrupt_cache_is_ignored(tmp_path, capsys):
+    path = tmp_path / "forecast_cache.json"
+    path.write_text("{", encoding='utf-8')
+    store = ForecastStore(str(path))
+    assert store.get("440306") is None
+    assert "加载天气预报缓存失败" in capsys.readouterr().out
+
+
+def test_is_fresh_uses_ttl(data, monkeypatch):
+    store = ForecastStore(ttl=60)
+    monkeypatch.setattr(forecast_module.time, 'time', lambda: 1000.0)
+    store.update(parse_forecast(data))
+    assert store.is_fresh("440306")
+    monkeypatch.setattr(forecast_module.time, 'time', lambda: 1061.0)
+    assert not store.is_fresh("440306")
+    assert not store.is_fresh("110101")
@@ -0,0 +1,60 @@
+"""命令行启动 (main.py --launch) 不应导入界面、网络请求和进程扫描模块"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 无界面启动时不需要的模块
+HEADLESS_FORBIDDEN = ("PyQt6", "requests", "psutil")
+
+# 在子进程中运行 main.py，退出后输出已导入的禁用模块
+SCRIPT = """
+import json, runpy, sys
+sys.argv = ["main.py"] + sys.argv[1:]
+try:
+    runpy.run_path("main.py", run_name="__main__")
+    code = 0
+except SystemExit as e:
+    code = e.code
+loaded = sorted(name for name in sys.modules if name.split(".")[0] in %r)
+print("@@" + json.dumps({"code": code, "loaded": loaded}))
+""" % (HEADLESS_FORBIDDEN,)
+
+
+def run_main(tmp_path, *args):
+    env = dict(os.environ, XDG_RUNTIME_DIR=str(tmp_path))
+    completed = subprocess.run([sys.executable, "-c", SCRIPT, *args], cwd=ROOT, env=env,
+                               stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60)
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("@@")]
+    assert lines, completed.stdout + completed.stderr
+    result = json.loads(lines[-1][2:])
+    result['output'] = completed.stdout
+    return result
+
+
+def write_config(tmp_path, programs):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({'programs': programs}), encoding='utf-8')
+    return str(config_path)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="用 shell 脚本作为被启动的程序")
+def test_launch_does_not_import_gui_or_network(tmp_path):
+    program = tmp_path / "program.sh"
+    program.write_text("#!/bin/sh\nexit 0\n", encoding='utf-8')
+    program.chmod(0o755)
+    config_path = write_config(tmp_path, [{'name': "program", 'path': str(program)}])
+    result = run_main(tmp_path, "--launch", "--config", config_path)
+    assert result['code'] == 0
+    assert "[成功] program" in result['output']
+    assert result['loaded'] == []
+
+
+def test_launch_without_programs_does_not_import_gui_or_network(tmp_path):
+    result = run_main(tmp_path, "--launch", "--config", write_config(tmp_path, []))
+    assert result['code'] == 0
+    assert result['loaded'] == []
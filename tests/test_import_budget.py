@@ -0,0 +1,35 @@
+"""首次绘制前的导入耗时和导入的模块，使用 benchmarks/check_import_budget.py 的检查"""
+import importlib.util
+import os
+import statistics
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_budget_check():
+    path = os.path.join(ROOT, "benchmarks", "check_import_budget.py")
+    spec = importlib.util.spec_from_file_location("check_import_budget", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+budget = load_budget_check()
+
+
+@pytest.fixture(scope="module")
+def runs():
+    return [budget.run_importtime() for _ in range(3)]
+
+
+def test_no_forbidden_modules_before_first_paint(runs):
+    assert [name for name in budget.FORBIDDEN_MODULES if name in runs[-1]] == []
+
+
+def test_import_time_within_budget(runs):
+    total_ms = statistics.median(budget.import_total_ms(modules) for modules in runs)
+    assert total_ms <= budget.DEFAULT_BUDGET_MS
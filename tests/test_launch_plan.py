@@ -0,0 +1,49 @@
+"""启动计划：依赖、延迟和就绪条件的配置检查"""
+import json
+
+import pytest
+
+from utils.config import ConfigManager
+from utils.launch_plan import LaunchPlan, LaunchPlanError
+
+
+def program(**options):
+    return dict({'name': "db", 'path': "db.exe"}, **options)
+
+
+@pytest.mark.parametrize("options", [
+    {'delay_ms': True},
+    {'delay_ms': -1},
+    {'delay_ms': "100"},
+    {'ready': {'type': "alive", 'ms': "2000"}},
+    {'ready': {'type': "alive", 'ms': True}},
+    {'ready': {'type': "alive", 'ms': -5}},
+    {'ready': {'type': "file", 'path': "ready.flag", 'timeout_ms': "x"}},
+    {'ready': {'type': "port", 'port': True}},
+    {'ready': {'type': "port", 'port': 70000}},
+    {'ready': {'type': "port", 'port': 3306, 'host': 127001}},
+    {'ready': {'type': "file", 'path': 1}},
+    {'ready': {'type': "socket"}},
+])
+def test_invalid_step_is_rejected(options):
+    with pytest.raises(LaunchPlanError):
+        LaunchPlan([program(**options)])
+
+
+def test_valid_step_is_accepted():
+    plan = LaunchPlan([
+        program(delay_ms=500, ready={'type': "port", 'port': 3306, 'host': "localhost",
+                                     'timeout_ms': 1500.5}),
+        {'name': "app", 'path': "app.exe", 'depends_on': ["db"],
+         'ready': {'type': "alive", 'ms': 0}},
+    ])
+    assert plan.steps[1].deps == [0]
+
+
+def test_invalid_ready_is_reported_as_config_error(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({'programs': [program(ready={'type': "alive", 'ms': "2000"})]}),
+                    encoding='utf-8')
+    manager = ConfigManager(str(path))
+    manager.load_config()
+    assert manager.config_error == "db 的 ready.ms 必须是非负数"
@@ -0,0 +1,83 @@
+"""启动记录：写入、压缩和后台观察"""
+import json
+
+from utils import launch_stats
+from utils.launch_stats import LaunchTelemetry, percentile
+from utils.launcher import LaunchResult
+
+
+def result(name="a", spawn_ms=12.0, ready_ms=None, ok=True, error=None):
+    return LaunchResult(name, f"{name}.exe", ok, error, pid=1, spawn_ms=spawn_ms, ready_ms=ready_ms)
+
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile(list(range(1, 101)), 95) == 95
+
+
+def test_line_count_is_read_once(tmp_path, monkeypatch):
+    path = tmp_path / "launch_stats.jsonl"
+    path.write_text("".join(json.dumps({'t': i, 'path': "x.exe"}) + "\n" for i in range(3)),
+                    encoding='utf-8')
+    telemetry = LaunchTelemetry(str(path))
+    counts = []
+    count_lines = telemetry._count_lines
+    monkeypatch.setattr(telemetry, '_count_lines', lambda: counts.append(True) or count_lines())
+    for _ in range(5):
+        telemetry.record(result())
+    assert counts == [True]
+    assert telemetry._line_count == 8
+    assert len(read_lines(path)) == 8
+
+
+def test_compact_keeps_recent_records_per_program(tmp_path, monkeypatch):
+    monkeypatch.setattr(launch_stats, 'COMPACT_THRESHOLD', 20)
+    monkeypatch.setattr(launch_stats, 'MAX_RECORDS_PER_PROGRAM', 3)
+    path = tmp_path / "launch_stats.jsonl"
+    telemetry = LaunchTelemetry(str(path))
+    for index in range(21):
+        telemetry.record(result("a" if index % 3 else "b", spawn_ms=index))
+    records = read_lines(path)
+    assert len(records) == 6
+    assert telemetry._line_count == 6
+    assert [r['spawn'] for r in records if r['path'] == "a.exe"] == [17, 19, 20]
+    assert [r['spawn'] for r in records if r['path'] == "b.exe"] == [12, 15, 18]
+    assert [r['t'] for r in records] == sorted(r['t'] for r in records)
+
+
+def test_observer_does_not_modify_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(launch_stats, 'wait_for_input_idle', lambda process, timeout: True)
+
+    class Process:
+        def wait(self, timeout):
+            return None
+
+    path = tmp_path / "launch_stats.jsonl"
+    telemetry = LaunchTelemetry(str(path), early_exit_window_ms=0)
+    launched = result(spawn_ms=10.0)
+    telemetry.observe(launched, Process())
+    telemetry.wait(5)
+    assert launched.ready_ms is None
+    (record,) = read_lines(path)
+    assert record['ready'] >= 10.0
+    assert record['ok'] is True
+
+
+def test_early_exit_counts_as_failure(tmp_path):
+    class Process:
+        def wait(self, timeout):
+            return 3
+
+    path = tmp_path / "launch_stats.jsonl"
+    telemetry = LaunchTelemetry(str(path), early_exit_window_ms=0)
+    telemetry.observe(result(), Process())
+    telemetry.wait(5)
+    (summary,) = telemetry.summary()
+    assert summary['failures'] == 1
+    assert summary['last_error'] == "进程提前退出，退出码 3"
@@ -0,0 +1,54 @@
+"""批量启动：单个程序出错不影响整批，后台线程总是通知结束"""
+from utils.launcher import LaunchEngine
+
+PROGRAMS = [{'name': "a", 'path': "a.exe"}, {'name': "b", 'path': "b.exe"}]
+
+
+class Process:
+    pid = 1
+
+
+class BrokenTelemetry:
+    def observe(self, result, process):
+        if result.name == "a":
+            raise OSError("磁盘已满")
+
+
+def test_step_error_becomes_failed_result():
+    results = LaunchEngine(PROGRAMS, spawn=lambda path: Process(),
+                           telemetry=BrokenTelemetry()).run()
+    assert [result.ok for result in results] == [False, True]
+    assert results[0].error == "磁盘已满"
+
+
+def test_ready_check_error_becomes_failed_result(monkeypatch):
+    from utils import launcher
+
+    def broken(ready, process, cancelled):
+        raise ValueError("就绪检查出错")
+
+    monkeypatch.setattr(launcher, 'wait_until_ready', broken)
+    programs = [dict(PROGRAMS[0], ready={'type': "alive", 'ms': 10}), PROGRAMS[1]]
+    results = LaunchEngine(programs, spawn=lambda path: Process()).run()
+    assert [result.ok for result in results] == [False, True]
+    assert results[0].error == "就绪检查出错"
+
+
+def test_worker_emits_finished_when_engine_fails(app, monkeypatch):
+    from gui.launch_worker import LaunchWorker
+    from utils.launch_plan import LaunchPlan
+
+    worker = LaunchWorker(LaunchPlan(PROGRAMS), 1)
+    finished = []
+    worker.finished.connect(finished.append)
+
+    def broken():
+        raise RuntimeError("扫描进程失败")
+
+    monkeypatch.setattr(worker.engine, 'run', broken)
+    monkeypatch.setattr("threading.excepthook", lambda args: None)
+    worker.start()
+    worker._thread.join(5)
+    # 信号从后台线程排队送到主线程
+    app.processEvents()
+    assert finished == [[]]
@@ -0,0 +1,158 @@
+"""按系统压力控制启动节奏：使用模拟的压力来源和时间"""
+import threading
+
+import pytest
+
+from utils.pressure import AdaptivePacer, CallableSource, PsiSource, create_pacer
+
+
+class FakeTime:
+    """模拟的时钟，等待时直接把时间往后拨"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.waits = []
+
+    def clock(self):
+        return self.now
+
+    def wait(self, cancelled, timeout):
+        self.waits.append(timeout)
+        self.now += timeout
+        return cancelled.is_set()
+
+
+class SequenceSource(CallableSource):
+    """依次返回给定的数值，用完后一直返回最后一个"""
+
+    def __init__(self, values, threshold=1.0):
+        self.values = list(values)
+        self.reads = 0
+        super().__init__(self._next, threshold, name="synthetic")
+
+    def _next(self):
+        self.reads += 1
+        return self.values.pop(0) if len(self.values) > 1 else self.values[0]
+
+
+def make_pacer(sources, fake, **kwargs):
+    kwargs.setdefault('max_wait_ms', 2000)
+    kwargs.setdefault('interval_ms', 250)
+    kwargs.setdefault('min_interval_ms', 0)
+    return AdaptivePacer(sources, clock=fake.clock, wait=fake.wait, **kwargs)
+
+
+def test_admit_when_pressure_low():
+    fake = FakeTime()
+    source = SequenceSource([0.3])
+    assert make_pacer([source], fake).wait_for_slot() == 0
+    assert source.reads == 1
+    assert fake.waits == []
+
+
+def test_throttle_until_pressure_drops():
+    fake = FakeTime()
+    source = SequenceSource([2.0, 1.5, 1.0, 0.4])
+    waited = make_pacer([source], fake).wait_for_slot()
+    # 比值等于 1 也要等待
+    assert fake.waits == [0.25, 0.25, 0.25]
+    assert waited == pytest.approx(0.75)
+    assert source.reads == 4
+
+
+def test_max_wait_forces_admit():
+    fake = FakeTime()
+    source = SequenceSource([5.0])
+    waited = make_pacer([source], fake, max_wait_ms=1000).wait_for_slot()
+    assert waited == pytest.approx(1.0)
+    assert len(fake.waits) == 4
+
+
+def test_threshold_scales_samples():
+    fake = FakeTime()
+    # 数值 30 在阈值 40 以下，放行
+    pacer = make_pacer([SequenceSource([30.0], threshold=40.0)], fake)
+    assert pacer.pressure() == pytest.approx(0.75)
+    assert pacer.wait_for_slot() == 0
+
+
+def test_highest_source_wins_and_missing_samples_are_ignored():
+    fake = FakeTime()
+    pacer = make_pacer([SequenceSource([0.2]), SequenceSource([None]),
+                        SequenceSource([3.0, 0.5])], fake)
+    assert pacer.pressure() == pytest.approx(3.0)
+    assert pacer.pressure() == pytest.approx(0.5)
+
+
+def test_no_usable_source_admits():
+    fake = FakeTime()
+    pacer = make_pacer([SequenceSource([None])], fake)
+    assert pacer.pressure() is None
+    assert pacer.wait_for_slot() == 0
+
+
+def test_min_interval_between_admits():
+    fake = FakeTime()
+    pacer = make_pacer([SequenceSource([0.1])], fake, min_interval_ms=500)
+    assert pacer.wait_for_slot() == 0
+    fake.now += 0.2
+    assert pacer.wait_for_slot() == pytest.approx(0.3)
+    assert fake.waits == [pytest.approx(0.3)]
+
+
+def test_cancel_stops_waiting():
+    fake = FakeTime()
+    cancelled = threading.Event()
+
+    def wait(event, timeout):
+        fake.wait(event, timeout)
+        if len(fake.waits) == 2:
+            event.set()
+        return event.is_set()
+
+    pacer = AdaptivePacer([SequenceSource([5.0])], max_wait_ms=10000, interval_ms=250,
+                          min_interval_ms=0, clock=fake.clock, wait=wait)
+    assert pacer.wait_for_slot(cancelled) == pytest.approx(0.5)
+    assert cancelled.is_set()
+
+
+def test_psi_source_reads_avg10(tmp_path):
+    path = tmp_path / "cpu"
+    path.write_text("some avg10=55.20 avg60=20.00 avg300=5.00 total=1\n"
+                    "full avg10=1.00 avg60=0.00 avg300=0.00 total=1\n")
+    source = PsiSource("cpu", threshold=40.0)
+    source.path = str(path)
+    assert source.read() == pytest.approx(55.2)
+    assert source.sample() == pytest.approx(1.38)
+    source.path = str(tmp_path / "missing")
+    assert source.sample() is None
+
+
+def test_create_pacer_from_config():
+    assert create_pacer(None) is None
+    assert create_pacer({'enabled': False}) is None
+    pacer = create_pacer({'enabled': True, 'max_wait_ms': 3000, 'interval_ms': 100})
+    assert pacer.max_wait == pytest.approx(3.0)
+    assert pacer.interval == pytest.approx(0.1)
+    assert pacer.sources
+
+
+def test_launch_engine_waits_for_pacer():
+    from utils.launcher import LaunchEngine
+
+    fake = FakeTime()
+    pacer = make_pacer([SequenceSource([3.0, 3.0, 0.5])], fake, min_interval_ms=500)
+    spawned = []
+
+    class Process:
+        pid = 1
+
+    def spawn(path):
+        spawned.append((path, fake.now))
+        return Process()
+
+    programs = [{'name': "a", 'path': "a.exe"}, {'name': "b", 'path': "b.exe"}]
+    results = LaunchEngine(programs, max_workers=1, spawn=spawn, pacer=pacer).run()
+    assert all(result.ok for result in results)
+    # 第一个程序等压力下降（两次 0.25 秒），第二个还要与第一个间隔 0.5 秒
+    assert [when for _, when in spawned] == [pytest.approx(100.5), pytest.approx(101.0)]
@@ -0,0 +1,116 @@
+"""单实例监听：命令转发、异常数据和套接字目录权限"""
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from utils import single_instance
+from utils.single_instance import InstanceServer, instance_address, send_command
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="检查的是 Unix 域套接字")
+
+
+@pytest.fixture
+def address(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    return instance_address(str(tmp_path / "config.json"))
+
+
+@pytest.fixture
+def server(address):
+    commands = []
+
+    def on_command(message):
+        commands.append(message)
+        return {'ok': True, 'message': message.get('profile')}
+
+    server = InstanceServer(address, on_command)
+    assert server.start()
+    server.commands = commands
+    yield server
+    server.close()
+
+
+def test_socket_directory_is_private(address):
+    info = os.stat(os.path.dirname(address))
+    assert stat.S_IMODE(info.st_mode) == 0o700
+    assert info.st_uid == os.getuid()
+
+
+def test_shared_directory_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    (tmp_path / "nm-start").mkdir(mode=0o777)
+    os.chmod(tmp_path / "nm-start", 0o777)
+    assert instance_address(str(tmp_path / "config.json")) is None
+    assert not InstanceServer(None).start()
+
+
+def test_forward_command(server, address):
+    assert send_command(address, 'launch', profile="work") == {'ok': True, 'message': "work"}
+    assert server.commands == [{'command': 'launch', 'profile': "work"}]
+
+
+def test_no_instance(address):
+    assert send_command(address, 'show') is None
+
+
+UNPICKLED = []
+
+
+def _record_unpickle():
+    UNPICKLED.append(True)
+    return {'command': 'show'}
+
+
+class Payload:
+    """反序列化时会调用 _record_unpickle"""
+
+    def __reduce__(self):
+        return _record_unpickle, ()
+
+
+def test_pickle_is_not_loaded(server, address):
+    from multiprocessing.connection import Client
+
+    connection = Client(address, 'AF_UNIX')
+    connection.send(Payload())
+    # 不是 JSON，不回复直接断开
+    with pytest.raises(EOFError):
+        connection.recv_bytes()
+    connection.close()
+    assert UNPICKLED == []
+    # 监听线程仍在工作
+    assert send_command(address, 'show') == {'ok': True, 'message': None}
+    assert server.commands == [{'command': 'show'}]
+
+
+def test_silent_client_does_not_block(server, address, monkeypatch):
+    from multiprocessing.connection import Client
+
+    monkeypatch.setattr(single_instance, 'RECEIVE_TIMEOUT', 0.2)
+    connection = Client(address, 'AF_UNIX')
+    try:
+        start = time.monotonic()
+        assert send_command(address, 'show')['ok']
+        assert time.monotonic() - start < single_instance.REPLY_TIMEOUT
+    finally:
+        connection.close()
+
+
+def test_handler_error_is_replied(address):
+    server = InstanceServer(address, lambda message: 1 / 0)
+    assert server.start()
+    try:
+        reply = send_command(address, 'reload')
+        assert reply['ok'] is False and "division" in reply['error']
+        assert send_command(address, 'nope') == {'ok': False, 'error': "不支持的命令：nope"}
+    finally:
+        server.close()
+
+
+def test_close_does_not_wait(server):
+    start = time.monotonic()
+    server.close()
+    assert time.monotonic() - start < 1.5
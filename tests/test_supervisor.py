@@ -0,0 +1,60 @@
+"""进程监管：扫描进程表判断程序是否已在运行"""
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from utils import supervisor
+from utils.supervisor import is_interpreter, normalize_path
+
+pytestmark = pytest.mark.skipif(not os.path.isdir('/proc'), reason="读取 /proc 的扫描")
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/usr/bin/python3.11", True),
+    ("/usr/bin/pythonw", True),
+    ("/bin/sh", True),
+    ("C:/Python311/python.exe", True),
+    ("/usr/bin/less", False),
+    ("/usr/bin/vim", False),
+    ("/usr/bin/shred", False),
+])
+def test_is_interpreter(path, expected):
+    assert is_interpreter(path) is expected
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "tool.py"
+    path.write_text("import time\ntime.sleep(30)\n", encoding='utf-8')
+    return str(path)
+
+
+def start(*command):
+    process = subprocess.Popen(command, stdin=subprocess.DEVNULL)
+    # 等进程执行到目标程序
+    time.sleep(0.2)
+    return process
+
+
+def test_file_opened_by_another_program_is_not_running(script):
+    # 参数中的第一个就是脚本路径
+    process = start("tail", script, "-f")
+    try:
+        table = supervisor._scan_proc()
+        assert normalize_path(script) not in table
+        assert process.pid in table[normalize_path(os.readlink(f'/proc/{process.pid}/exe'))]
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_script_run_by_interpreter_is_running(script):
+    process = start(sys.executable, script)
+    try:
+        assert process.pid in supervisor._scan_proc()[normalize_path(script)]
+    finally:
+        process.kill()
+        process.wait()
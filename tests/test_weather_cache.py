@@ -0,0 +1,73 @@
+"""天气缓存：有效期、统计和写盘时机"""
+import json
+
+from utils import weather_cache as weather_cache_module
+from utils.weather_cache import WeatherCache
+
+LIVE = {'adcode': "440306", 'weather': "晴", 'temperature': "25"}
+
+
+def test_hit_stale_and_miss(monkeypatch):
+    cache = WeatherCache(ttl=60)
+    monkeypatch.setattr(weather_cache_module.time, 'time', lambda: 1000.0)
+    assert cache.lookup("440306") is None
+    cache.put("440306", LIVE)
+    assert cache.lookup("440306").data == LIVE
+    monkeypatch.setattr(weather_cache_module.time, 'time', lambda: 1061.0)
+    assert cache.lookup("440306").data == LIVE
+    assert cache.lookup("440306", "all") is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['stale'], stats['misses']) == (1, 1, 2)
+    assert stats['hit_rate'] == 0.25
+
+
+def test_lookup_does_not_write(tmp_path, monkeypatch):
+    path = tmp_path / "weather_cache.json"
+    cache = WeatherCache(str(path))
+    cache.put("440306", LIVE)
+    saves = []
+    monkeypatch.setattr(cache, 'save', lambda: saves.append(True))
+    for _ in range(10):
+        cache.lookup("440306")
+        cache.lookup("110101")
+    cache.record_fetch()
+    assert saves == []
+    cache.flush()
+    assert saves == [True]
+
+
+def test_flush_persists_counters(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    cache = WeatherCache(str(path))
+    cache.put("440306", LIVE)
+    cache.record_fetch()
+    cache.record_fetch()
+    cache.lookup("440306")
+    cache.flush()
+    saved = json.loads(path.read_text(encoding='utf-8'))
+    assert saved['counters'] == {'hits': 1, 'stale': 0, 'misses': 0, 'fetches': 2}
+
+    loaded = WeatherCache(str(path))
+    assert loaded.lookup("440306").data == LIVE
+    assert loaded.counters['fetches'] == 2
+    assert loaded.counters['hits'] == 2
+
+
+def test_flush_without_changes_does_not_write(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    cache = WeatherCache(str(path))
+    cache.flush()
+    assert not path.exists()
+
+
+def test_save_goes_through_atomic_write(tmp_path, monkeypatch):
+    path = tmp_path / "weather_cache.json"
+    writes = []
+    real_write = weather_cache_module.atomic_write
+    monkeypatch.setattr(weather_cache_module, 'atomic_write',
+                        lambda path, content: (writes.append(path), real_write(path, content)))
+    cache = WeatherCache(str(path))
+    cache.put("440306", LIVE)
+    assert writes == [str(path)]
+    assert not (tmp_path / "weather_cache.json.tmp").exists()
+    assert WeatherCache(str(path)).lookup("440306").data == LIVE
@@ -0,0 +1,162 @@
+"""后台天气客户端：取消、去重和结果分发，不访问网络"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from gui import weather_client as weather_client_module
+from gui.weather_client import WeatherClient
+from utils.forecast import ForecastStore
+from utils.weather_cache import WeatherCache
+
+LIVE = {'adcode': "440306", 'weather': "晴", 'temperature': "25",
+        'reporttime': "2024-05-20 11:00:00"}
+FORECAST = {'adcode': "440306", 'city': "宝安区", 'reporttime': "2024-05-20 11:03:07",
+            'casts': [{'date': "2024-05-20", 'week': "1", 'dayweather': "晴", 'nightweather': "晴",
+                       'daytemp': "30", 'nighttemp': "25"}]}
+
+
+class FakeApi:
+    """代替 get_weather_info，可以让请求停在进行中"""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, adcode, api_key, extensions="base", timeout=None, cancelled=None):
+        self.calls.append((adcode, extensions))
+        self.started.set()
+        self.release.wait(5)
+        return FORECAST if extensions == "all" else LIVE
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = FakeApi()
+    monkeypatch.setattr(weather_client_module, 'get_weather_info', api)
+    return api
+
+
+@pytest.fixture
+def client(app):
+    client = WeatherClient()
+    client.set_cache(WeatherCache())
+    client.set_forecast_store(ForecastStore())
+    yield client
+    client._pool.waitForDone(5000)
+
+
+def wait_until(app, condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_result_is_delivered_and_cached(app, client, api):
+    results = []
+    client.finished.connect(lambda rid, info: results.append((rid, info)))
+    request_id = client.fetch("440306", "key")
+    wait_until(app, lambda: results)
+    assert results == [(request_id, LIVE)]
+    assert not client.is_pending(request_id)
+    assert client.cache.lookup("440306").data == LIVE
+
+
+def test_cancel_after_dequeue_releases_forecast_request(app, client, api):
+    api.release.clear()
+    results = []
+    client.finished.connect(lambda rid, info: results.append(rid))
+    request_id = client.fetch_forecast("440306", "key")
+    # 任务已经开始执行，tryTake 取不回来
+    assert api.started.wait(5)
+    client.cancel(request_id)
+    assert client.fetch_forecast("440306", "key") == request_id
+    api.release.set()
+
+    wait_until(app, lambda: not client._tasks)
+    assert client._forecast_requests == {}
+    assert results == []
+    # 结果仍然写入了共享的预报
+    assert client.forecasts.get("440306") is not None
+
+    # 之后可以再次请求
+    client.forecasts.get("440306").checked_at = 0
+    second = client.fetch_forecast("440306", "key")
+    assert second is not None and second != request_id
+    wait_until(app, lambda: not client._tasks)
+
+
+def test_cancelled_before_start_does_not_call_api(app, client, api):
+    api.release.clear()
+    client._pool.setMaxThreadCount(1)
+    first = client.fetch("440306", "key")
+    assert api.started.wait(5)
+    queued = client.fetch("110101", "key")
+    client.cancel(queued)
+    assert queued not in client._tasks
+    api.release.set()
+    wait_until(app, lambda: not client._tasks)
+    assert api.calls == [("440306", "base")]
+    assert not client.is_pending(first)
+
+
+def test_cancelled_task_dequeued_before_run_is_released(app, client, api):
+    api.release.clear()
+    client._pool.setMaxThreadCount(1)
+    client.fetch("110101", "key")
+    assert api.started.wait(5)
+    request_id = client.fetch_forecast("440306", "key")
+    # 模拟 cancel 时任务刚被线程池取出：tryTake 失败，只设置了标记
+    client._tasks[request_id].cancelled = True
+    api.release.set()
+    wait_until(app, lambda: not client._tasks)
+    assert client._forecast_requests == {}
+    assert api.calls == [("110101", "base")]
+    assert client.fetch_forecast("440306", "key") not in (None, request_id)
+    wait_until(app, lambda: not client._tasks)
+
+
+def test_forecast_requests_are_shared(app, client, api):
+    api.release.clear()
+    updated = []
+    client.forecast_updated.connect(updated.append)
+    first = client.fetch_forecast("440306", "key")
+    assert client.fetch_forecast("440306", "key") == first
+    api.release.set()
+    wait_until(app, lambda: updated)
+    assert updated == ["440306"]
+    assert api.calls == [("440306", "all")]
+    # 刚确认过，不再请求
+    assert client.fetch_forecast("440306", "key") is None
+
+
+def test_task_passes_cancel_predicate(app, client, monkeypatch):
+    seen = []
+
+    def fake(adcode, api_key, extensions="base", timeout=None, cancelled=None):
+        seen.append(cancelled())
+        # cancelled 是任务的方法
+        cancelled.__self__.cancelled = True
+        seen.append(cancelled())
+        return None
+
+    monkeypatch.setattr(weather_client_module, 'get_weather_info', fake)
+    client.fetch("440306", "key")
+    wait_until(app, lambda: not client._tasks)
+    assert seen == [False, True]
+
+
+def test_failed_requests_are_counted(app, client, monkeypatch):
+    monkeypatch.setattr(weather_client_module, 'get_weather_info',
+                        lambda *args, **kwargs: None)
+    client.fetch("440306", "key")
+    client.fetch_forecast("110101", "key")
+    wait_until(app, lambda: not client._tasks)
+    assert client.cache.counters['fetches'] == 2
+    assert client.cache.lookup("440306") is None
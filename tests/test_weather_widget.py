@@ -0,0 +1,42 @@
+"""天气设置对话框：关闭后不再接收共享天气客户端的结果"""
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+
+from gui.weather_client import get_weather_client
+from gui.weather_widget import LocationDialog, WeatherWidget
+
+
+def receivers():
+    client = get_weather_client()
+    return client.receivers(client.finished)
+
+
+def test_dialog_disconnects_when_closed(app):
+    before = receivers()
+    dialog = LocationDialog()
+    assert receivers() == before + 1
+    dialog.reject()
+    assert receivers() == before
+    # 再次关闭不会出错
+    dialog.done(0)
+    assert receivers() == before
+
+
+def test_dialog_is_deleted_after_exec(app, monkeypatch):
+    destroyed = []
+
+    def fake_exec(dialog):
+        dialog.destroyed.connect(lambda: destroyed.append(True))
+        dialog.reject()
+        return 0
+
+    monkeypatch.setattr(LocationDialog, 'exec', fake_exec)
+    widget = WeatherWidget()
+    before = receivers()
+    widget.show_location_dialog()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    assert destroyed == [True]
+    assert receivers() == before
@@ -0,0 +1,104 @@
+"""流式读取 xlsx：共享字符串、内联字符串、数字和空单元格"""
+import zipfile
+from xml.sax.saxutils import escape
+
+import pytest
+
+from utils.xlsx import XlsxError, iter_xlsx_rows
+
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+          xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>"""
+
+WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"
+              Target="worksheets/sheet1.xml"/></Relationships>"""
+
+
+def column_name(index):
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord('A') + remainder) + name
+    return name
+
+
+def write_xlsx(path, rows, inline=False):
+    """写一个最小的 xlsx：字符串默认放在共享字符串表中，数字直接写入，None 不写单元格"""
+    strings = []
+    sheet_rows = []
+    for row_number, row in enumerate(rows, 1):
+        cells = []
+        for column, value in enumerate(row):
+            ref = f"{column_name(column)}{row_number}"
+            if value is None:
+                continue
+            if isinstance(value, (int, float)):
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            elif inline:
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{escape(value)}</t></is></c>')
+            else:
+                strings.append(value)
+                cells.append(f'<c r="{ref}" t="s"><v>{len(strings) - 1}</v></c>')
+        sheet_rows.append(f'<row r="{row_number}">{"".join(cells)}</row>')
+    sheet = ('<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+             f'<sheetData>{"".join(sheet_rows)}</sheetData></worksheet>')
+    shared = ('<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+              + "".join(f"<si><t>{escape(value)}</t></si>" for value in strings) + '</sst>')
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr("xl/workbook.xml", WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS)
+        archive.writestr("xl/worksheets/sheet1.xml", sheet)
+        if strings:
+            archive.writestr("xl/sharedStrings.xml", shared)
+    return str(path)
+
+
+@pytest.mark.parametrize("inline", [False, True])
+def test_rows_and_gaps(tmp_path, inline):
+    path = write_xlsx(tmp_path / "t.xlsx", [
+        ["中文名", "adcode", "citycode"],
+        ["北京市", "110000", "010"],
+        ["东城区", 110101, None],
+        [None, None, "x"],
+    ], inline=inline)
+    assert list(iter_xlsx_rows(path)) == [
+        ["中文名", "adcode", "citycode"],
+        ["北京市", "110000", "010"],
+        ["东城区", "110101"],
+        [None, None, "x"],
+    ]
+
+
+def test_rich_text_and_wide_columns(tmp_path):
+    path = tmp_path / "t.xlsx"
+    write_xlsx(path, [["占位"]])
+    sheet = ('<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+             '<row r="1"><c r="AB1" t="s"><v>0</v></c></row></sheetData></worksheet>')
+    shared = ('<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+              '<si><r><t>深圳</t></r><r><t>市</t></r></si></sst>')
+    with zipfile.ZipFile(path) as source:
+        files = {name: source.read(name) for name in source.namelist()}
+    files["xl/worksheets/sheet1.xml"] = sheet
+    files["xl/sharedStrings.xml"] = shared
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    (row,) = iter_xlsx_rows(str(path))
+    assert len(row) == 28 and row[27] == "深圳市"
+
+
+def test_not_a_zip(tmp_path):
+    path = tmp_path / "t.xlsx"
+    path.write_text("中文名,adcode\n", encoding='utf-8')
+    with pytest.raises(XlsxError):
+        list(iter_xlsx_rows(str(path)))
+
+
+def test_missing_sheet(tmp_path):
+    path = write_xlsx(tmp_path / "t.xlsx", [["a"]])
+    with pytest.raises(XlsxError):
+        list(iter_xlsx_rows(path, sheet_index=1))
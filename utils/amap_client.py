@@ -0,0 +1,119 @@
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+# 可以通过环境变量指向本地的模拟服务器
+AMAP_BASE_URL = os.environ.get("NM_AMAP_BASE_URL", "https://restapi.amap.com")
+
+# 各接口的路径、(连接超时, 读取超时) 和最多重试次数
+AMAP_ENDPOINTS = {
+    "weather": ("/v3/weather/weatherInfo", (3.05, 5), 2),
+    "district": ("/v3/config/district", (3.05, 30), 3),
+}
+
+# 服务端临时错误，值得重试
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 退避等待期间检查是否取消的间隔 (秒)
+CANCEL_CHECK_INTERVAL = 0.1
+
+
+class AmapError(Exception):
+    """高德接口请求失败"""
+
+
+class AmapCancelled(AmapError):
+    """请求在重试之间被取消"""
+
+
+class AmapClient:
+    """高德开放平台接口客户端
+
+    所有请求共用一个 requests.Session，连接保持长连接并放入连接池复用。
+    连接失败、超时和 5xx 响应按指数退避加随机抖动重试。
+    """
+
+    def __init__(self, base_url=AMAP_BASE_URL, endpoints=None, pool_size=8,
+                 backoff=0.5, max_backoff=8.0):
+        self.base_url = base_url.rstrip("/")
+        self.endpoints = dict(AMAP_ENDPOINTS)
+        if endpoints:
+            self.endpoints.update(endpoints)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        # 重试由我们自己控制，连接池大小与并发请求数一致
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, endpoint, params, timeout=None, cancelled=None):
+        """请求接口并返回解析后的 JSON，重试用尽后抛出 AmapError
+
+        cancelled 为返回是否已取消的函数，每次重试前和退避等待期间检查，取消后抛出 AmapCancelled；
+        已经发出的一次请求仍会在超时内结束。
+        """
+        path, default_timeout, retries = self.endpoints[endpoint]
+        url = self.base_url + path
+        timeout = timeout or default_timeout
+
+        for attempt in range(retries + 1):
+            if cancelled is not None and cancelled():
+                raise AmapCancelled("请求已取消")
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error = AmapError(f"服务器返回 {response.status_code}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = AmapError(f"网络错误: {str(e)}")
+            except ValueError as e:
+                # requests.JSONDecodeError 同时也是 RequestException，要先处理
+                raise AmapError(f"响应不是有效的 JSON: {str(e)}") from e
+            except requests.RequestException as e:
+                # 4xx 等错误重试也没有用
+                raise AmapError(str(e)) from e
+
+            if attempt < retries:
+                self._sleep(self.backoff_delay(attempt), cancelled)
+
+        raise error
+
+    @staticmethod
+    def _sleep(delay, cancelled):
+        """退避等待，可以取消时分段等待以便及时退出"""
+        if cancelled is None:
+            time.sleep(delay)
+            return
+        deadline = time.monotonic() + delay
+        while not cancelled():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(CANCEL_CHECK_INTERVAL, remaining))
+
+    def backoff_delay(self, attempt):
+        """第 attempt 次重试前的等待时间（完全随机抖动）"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
+
+
+_amap_client = None
+_amap_client_lock = threading.Lock()
+
+
+def get_amap_client():
+    """获取进程内共享的高德接口客户端"""
+    global _amap_client
+    if _amap_client is None:
+        with _amap_client_lock:
+            if _amap_client is None:
+                _amap_client = AmapClient()
+    return _amap_client
@@ -0,0 +1,177 @@
+"""行政区划数据的二进制格式
+
+文件布局（小端序，各段按 4 字节对齐）：
+
+    头部        magic(4s) version(H) reserved(H) string_count(I) node_count(I)
+                province_count(I) strings_pos(I) blob_pos(I) blob_len(I) nodes_pos(I)
+    字符串表    string_count + 1 个 uint32 偏移，指向 UTF-8 字符串区
+    字符串区    去重后的名称
+    节点表      五个长度为 node_count 的 uint32 数组：
+                name_id, adcode, parent, first_child, child_count
+
+节点按层级排列：先是全部省份，再按省份分组的城市，最后按城市分组的区县，
+所以任意节点的子节点都是连续的一段。读取时直接对 mmap 做 memoryview.cast，
+不会复制整个文件。
+"""
+import mmap
+import struct
+import sys
+
+MAGIC = b'NMCD'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHHIIIIIII')
+# 顶层节点的 parent
+NO_PARENT = 0xFFFFFFFF
+
+
+class CityBinaryError(Exception):
+    """二进制城市数据无法使用"""
+
+
+def _pad(data):
+    """补齐到 4 字节对齐"""
+    return data + b'\0' * (-len(data) % 4)
+
+
+def write_city_binary(city_data, output_path):
+    """将 city_data.json 结构的数据写成二进制格式"""
+    strings = []
+    string_ids = {}
+
+    def intern(name):
+        if name not in string_ids:
+            string_ids[name] = len(strings)
+            strings.append(name)
+        return string_ids[name]
+
+    # 按层级展开节点: (名称, adcode, 父节点, 子节点数据)
+    levels = [[(name, info.get("adcode"), NO_PARENT, info.get("cities", {}))
+               for name, info in city_data.items()]]
+    while True:
+        next_level = []
+        offset = sum(len(level) for level in levels)
+        for index, (_, _, _, children) in enumerate(levels[-1]):
+            parent = offset - len(levels[-1]) + index
+            for name, info in children.items():
+                next_level.append((name, info.get("adcode"), parent, info.get("districts", {})))
+        if not next_level:
+            break
+        levels.append(next_level)
+
+    nodes = [node for level in levels for node in level]
+    name_ids = [intern(name) for name, _, _, _ in nodes]
+    adcodes = [int(adcode) if adcode else 0 for _, adcode, _, _ in nodes]
+    parents = [parent for _, _, parent, _ in nodes]
+    first_child = [0] * len(nodes)
+    child_count = [0] * len(nodes)
+    for index, parent in enumerate(parents):
+        if parent != NO_PARENT:
+            if child_count[parent] == 0:
+                first_child[parent] = index
+            child_count[parent] += 1
+
+    blob = bytearray()
+    string_offsets = []
+    for name in strings:
+        string_offsets.append(len(blob))
+        blob += name.encode('utf-8')
+    string_offsets.append(len(blob))
+
+    node_count = len(nodes)
+    strings_pos = _HEADER.size
+    blob_pos = strings_pos + 4 * len(string_offsets)
+    nodes_pos = blob_pos + len(_pad(bytes(blob)))
+
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(strings), node_count,
+                          len(levels[0]), strings_pos, blob_pos, len(blob), nodes_pos)
+    array = struct.Struct(f'<{node_count}I')
+    with open(output_path, 'wb') as f:
+        f.write(header)
+        f.write(struct.pack(f'<{len(string_offsets)}I', *string_offsets))
+        f.write(_pad(bytes(blob)))
+        for values in (name_ids, adcodes, parents, first_child, child_count):
+            f.write(array.pack(*values))
+
+
+class CityBinaryReader:
+    """通过 mmap 读取二进制城市数据"""
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise CityBinaryError("仅支持小端序平台")
+
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self):
+        if len(self._mmap) < _HEADER.size:
+            raise CityBinaryError("文件不完整")
+        (magic, version, _, string_count, node_count, province_count,
+         strings_pos, blob_pos, blob_len, nodes_pos) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise CityBinaryError("文件格式不正确")
+        if version != VERSION:
+            raise CityBinaryError(f"不支持的版本: {version}")
+        if nodes_pos + 4 * 5 * node_count > len(self._mmap):
+            raise CityBinaryError("文件不完整")
+
+        self._view = memoryview(self._mmap)
+        self.node_count = node_count
+        self.province_count = province_count
+        self._string_offsets = self._view[strings_pos:strings_pos + 4 * (string_count + 1)].cast('I')
+        self._blob = self._view[blob_pos:blob_pos + blob_len]
+
+        arrays = []
+        for i in range(5):
+            start = nodes_pos + 4 * node_count * i
+            arrays.append(self._view[start:start + 4 * node_count].cast('I'))
+        self._name_ids, self._adcodes, self._parents, self._first_child, self._child_count = arrays
+
+    def close(self):
+        """释放 mmap"""
+        for name in ('_string_offsets', '_blob', '_name_ids', '_adcodes',
+                     '_parents', '_first_child', '_child_count', '_view'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def string(self, string_id):
+        """按编号读取字符串"""
+        start = self._string_offsets[string_id]
+        end = self._string_offsets[string_id + 1]
+        return str(self._blob[start:end], 'utf-8')
+
+    def name(self, node):
+        """节点名称"""
+        return self.string(self._name_ids[node])
+
+    def adcode(self, node):
+        """节点 adcode（6 位字符串）"""
+        return f"{self._adcodes[node]:06d}"
+
+    def parent(self, node):
+        """父节点，顶层节点返回 None"""
+        parent = self._parents[node]
+        return None if parent == NO_PARENT else parent
+
+    def children(self, node):
+        """子节点编号范围"""
+        start = self._first_child[node]
+        return range(start, start + self._child_count[node])
+
+    def provinces(self):
+        """省份节点编号范围"""
+        return range(self.province_count)
@@ -0,0 +1,206 @@
+import json
+import os
+import sys
+import threading
+from utils.city_binary import CityBinaryReader
+
+CITY_JSON_NAME = 'city_data.json'
+CITY_BINARY_NAME = 'city_data.bin'
+
+# 直辖市：省级行政区本身就是城市，is_municipality 据此判断
+MUNICIPALITIES = ("北京市", "上海市", "天津市", "重庆市")
+
+
+def get_resource_path(*parts):
+    """获取 resources 目录下文件的路径"""
+    if getattr(sys, 'frozen', False):
+        # 如果是打包后的可执行文件
+        base_path = sys._MEIPASS
+    else:
+        # 如果是开发环境
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, 'resources', *parts)
+
+
+class CityIndex:
+    """行政区划内存索引
+
+    行政区划数据只解析一次，之后所有查询都是字典查找，
+    省/市/区的子列表在构建时就按接口需要的顺序准备好。
+    从二进制文件加载时只登记省份，各省的城市和区县在首次访问时才从 mmap 中读取。
+    """
+
+    def __init__(self):
+        # 省份按文件顺序
+        self._provinces = []
+        # 省份 -> 城市列表（已排序）
+        self._cities = {}
+        # (省份, 城市) -> 区县列表（文件顺序）
+        self._districts = {}
+        # (省份, 城市, 区县) -> adcode，区县为 None 时表示市级
+        self._adcodes = {}
+        # adcode -> (省份, 城市, 区县)
+        self._locations = {}
+        # 尚未展开的省份 -> 二进制文件中的节点编号
+        self._pending = {}
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _add(self, adcode, province, city=None, district=None):
+        """登记一个行政区"""
+        self._adcodes[(province, city, district)] = adcode
+        self._locations.setdefault(adcode, (province, city, district))
+
+    @classmethod
+    def from_dict(cls, city_data):
+        """从 city_data.json 结构的字典构建索引"""
+        index = cls()
+        for province, province_data in city_data.items():
+            index._provinces.append(province)
+            index._add(province_data.get("adcode"), province)
+
+            cities = province_data.get("cities", {})
+            city_names = list(cities.keys())
+            # 如果是直辖市，只返回市本身
+            if not (len(city_names) == 1 and city_names[0] == province):
+                city_names = sorted(city_names)
+            index._cities[province] = city_names
+
+            for city, city_info in cities.items():
+                index._add(city_info.get("adcode"), province, city)
+
+                districts = city_info.get("districts", {})
+                index._districts[(province, city)] = list(districts.keys())
+                for district, district_info in districts.items():
+                    index._add(district_info.get("adcode"), province, city, district)
+        return index
+
+    @classmethod
+    def from_json(cls, json_path):
+        """从 JSON 文件构建索引"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_binary(cls, binary_path):
+        """从 create_city_json.py 生成的二进制文件构建索引"""
+        index = cls()
+        # 读取器随索引一起保留，未展开的省份还要从中读取
+        index._reader = reader = CityBinaryReader(binary_path)
+        for node in reader.provinces():
+            province = reader.name(node)
+            index._provinces.append(province)
+            index._add(reader.adcode(node), province)
+            index._pending[province] = node
+        return index
+
+    def _expand(self, province):
+        """从二进制文件展开指定省份的城市和区县"""
+        if province not in self._pending:
+            return
+        with self._lock:
+            node = self._pending.get(province)
+            if node is None:
+                return
+            reader = self._reader
+            cities = []
+            for city_node in reader.children(node):
+                city = reader.name(city_node)
+                cities.append(city)
+                self._add(reader.adcode(city_node), province, city)
+
+                districts = []
+                for district_node in reader.children(city_node):
+                    district = reader.name(district_node)
+                    districts.append(district)
+                    self._add(reader.adcode(district_node), province, city, district)
+                self._districts[(province, city)] = districts
+            # 如果是直辖市，只返回市本身
+            if not (len(cities) == 1 and cities[0] == province):
+                cities = sorted(cities)
+            self._cities[province] = cities
+            del self._pending[province]
+
+    @classmethod
+    def load(cls):
+        """加载索引，优先使用二进制文件，失败时回退到 JSON"""
+        binary_path = get_resource_path(CITY_BINARY_NAME)
+        if os.path.exists(binary_path):
+            try:
+                return cls.from_binary(binary_path)
+            except Exception as e:
+                print(f"读取二进制城市数据失败，改用JSON：{str(e)}")
+        return cls.from_json(get_resource_path(CITY_JSON_NAME))
+
+    def provinces(self):
+        """省份列表"""
+        return list(self._provinces)
+
+    def cities(self, province):
+        """指定省份的城市列表"""
+        self._expand(province)
+        return list(self._cities.get(province, []))
+
+    def districts(self, province, city):
+        """指定城市的区县列表"""
+        self._expand(province)
+        return list(self._districts.get((province, city), []))
+
+    def adcode(self, province, city=None, district=None):
+        """根据位置获取 adcode，不存在时返回 None"""
+        if district and not city:
+            return None
+        self._expand(province)
+        return self._adcodes.get((province, city or None, district or None))
+
+    def location(self, adcode):
+        """根据 adcode 获取 (省份, 城市, 区县)，不存在时返回 None"""
+        adcode = str(adcode)
+        if adcode not in self._locations and self._pending:
+            # adcode 前两位是省级编码，找不到对应省份时展开全部
+            prefix = adcode[:2]
+            for province in list(self._pending):
+                if (self._adcodes.get((province, None, None)) or "")[:2] == prefix:
+                    self._expand(province)
+            if adcode not in self._locations:
+                for province in list(self._pending):
+                    self._expand(province)
+        return self._locations.get(adcode)
+
+    def walk(self):
+        """按省、市、区的顺序遍历全部行政区，产出 (省份, 城市, 区县, adcode)"""
+        for province in self._provinces:
+            yield province, None, None, self.adcode(province)
+            for city in self.cities(province):
+                yield province, city, None, self.adcode(province, city)
+                for district in self.districts(province, city):
+                    yield province, city, district, self.adcode(province, city, district)
+
+    def __contains__(self, province):
+        return province in self._cities or province in self._pending
+
+
+_city_index = None
+_city_index_lock = threading.Lock()
+
+
+def get_city_index():
+    """获取进程内共享的行政区划索引，首次调用时才加载"""
+    global _city_index
+    if _city_index is None:
+        with _city_index_lock:
+            if _city_index is None:
+                try:
+                    _city_index = CityIndex.load()
+                except Exception as e:
+                    print(f"加载城市数据失败：{str(e)}")
+                    # 失败时使用空索引，避免每次调用都重新读取文件
+                    _city_index = CityIndex()
+    return _city_index
+
+
+def reset_city_index():
+    """丢弃已加载的索引，下次调用 get_city_index 时重新加载"""
+    global _city_index
+    with _city_index_lock:
+        _city_index = None
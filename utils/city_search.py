@@ -0,0 +1,145 @@
+import threading
+from bisect import bisect_left
+from utils.city_index import get_city_index
+
+def _load_pinyin():
+    """导入 pypinyin（词典较大，构建索引时才导入），没有安装时返回 None"""
+    try:
+        from pypinyin import lazy_pinyin
+    except ImportError:
+        # 没有安装 pypinyin 时只支持汉字和 adcode 搜索
+        return None
+    return lazy_pinyin
+
+
+# 匹配程度，数值越小越靠前
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_INFIX = 2
+
+
+class CitySearchResult:
+    """搜索结果"""
+
+    __slots__ = ('province', 'city', 'district', 'adcode', 'match')
+
+    def __init__(self, province, city, district, adcode, match):
+        self.province = province
+        self.city = city
+        self.district = district
+        self.adcode = adcode
+        self.match = match
+
+    @property
+    def name(self):
+        """行政区自身的名称"""
+        return self.district or self.city or self.province
+
+    @property
+    def display_name(self):
+        """完整的位置名称"""
+        return " ".join(part for part in (self.province, self.city, self.district) if part)
+
+    def __repr__(self):
+        return f"CitySearchResult({self.display_name!r}, {self.adcode!r}, match={self.match})"
+
+
+class CitySearchIndex:
+    """行政区划搜索索引
+
+    每个行政区登记汉字名称、全拼、拼音首字母和 adcode 四种键，
+    全部键放在一个排序数组里，前缀查询用二分查找，中间匹配再顺序扫描一遍。
+    """
+
+    def __init__(self, city_index):
+        # 行政区: (省份, 城市, 区县, adcode)
+        self._entries = []
+        # 排序后的 (键, 行政区编号)
+        self._keys = []
+
+        lazy_pinyin = _load_pinyin()
+        for entry in city_index.walk():
+            province, city, district, adcode = entry
+            # 跳过没有 adcode 的记录，也跳过全国
+            if not adcode or adcode == "100000":
+                continue
+            entry_id = len(self._entries)
+            self._entries.append(entry)
+            for key in self._make_keys(district or city or province, adcode, lazy_pinyin):
+                self._keys.append((key, entry_id))
+
+        self._keys.sort()
+        self._key_strings = [key for key, _ in self._keys]
+
+    @staticmethod
+    def _make_keys(name, adcode, lazy_pinyin):
+        """生成一个行政区的全部搜索键"""
+        keys = {name, adcode}
+        if lazy_pinyin is not None:
+            syllables = lazy_pinyin(name)
+            keys.add("".join(syllables))
+            keys.add("".join(syllable[0] for syllable in syllables if syllable))
+        return keys
+
+    def search(self, query, limit=20):
+        """搜索行政区，按 完全匹配 > 前缀匹配 > 中间匹配 排序"""
+        query = query.strip().lower().replace(" ", "")
+        if not query:
+            return []
+
+        # 行政区编号 -> 最好的匹配程度
+        matches = {}
+        start = bisect_left(self._key_strings, query)
+        for key, entry_id in self._keys[start:]:
+            if not key.startswith(query):
+                break
+            match = MATCH_EXACT if key == query else MATCH_PREFIX
+            if match < matches.get(entry_id, MATCH_INFIX + 1):
+                matches[entry_id] = match
+
+        if len(matches) < limit:
+            for key, entry_id in self._keys:
+                if entry_id not in matches and query in key:
+                    matches[entry_id] = MATCH_INFIX
+
+        # 同等匹配时省份优先于城市、城市优先于区县，再按原始顺序
+        ranked = sorted(matches.items(),
+                        key=lambda item: (item[1], self._level(item[0]), item[0]))
+        results = []
+        for entry_id, match in ranked[:limit]:
+            province, city, district, adcode = self._entries[entry_id]
+            results.append(CitySearchResult(province, city, district, adcode, match))
+        return results
+
+    def _level(self, entry_id):
+        """行政级别：省份 0，城市 1，区县 2"""
+        _, city, district, _ = self._entries[entry_id]
+        return 2 if district else 1 if city else 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_search_index = None
+_search_index_lock = threading.Lock()
+
+
+def get_city_search_index():
+    """获取进程内共享的搜索索引，首次调用时才构建"""
+    global _search_index
+    if _search_index is None:
+        with _search_index_lock:
+            if _search_index is None:
+                _search_index = CitySearchIndex(get_city_index())
+    return _search_index
+
+
+def prepare_city_search_index():
+    """在后台线程中预先构建搜索索引"""
+    if _search_index is None:
+        threading.Thread(target=get_city_search_index, daemon=True).start()
+
+
+def search_locations(query, limit=20):
+    """按名称、拼音或 adcode 搜索行政区"""
+    return get_city_search_index().search(query, limit)
@@ -0,0 +1,95 @@
+"""命令行启动模式
+
+python main.py --launch [方案名]
+
+不打开界面，直接按配置启动程序并输出汇总。本模块只依赖标准库和 utils 中与界面无关的模块，
+不会导入 PyQt6 和 requests，适合放在登录脚本或计划任务中。
+"""
+import json
+import time
+from utils.config import ConfigManager
+from utils.launch_plan import LaunchPlan, LaunchPlanError, select_profile
+from utils.launch_stats import LaunchTelemetry
+from utils.launcher import DEFAULT_LAUNCH_CONCURRENCY, LaunchEngine
+from utils.pressure import create_pacer
+from utils.supervisor import ProcessSupervisor, RestartPolicy
+
+# 退出前等待启动记录写入的最长时间 (秒)
+TELEMETRY_WAIT = 10
+
+
+def run_launch(profile=None, config_path=None, as_json=False, start_time=None):
+    """启动配置中的程序并输出汇总，返回退出码
+
+    start_time 为进程开始时的 time.perf_counter()，用于统计从启动到最后一个程序启动完成的耗时。
+    """
+    if start_time is None:
+        start_time = time.perf_counter()
+
+    config_manager = ConfigManager(config_path)
+    config_data = config_manager.load_config()
+    programs = config_data.get('programs', [])
+    if profile:
+        try:
+            programs = select_profile(programs, config_data.get('launch_profiles'), profile)
+        except LaunchPlanError as e:
+            print(str(e))
+            return 2
+    if not programs:
+        print("没有需要启动的程序")
+        return 0
+
+    try:
+        plan = LaunchPlan(programs)
+    except LaunchPlanError as e:
+        print(f"启动依赖配置有误：{str(e)}，将忽略依赖设置直接启动全部程序")
+        plan = LaunchPlan(programs, use_dependencies=False)
+
+    last_done = [start_time]
+
+    def on_progress(result):
+        last_done[0] = time.perf_counter()
+        if not as_json:
+            if result.skipped:
+                print(f"[已运行] {result.name}  pid {result.pid}", flush=True)
+            elif result.ok:
+                print(f"[成功] {result.name}  {result.spawn_ms:.1f} ms", flush=True)
+            else:
+                print(f"[失败] {result.name}  {result.error}", flush=True)
+
+    telemetry = LaunchTelemetry(config_manager.get_sibling_path('launch_stats.jsonl'))
+    # 只用来跳过已在运行的程序；命令行模式启动完就退出，不做崩溃重启
+    supervisor = ProcessSupervisor(policy=RestartPolicy(max_restarts=0))
+    engine = LaunchEngine(programs,
+                          config_data.get('launch_concurrency', DEFAULT_LAUNCH_CONCURRENCY),
+                          on_progress=on_progress, plan=plan,
+                          pacer=create_pacer(config_data.get('launch_pacing')),
+                          telemetry=telemetry, supervisor=supervisor)
+    try:
+        results = engine.run()
+    except KeyboardInterrupt:
+        engine.cancel()
+        supervisor.shutdown()
+        print("已取消")
+        return 130
+    supervisor.shutdown()
+
+    failures = LaunchEngine.failures(results)
+    skipped = sum(1 for result in results if result.skipped)
+    elapsed_ms = (last_done[0] - start_time) * 1000
+    if as_json:
+        print(json.dumps({
+            'profile': profile or None,
+            'elapsed_ms': round(elapsed_ms, 1),
+            'results': [{'name': result.name, 'path': result.path, 'ok': result.ok,
+                         'error': result.error, 'pid': result.pid, 'skipped': result.skipped,
+                         'spawn_ms': round(result.spawn_ms, 1)} for result in results],
+        }, ensure_ascii=False), flush=True)
+    else:
+        print(f"启动完成：成功 {len(results) - len(failures) - skipped} 个，已在运行 {skipped} 个，"
+              f"失败 {len(failures)} 个，"
+              f"从进程启动到最后一个程序启动完成耗时 {elapsed_ms:.0f} ms", flush=True)
+
+    # 启动记录在后台确认进程状态后才写入
+    telemetry.wait(TELEMETRY_WAIT)
+    return 1 if failures else 0
@@ -1,6 +1,28 @@
+import hashlib
 import json
 import os
 import sys
+import threading
+from utils.launch_plan import LaunchPlan, LaunchPlanError
+
+# 连续修改时，最后一次修改后等待多久才写入 (秒)
+SAVE_DELAY = 0.5
+
+
+def content_hash(data):
+    """配置文件内容的哈希"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write(path, data):
+    """先写临时文件并落盘，再替换目标文件，写到一半中断也不会损坏原文件"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
 
 class ConfigManager:
     def __init__(self, config_path=None):
@@ -17,32 +39,191 @@ class ConfigManager:
             self.config_path = os.path.join(app_dir, 'config.json')
         else:
             self.config_path = config_path
+        # 最近一次加载时发现的配置错误
+        self.config_error = None
+        # 最近一次加载时配置文件损坏，改用了备份
+        self.config_recovered = False
+        # 上一份正常的配置保存在 config.json.bak
+        self.backup_path = self.config_path + '.bak'
+
+        # 磁盘上配置文件内容的哈希，内容不变时跳过写入
+        self._saved_hash = None
+        # 每次保存递增的序号，以及已写入的最新序号；序号更旧的内容不再写入，避免覆盖较新的配置
+        self._generation = 0
+        self._written_generation = 0
+        # 自己最近一次写入后配置文件的 (修改时间, 大小)，文件没有被外部修改时不再重复备份
+        self._written_stat = None
+        # 等待写入的 (序号, 配置内容)，以及负责延迟写入的定时器
+        self._pending = None
+        self._timer = None
+        self._state_lock = threading.Lock()
+        # 保证同一时间只有一个线程在写文件
+        self._write_lock = threading.Lock()
+
+    def get_sibling_path(self, filename):
+        """获取与配置文件同目录的文件路径"""
+        return os.path.join(os.path.dirname(self.config_path), filename)
+
+    def _read(self, path):
+        """读取并解析配置文件，返回 (配置, 原始内容)"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        config_data = json.loads(data.decode('utf-8'))
+        if not isinstance(config_data, dict):
+            raise ValueError("配置文件格式不正确")
+        return config_data, data
 
     def load_config(self):
-        """加载配置"""
+        """加载配置，配置文件损坏时尝试使用备份"""
+        self.config_error = None
+        self.config_recovered = False
+        if not os.path.exists(self.config_path) and not os.path.exists(self.backup_path):
+            # 如果配置文件不存在，返回默认配置
+            return self.get_default_config()
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                # 如果配置文件不存在，返回默认配置
-                return self.get_default_config()
+            config_data, data = self._read(self.config_path)
         except Exception as e:
             print(f"加载配置失败: {str(e)}")
-            return self.get_default_config()
+            try:
+                config_data, data = self._read(self.backup_path)
+            except Exception as e:
+                print(f"加载备份配置失败: {str(e)}")
+                return self.get_default_config()
+            print(f"已从备份恢复配置: {self.backup_path}")
+            self.config_recovered = True
+        else:
+            with self._state_lock:
+                self._saved_hash = content_hash(data)
+        self.validate_config(config_data)
+        return config_data
 
-    def save_config(self, config_data):
-        """保存配置"""
+    def validate_config(self, config_data):
+        """检查程序的启动依赖，有误时记录到 config_error"""
         try:
-            # 确保配置文件所在目录存在
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=4)
+            LaunchPlan(config_data.get('programs', []))
+        except LaunchPlanError as e:
+            self.config_error = str(e)
+            print(f"启动依赖配置有误: {self.config_error}")
+            return False
+        return True
+
+    def reload_config(self):
+        """重新读取被外部修改的配置文件
+
+        内容与最近一次读写的相同（例如是自己写入的）或无法解析时返回 None。
+        外部修改优先，尚未写入的延迟保存会被丢弃。
+        """
+        try:
+            config_data, data = self._read(self.config_path)
+        except Exception as e:
+            print(f"重新加载配置失败: {str(e)}")
+            return None
+        digest = content_hash(data)
+        with self._state_lock:
+            if digest == self._saved_hash:
+                return None
+            self._saved_hash = digest
+            self._cancel_timer()
+            self._pending = None
+            # 已经取出、正在等待写入的旧内容也不再写入
+            self._generation += 1
+            self._written_generation = self._generation
+        self.config_error = None
+        self.validate_config(config_data)
+        return config_data
+
+    def _serialize(self, config_data):
+        return json.dumps(config_data, ensure_ascii=False, indent=4).encode('utf-8')
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _write(self, data, generation):
+        """写入序号为 generation 的配置内容，内容未变化或已经写入了更新的内容时跳过"""
+        with self._write_lock:
+            digest = content_hash(data)
+            with self._state_lock:
+                if generation < self._written_generation:
+                    return True
+                self._written_generation = generation
+                if digest == self._saved_hash:
+                    return True
+            try:
+                # 确保配置文件所在目录存在
+                os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+
+                # 替换前把当前可以正常解析的配置留作备份；文件还是自己上次写入的内容时，
+                # 备份中已经是本次运行前（或最近一次外部修改后）的配置，不再重复备份
+                current_stat = self._file_stat()
+                if current_stat is not None and current_stat != self._written_stat:
+                    try:
+                        _, previous = self._read(self.config_path)
+                        atomic_write(self.backup_path, previous)
+                    except Exception:
+                        pass
+
+                atomic_write(self.config_path, data)
+                self._written_stat = self._file_stat()
+            except Exception as e:
+                print(f"保存配置失败: {str(e)}")
+                return False
+            with self._state_lock:
+                self._saved_hash = digest
             return True
+
+    def save_config(self, config_data):
+        """立即保存配置，同时取消尚未执行的延迟保存"""
+        with self._state_lock:
+            self._cancel_timer()
+            self._pending = None
+            self._generation += 1
+            generation = self._generation
+        try:
+            data = self._serialize(config_data)
         except Exception as e:
             print(f"保存配置失败: {str(e)}")
             return False
+        return self._write(data, generation)
+
+    def schedule_save(self, config_data, delay=SAVE_DELAY):
+        """延迟保存配置，delay 秒内的多次调用只写入最后一次的内容"""
+        # 在调用方线程序列化，之后调用方再修改字典也不影响这次保存
+        data = self._serialize(config_data)
+        with self._state_lock:
+            self._generation += 1
+            self._pending = (self._generation, data)
+            self._cancel_timer()
+            self._timer = threading.Timer(delay, self._flush_pending)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush_pending(self):
+        with self._state_lock:
+            pending, self._pending = self._pending, None
+            self._timer = None
+        if pending is None:
+            return True
+        generation, data = pending
+        return self._write(data, generation)
+
+    def flush(self):
+        """立即写入尚未执行的延迟保存，等待正在进行的写入完成"""
+        with self._state_lock:
+            self._cancel_timer()
+        result = self._flush_pending()
+        # 定时器线程可能已经取走内容正在写入
+        with self._write_lock:
+            pass
+        return result
 
     def get_default_config(self):
         """获取默认配置"""
@@ -50,5 +231,8 @@ class ConfigManager:
             'theme': '默认主题',
             'programs': [],
             'weather_visible': False,
-            'weather_api_key': None
+            'weather_api_key': None,
+            'weather_cache_ttl': 1800,
+            'launch_concurrency': 4,
+            'launch_pacing': {'enabled': False}
         }
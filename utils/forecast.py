@@ -0,0 +1,155 @@
+"""天气预报
+
+高德天气接口 extensions=all 返回未来几天（含当天）的预报。每个 adcode 只保存一份精简的数据：
+每天一个元组，气温转为整数，不保存接口中重复的字段。所有界面共用同一份数据，
+只有接口的 reporttime（发布时间）比已保存的新时才替换并通知界面，界面重绘只读取保存的数据，不会发起请求。
+本模块不依赖 Qt。
+"""
+import json
+import os
+import time
+from collections import namedtuple
+from utils.config import atomic_write
+
+# 高德预报每天发布几次，检查间隔不需要太短
+DEFAULT_FORECAST_TTL = 3600
+CACHE_VERSION = 1
+
+ForecastDay = namedtuple('ForecastDay', ('date', 'week', 'day_weather', 'night_weather',
+                                         'day_temp', 'night_temp', 'day_wind', 'night_wind',
+                                         'day_power', 'night_power'))
+
+WEEKDAYS = {'1': "周一", '2': "周二", '3': "周三", '4': "周四", '5': "周五", '6': "周六", '7': "周日"}
+
+
+def _temp(value):
+    try:
+        return int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+class Forecast:
+    """一个地区的天气预报"""
+
+    __slots__ = ('adcode', 'city', 'reporttime', 'days', 'checked_at')
+
+    def __init__(self, adcode, city, reporttime, days, checked_at=None):
+        self.adcode = adcode
+        self.city = city
+        # 格式为 "YYYY-MM-DD HH:MM:SS"，可以直接按字符串比较先后
+        self.reporttime = reporttime
+        self.days = days
+        # 最近一次向接口确认的时间
+        self.checked_at = checked_at
+
+    def to_row(self):
+        return [self.city, self.reporttime, self.checked_at, [list(day) for day in self.days]]
+
+    @classmethod
+    def from_row(cls, adcode, row):
+        city, reporttime, checked_at, days = row
+        return cls(adcode, city, reporttime, tuple(ForecastDay(*day) for day in days), checked_at)
+
+    def __repr__(self):
+        return f"Forecast({self.adcode!r}, {self.reporttime!r}, {len(self.days)} 天)"
+
+
+def parse_forecast(data):
+    """解析接口 forecasts 中的一项，格式不对时返回 None"""
+    try:
+        days = tuple(
+            ForecastDay(cast['date'], cast.get('week', ''), cast.get('dayweather', ''),
+                        cast.get('nightweather', ''),
+                        _temp(cast.get('daytemp_float', cast.get('daytemp'))),
+                        _temp(cast.get('nighttemp_float', cast.get('nighttemp'))),
+                        cast.get('daywind', ''), cast.get('nightwind', ''),
+                        cast.get('daypower', ''), cast.get('nightpower', ''))
+            for cast in data['casts'])
+        return Forecast(str(data['adcode']), data.get('city', ''), data['reporttime'], days)
+    except (KeyError, TypeError):
+        return None
+
+
+def format_day(day):
+    """一天的预报，例如：周一 多云转雷阵雨 26~32°C"""
+    weather = day.day_weather
+    if day.night_weather and day.night_weather != day.day_weather:
+        weather = f"{day.day_weather}转{day.night_weather}"
+    return f"{WEEKDAYS.get(day.week, day.date[5:])} {weather} {day.night_temp}~{day.day_temp}°C"
+
+
+class ForecastStore:
+    """按 adcode 保存的天气预报
+
+    update 只在 reporttime 比已保存的新时替换数据、写入磁盘并返回 True，
+    同一份预报重复获取只在内存中更新检查时间，由 flush（例如退出时）写入。
+    """
+
+    def __init__(self, cache_path=None, ttl=DEFAULT_FORECAST_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._forecasts = {}
+        # 有尚未写入磁盘的检查时间
+        self._dirty = False
+        if cache_path:
+            self.load()
+
+    def get(self, adcode):
+        """保存的预报，没有时返回 None"""
+        return self._forecasts.get(str(adcode))
+
+    def is_fresh(self, adcode):
+        """最近 ttl 秒内是否确认过，确认过的不需要再请求"""
+        forecast = self.get(adcode)
+        return (forecast is not None and forecast.checked_at is not None
+                and time.time() - forecast.checked_at < self.ttl)
+
+    def update(self, forecast):
+        """写入新获取的预报，返回数据是否有变化"""
+        forecast.checked_at = time.time()
+        current = self._forecasts.get(forecast.adcode)
+        if current is not None and forecast.reporttime <= current.reporttime:
+            current.checked_at = forecast.checked_at
+            self._dirty = True
+            return False
+        self._forecasts[forecast.adcode] = forecast
+        self.save()
+        return True
+
+    def load(self):
+        """从磁盘加载预报"""
+        try:
+            if not os.path.exists(self.cache_path):
+                return
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            if cache_data.get('version') != CACHE_VERSION:
+                return
+            for adcode, row in cache_data.get('forecasts', {}).items():
+                self._forecasts[adcode] = Forecast.from_row(adcode, row)
+        except Exception as e:
+            print(f"加载天气预报缓存失败: {str(e)}")
+
+    def dumps(self):
+        """序列化为紧凑的 JSON"""
+        cache_data = {
+            'version': CACHE_VERSION,
+            'forecasts': {adcode: forecast.to_row() for adcode, forecast in self._forecasts.items()},
+        }
+        return json.dumps(cache_data, ensure_ascii=False, separators=(',', ':'))
+
+    def save(self):
+        """保存预报到磁盘"""
+        if not self.cache_path:
+            return
+        try:
+            atomic_write(self.cache_path, self.dumps().encode('utf-8'))
+            self._dirty = False
+        except Exception as e:
+            print(f"保存天气预报缓存失败: {str(e)}")
+
+    def flush(self):
+        """写入尚未保存的检查时间"""
+        if self._dirty:
+            self.save()
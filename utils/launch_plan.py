@@ -0,0 +1,198 @@
+import os
+import socket
+import time
+
+# 就绪检查默认的超时时间和轮询间隔（毫秒）
+DEFAULT_READY_TIMEOUT_MS = 30000
+READY_POLL_MS = 200
+
+READY_TYPES = ("alive", "port", "file")
+
+
+class LaunchPlanError(ValueError):
+    """启动计划配置有误"""
+
+
+def is_non_negative_number(value):
+    """是否为非负的整数或小数（不包括 True/False）"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+class LaunchStep:
+    """启动计划中的一个程序
+
+    配置项（均为可选）：
+        depends_on  依赖的程序名称或路径列表，依赖全部就绪后才启动
+        delay_ms    依赖就绪后再等待的毫秒数
+        ready       就绪条件，例如
+                    {"type": "alive", "ms": 2000}
+                    {"type": "port", "port": 3306, "host": "127.0.0.1"}
+                    {"type": "file", "path": "C:/app/ready.flag"}
+                    可以附带 timeout_ms，默认 30 秒
+    """
+
+    __slots__ = ('index', 'program', 'name', 'path', 'deps', 'dependents', 'delay_ms', 'ready')
+
+    def __init__(self, index, program):
+        self.index = index
+        self.program = program
+        self.name = program['name']
+        self.path = program['path']
+        self.deps = []
+        self.dependents = []
+        self.delay_ms = program.get('delay_ms') or 0
+        self.ready = program.get('ready')
+
+
+class LaunchPlan:
+    """由程序列表生成的启动计划（有向无环图）
+
+    use_dependencies 为 False 时忽略依赖、延迟和就绪条件，全部程序直接启动，
+    用于配置有误时的回退。
+    """
+
+    def __init__(self, programs, use_dependencies=True):
+        self.steps = [LaunchStep(index, program) for index, program in enumerate(programs)]
+        if not use_dependencies:
+            for step in self.steps:
+                step.delay_ms = 0
+                step.ready = None
+            return
+        for step in self.steps:
+            self._validate_step(step)
+        self._resolve_dependencies()
+        self._check_cycles()
+
+    @staticmethod
+    def _validate_step(step):
+        if not is_non_negative_number(step.delay_ms):
+            raise LaunchPlanError(f"{step.name} 的 delay_ms 必须是非负数")
+        if step.ready is None:
+            return
+        ready = step.ready
+        if not isinstance(ready, dict) or ready.get('type') not in READY_TYPES:
+            raise LaunchPlanError(f"{step.name} 的 ready 类型必须是 {', '.join(READY_TYPES)} 之一")
+        for key in ('ms', 'timeout_ms'):
+            if key in ready and not is_non_negative_number(ready[key]):
+                raise LaunchPlanError(f"{step.name} 的 ready.{key} 必须是非负数")
+        if ready['type'] == 'port':
+            port = ready.get('port')
+            if not isinstance(port, int) or isinstance(port, bool) or not 0 < port < 65536:
+                raise LaunchPlanError(f"{step.name} 的端口就绪条件缺少 port 或端口无效")
+            if 'host' in ready and (not isinstance(ready['host'], str) or not ready['host']):
+                raise LaunchPlanError(f"{step.name} 的 ready.host 必须是主机名或地址")
+        if ready['type'] == 'file' and (not isinstance(ready.get('path'), str) or not ready['path']):
+            raise LaunchPlanError(f"{step.name} 的文件就绪条件缺少 path")
+
+    def _resolve_dependencies(self):
+        for step in self.steps:
+            depends_on = step.program.get('depends_on') or []
+            if not isinstance(depends_on, list):
+                raise LaunchPlanError(f"{step.name} 的 depends_on 必须是列表")
+            for dependency in depends_on:
+                # 先按名称匹配，同名程序全部作为依赖，再按路径匹配
+                matches = [other for other in self.steps if other.name == dependency]
+                if not matches:
+                    matches = [other for other in self.steps if other.path == dependency]
+                if not matches:
+                    raise LaunchPlanError(f"{step.name} 依赖的程序 {dependency} 不存在")
+                for other in matches:
+                    if other is step:
+                        raise LaunchPlanError(f"{step.name} 不能依赖自身")
+                    if other.index not in step.deps:
+                        step.deps.append(other.index)
+                        other.dependents.append(step.index)
+
+    def _check_cycles(self):
+        """拓扑排序检查循环依赖"""
+        remaining = [len(step.deps) for step in self.steps]
+        queue = [step.index for step in self.steps if not step.deps]
+        visited = 0
+        while queue:
+            index = queue.pop()
+            visited += 1
+            for dependent in self.steps[index].dependents:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        if visited != len(self.steps):
+            names = [step.name for step in self.steps if remaining[step.index] > 0]
+            raise LaunchPlanError(f"程序之间存在循环依赖：{', '.join(names)}")
+
+    def __len__(self):
+        return len(self.steps)
+
+
+def select_profile(programs, profiles, profile):
+    """按启动方案筛选程序，保持原有顺序
+
+    profiles 是配置中的 launch_profiles：方案名 -> 程序名称或路径列表。
+    方案中程序依赖的程序即使没有列出也会一起启动。
+    """
+    if not isinstance(profiles, dict) or profile not in profiles:
+        available = ', '.join(profiles) if isinstance(profiles, dict) and profiles else "无"
+        raise LaunchPlanError(f"启动方案 {profile} 不存在，可用的方案：{available}")
+    entries = profiles[profile]
+    if not isinstance(entries, list):
+        raise LaunchPlanError(f"启动方案 {profile} 必须是程序名称或路径的列表")
+
+    def find(entry):
+        # 与 depends_on 一致：先按名称匹配，再按路径匹配
+        matches = [index for index, program in enumerate(programs) if program['name'] == entry]
+        return matches or [index for index, program in enumerate(programs) if program['path'] == entry]
+
+    selected = set()
+    pending = []
+    for entry in entries:
+        matches = find(entry)
+        if not matches:
+            raise LaunchPlanError(f"启动方案 {profile} 中的程序 {entry} 不存在")
+        pending.extend(matches)
+    while pending:
+        index = pending.pop()
+        if index in selected:
+            continue
+        selected.add(index)
+        depends_on = programs[index].get('depends_on') or []
+        if isinstance(depends_on, list):
+            # 不存在的依赖留给 LaunchPlan 报错
+            for dependency in depends_on:
+                pending.extend(find(dependency))
+    return [program for index, program in enumerate(programs) if index in selected]
+
+
+def wait_until_ready(ready, process, cancelled):
+    """等待就绪条件满足，返回错误信息，成功时返回 None
+
+    cancelled 为 threading.Event，取消后立即返回。
+    """
+    if not ready:
+        return None
+
+    ready_type = ready['type']
+    if ready_type == 'alive':
+        if cancelled.wait(ready.get('ms', 1000) / 1000):
+            return "已取消"
+        exit_code = process.poll()
+        if exit_code is not None:
+            return f"进程已退出，退出码 {exit_code}"
+        return None
+
+    deadline = time.monotonic() + ready.get('timeout_ms', DEFAULT_READY_TIMEOUT_MS) / 1000
+    while True:
+        if ready_type == 'port':
+            try:
+                with socket.create_connection((ready.get('host', '127.0.0.1'), ready['port']),
+                                              timeout=READY_POLL_MS / 1000):
+                    return None
+            except OSError:
+                pass
+        elif os.path.exists(ready['path']):
+            return None
+
+        if time.monotonic() >= deadline:
+            if ready_type == 'port':
+                return f"等待端口 {ready['port']} 超时"
+            return f"等待文件 {ready['path']} 超时"
+        if cancelled.wait(READY_POLL_MS / 1000):
+            return "已取消"
@@ -0,0 +1,181 @@
+import json
+import os
+import sys
+import threading
+import time
+
+# 每个程序保留的最近记录数
+MAX_RECORDS_PER_PROGRAM = 50
+# 文件行数超过该值时压缩
+COMPACT_THRESHOLD = 2000
+# 启动后观察多久，期间以非 0 退出码退出视为启动失败
+EARLY_EXIT_WINDOW_MS = 5000
+
+
+def percentile(values, percent):
+    """最近秩法计算百分位数"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def wait_for_input_idle(process, timeout_ms):
+    """Windows 下等待图形程序可以接受输入，返回是否成功等到"""
+    if sys.platform != "win32":
+        return False
+    import ctypes
+    handle = getattr(process, "_handle", None)
+    if handle is None:
+        return False
+    # 0 表示成功；控制台程序会立即返回 WAIT_FAILED
+    return ctypes.windll.user32.WaitForInputIdle(int(handle), int(timeout_ms)) == 0
+
+
+class LaunchTelemetry:
+    """程序启动记录
+
+    每次启动追加一行 JSON 到 launch_stats.jsonl，
+    文件过大时只保留每个程序最近的 MAX_RECORDS_PER_PROGRAM 条。
+    文件行数在第一次写入时统计一次，之后在内存中累加，不需要每次都读取整个文件。
+    """
+
+    def __init__(self, stats_path, early_exit_window_ms=EARLY_EXIT_WINDOW_MS):
+        self.stats_path = stats_path
+        self.early_exit_window_ms = early_exit_window_ms
+        self._lock = threading.Lock()
+        self._observers = []
+        # 文件的行数，第一次写入前统计
+        self._line_count = None
+
+    def record(self, result, exit_code=None, ready_ms=None):
+        """写入一条启动记录，ready_ms 为观察到的就绪时间，不指定时使用结果中的"""
+        if ready_ms is None:
+            ready_ms = result.ready_ms
+        record = {
+            't': round(time.time(), 3),
+            'name': result.name,
+            'path': result.path,
+            # 提前正常退出（例如交给已运行的实例）不算失败
+            'ok': result.ok and not exit_code,
+            'spawn': round(result.spawn_ms, 1),
+            'ready': None if ready_ms is None else round(ready_ms, 1),
+            'exit': exit_code,
+            'err': result.error,
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            try:
+                if self._line_count is None:
+                    self._line_count = self._count_lines()
+                with open(self.stats_path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+                self._line_count += 1
+                if self._line_count > COMPACT_THRESHOLD:
+                    self._compact()
+            except Exception as e:
+                print(f"保存启动记录失败: {str(e)}")
+
+    def observe(self, result, process):
+        """在后台观察刚启动的进程，确认就绪或提前退出后再写入记录"""
+        if process is None:
+            self.record(result)
+            return
+        observer = threading.Thread(target=self._observe, args=(result, process),
+                                    name="launch-observer", daemon=True)
+        with self._lock:
+            self._observers = [thread for thread in self._observers if thread.is_alive()]
+            self._observers.append(observer)
+        observer.start()
+
+    def _observe(self, result, process):
+        # result 已经交给界面线程，这里只读取，不修改
+        start = time.perf_counter()
+        ready_ms = None
+        if result.ready_ms is None and wait_for_input_idle(process, self.early_exit_window_ms):
+            # 从调用 spawn 算起到可以接受输入
+            ready_ms = result.spawn_ms + (time.perf_counter() - start) * 1000
+
+        remaining = self.early_exit_window_ms / 1000 - (time.perf_counter() - start)
+        exit_code = None
+        try:
+            exit_code = process.wait(timeout=max(0, remaining))
+        except Exception:
+            # 超时说明进程仍在运行
+            pass
+        self.record(result, exit_code, ready_ms)
+
+    def wait(self, timeout=None):
+        """等待所有后台观察结束，命令行模式退出前调用"""
+        with self._lock:
+            observers = list(self._observers)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for observer in observers:
+            observer.join(None if deadline is None else max(0, deadline - time.monotonic()))
+
+    def load(self):
+        """读取全部记录"""
+        records = []
+        try:
+            if os.path.exists(self.stats_path):
+                with open(self.stats_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            # 跳过写入中断造成的残缺行
+                            continue
+        except Exception as e:
+            print(f"读取启动记录失败: {str(e)}")
+        return records
+
+    def _count_lines(self):
+        if not os.path.exists(self.stats_path):
+            return 0
+        with open(self.stats_path, 'rb') as f:
+            return sum(1 for _ in f)
+
+    def _compact(self):
+        """只保留每个程序最近的记录"""
+        kept = {}
+        with open(self.stats_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                kept.setdefault(record['path'], []).append((record['t'], line))
+        lines = sorted(item for path_lines in kept.values()
+                       for item in path_lines[-MAX_RECORDS_PER_PROGRAM:])
+        temp_path = self.stats_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.writelines(line for _, line in lines)
+        os.replace(temp_path, self.stats_path)
+        self._line_count = len(lines)
+
+    def summary(self):
+        """按程序汇总启动次数、失败次数和耗时的 p50/p95（毫秒）"""
+        grouped = {}
+        for record in self.load():
+            grouped.setdefault(record['path'], []).append(record)
+
+        summary = []
+        for path, records in grouped.items():
+            records = records[-MAX_RECORDS_PER_PROGRAM:]
+            spawn = [r['spawn'] for r in records if r['ok']]
+            ready = [r['ready'] for r in records if r['ok'] and r['ready'] is not None]
+            failures = [r for r in records if not r['ok']]
+            summary.append({
+                'name': records[-1]['name'],
+                'path': path,
+                'count': len(records),
+                'failures': len(failures),
+                'spawn_p50': percentile(spawn, 50),
+                'spawn_p95': percentile(spawn, 95),
+                'ready_p50': percentile(ready, 50),
+                'ready_p95': percentile(ready, 95),
+                'last_error': (failures[-1]['err'] or f"进程提前退出，退出码 {failures[-1]['exit']}")
+                              if failures else None,
+            })
+        return summary
@@ -0,0 +1,167 @@
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from utils.launch_plan import LaunchPlan, wait_until_ready
+
+# 默认同时启动的程序数量
+DEFAULT_LAUNCH_CONCURRENCY = 4
+# 等待依赖、延迟和就绪检查的线程上限
+MAX_LAUNCH_THREADS = 64
+
+
+class LaunchResult:
+    """单个程序的启动结果"""
+
+    __slots__ = ('name', 'path', 'ok', 'error', 'pid', 'spawn_ms', 'ready_ms', 'skipped')
+
+    def __init__(self, name, path, ok, error=None, pid=None, spawn_ms=0.0, ready_ms=None,
+                 skipped=False):
+        self.name = name
+        self.path = path
+        self.ok = ok
+        self.error = error
+        self.pid = pid
+        self.spawn_ms = spawn_ms
+        # 从启动到就绪条件满足的时间，没有就绪条件时为 None
+        self.ready_ms = ready_ms
+        # 程序已经在运行，没有再次启动
+        self.skipped = skipped
+
+    def __repr__(self):
+        state = ("skipped" if self.skipped else "ok") if self.ok else f"error={self.error!r}"
+        return f"LaunchResult({self.name!r}, {state})"
+
+
+def spawn_program(path):
+    """启动程序并返回进程对象"""
+    return subprocess.Popen(path)
+
+
+class LaunchEngine:
+    """批量启动程序
+
+    按 LaunchPlan 中的依赖关系启动：依赖全部就绪的程序才会开始，
+    互不依赖的分支并行进行。同时执行 spawn 的数量不超过 max_workers，
+    延迟和就绪检查的等待不占用这个名额。
+    每个程序结束（成功、失败或因依赖失败而跳过）都会回调 on_progress，
+    所有结果在 run 返回时一并给出。不依赖 Qt，界面和命令行都可以使用。
+    指定 pacer（utils.pressure.AdaptivePacer）时，每次 spawn 前等待系统压力下降。
+    指定 telemetry（utils.launch_stats.LaunchTelemetry）时记录每次启动。
+    指定 supervisor（utils.supervisor.ProcessSupervisor）时由它启动和监管进程，
+    开始前扫描一次进程表，已经在运行的程序直接跳过（结果的 skipped 为 True）。
+    """
+
+    def __init__(self, programs, max_workers=DEFAULT_LAUNCH_CONCURRENCY,
+                 on_progress=None, spawn=spawn_program, plan=None, pacer=None,
+                 telemetry=None, supervisor=None):
+        self.plan = plan if plan is not None else LaunchPlan(programs)
+        self.pacer = pacer
+        self.telemetry = telemetry
+        self.supervisor = supervisor
+        self.max_workers = max(1, int(max_workers or 1))
+        self.on_progress = on_progress
+        self.spawn = supervisor.spawn if supervisor is not None else spawn
+        self._running = {}
+        self._lock = threading.Lock()
+        self._spawn_slots = threading.Semaphore(self.max_workers)
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """不再启动尚未开始的程序，并停止等待就绪"""
+        self._cancelled.set()
+
+    def _report(self, result):
+        if self.on_progress:
+            # 回调可能来自多个线程，串行调用便于调用方统计进度
+            with self._lock:
+                self.on_progress(result)
+        return result
+
+    def _launch(self, step):
+        try:
+            result, process = self._start(step)
+            if self.telemetry is not None and result.error != "已取消" and not result.skipped:
+                self.telemetry.observe(result, process)
+        except Exception as e:
+            # 就绪检查、记录等出错时只影响这一个程序，不中断整批启动
+            return LaunchResult(step.name, step.path, False, str(e))
+        return result
+
+    def _start(self, step):
+        """启动单个程序，返回 (结果, 进程对象或 None)"""
+        pid = self._running.get(step.path)
+        if pid is not None:
+            return LaunchResult(step.name, step.path, True, pid=pid, skipped=True), None
+        if step.delay_ms and self._cancelled.wait(step.delay_ms / 1000):
+            return LaunchResult(step.name, step.path, False, "已取消"), None
+        if self._cancelled.is_set():
+            return LaunchResult(step.name, step.path, False, "已取消"), None
+
+        with self._spawn_slots:
+            if self.pacer is not None:
+                self.pacer.wait_for_slot(self._cancelled)
+                if self._cancelled.is_set():
+                    return LaunchResult(step.name, step.path, False, "已取消"), None
+            start = time.perf_counter()
+            try:
+                process = self.spawn(step.path)
+            except Exception as e:
+                return LaunchResult(step.name, step.path, False, str(e),
+                                    spawn_ms=(time.perf_counter() - start) * 1000), None
+            spawn_ms = (time.perf_counter() - start) * 1000
+
+        result = LaunchResult(step.name, step.path, True, pid=process.pid, spawn_ms=spawn_ms)
+        if step.ready:
+            error = wait_until_ready(step.ready, process, self._cancelled)
+            result.ready_ms = (time.perf_counter() - start) * 1000
+            if error:
+                result.ok = False
+                result.error = f"未就绪：{error}"
+        return result, process
+
+    def run(self):
+        """按计划启动全部程序，返回与程序列表顺序一致的结果列表"""
+        steps = self.plan.steps
+        if self.supervisor is not None:
+            self.supervisor.configure(step.program for step in steps)
+            self._running = self.supervisor.find_running(step.path for step in steps)
+        results = [None] * len(steps)
+        remaining = [len(step.deps) for step in steps]
+        threads = min(MAX_LAUNCH_THREADS, max(1, len(steps)))
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="launch") as executor:
+            futures = {}
+            ready_steps = [step for step in steps if not step.deps]
+            while ready_steps or futures:
+                for step in ready_steps:
+                    failed = [steps[index].name for index in step.deps if not results[index].ok]
+                    if failed:
+                        # 依赖没有就绪，跳过该程序，它的下游也会依次跳过
+                        results[step.index] = self._report(LaunchResult(
+                            step.name, step.path, False, f"依赖的程序未就绪：{', '.join(failed)}"))
+                        self._release(step, remaining, ready_steps)
+                    else:
+                        futures[executor.submit(self._launch, step)] = step
+                ready_steps = []
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = futures.pop(future)
+                    results[step.index] = self._report(future.result())
+                    self._release(step, remaining, ready_steps)
+        return results
+
+    def _release(self, step, remaining, ready_steps):
+        """step 已结束，把依赖全部结束的下游程序加入待启动列表"""
+        for index in step.dependents:
+            remaining[index] -= 1
+            if remaining[index] == 0:
+                ready_steps.append(self.plan.steps[index])
+
+    @staticmethod
+    def failures(results):
+        """筛选启动失败的结果"""
+        return [result for result in results if not result.ok]
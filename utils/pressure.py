@@ -0,0 +1,208 @@
+import os
+import sys
+import threading
+import time
+
+# 默认阈值：每个 CPU 的 1 分钟平均负载、PSI avg10 百分比、CPU 使用率
+DEFAULT_LOAD_THRESHOLD = 1.0
+DEFAULT_PSI_THRESHOLD = 40.0
+DEFAULT_CPU_THRESHOLD = 0.85
+# 系统一直繁忙时最多等待的时间，避免启动永远卡住
+DEFAULT_MAX_WAIT_MS = 15000
+DEFAULT_INTERVAL_MS = 250
+# 两次放行之间至少间隔的时间，让刚启动的程序的负载体现出来
+DEFAULT_MIN_INTERVAL_MS = 500
+
+
+class PressureSource:
+    """系统压力来源
+
+    sample 返回当前压力与阈值的比值，小于 1 表示可以继续启动，
+    无法采样时返回 None。
+    """
+
+    name = "pressure"
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def read(self):
+        """读取原始数值，无法读取时返回 None"""
+        raise NotImplementedError
+
+    def sample(self):
+        value = self.read()
+        if value is None or not self.threshold:
+            return None
+        return value / self.threshold
+
+
+class LoadAverageSource(PressureSource):
+    """每个 CPU 的 1 分钟平均负载（Linux / macOS）"""
+
+    name = "loadavg"
+
+    def __init__(self, threshold=DEFAULT_LOAD_THRESHOLD):
+        super().__init__(threshold)
+        self.cpu_count = os.cpu_count() or 1
+
+    def read(self):
+        try:
+            return os.getloadavg()[0] / self.cpu_count
+        except (AttributeError, OSError):
+            return None
+
+
+class PsiSource(PressureSource):
+    """Linux PSI 压力信息，读取 /proc/pressure/<resource> 中 some 行的 avg10"""
+
+    def __init__(self, resource, threshold=DEFAULT_PSI_THRESHOLD):
+        super().__init__(threshold)
+        self.resource = resource
+        self.name = f"psi-{resource}"
+        self.path = f"/proc/pressure/{resource}"
+
+    def read(self):
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    if line.startswith("some"):
+                        for field in line.split()[1:]:
+                            key, _, value = field.partition("=")
+                            if key == "avg10":
+                                return float(value)
+        except (OSError, ValueError):
+            pass
+        return None
+
+
+class CpuUsageSource(PressureSource):
+    """Windows CPU 使用率，根据两次 GetSystemTimes 的差值计算"""
+
+    name = "cpu"
+
+    def __init__(self, threshold=DEFAULT_CPU_THRESHOLD):
+        super().__init__(threshold)
+        self._last = self._system_times()
+
+    @staticmethod
+    def _system_times():
+        if sys.platform != "win32":
+            return None
+        import ctypes
+        from ctypes import wintypes
+        idle, kernel, user = wintypes.FILETIME(), wintypes.FILETIME(), wintypes.FILETIME()
+        if not ctypes.windll.kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel),
+                                                     ctypes.byref(user)):
+            return None
+        to_int = lambda ft: (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+        # kernel 时间中包含 idle 时间
+        return to_int(idle), to_int(kernel) + to_int(user)
+
+    def read(self):
+        current = self._system_times()
+        last, self._last = self._last, current
+        if current is None or last is None:
+            return None
+        idle = current[0] - last[0]
+        total = current[1] - last[1]
+        if total <= 0:
+            return None
+        return 1.0 - idle / total
+
+
+class CallableSource(PressureSource):
+    """由函数提供数值的压力来源，便于接入其它指标或模拟压力"""
+
+    def __init__(self, func, threshold=1.0, name="custom"):
+        super().__init__(threshold)
+        self.func = func
+        self.name = name
+
+    def read(self):
+        return self.func()
+
+
+def default_pressure_sources(load_threshold=DEFAULT_LOAD_THRESHOLD,
+                             psi_threshold=DEFAULT_PSI_THRESHOLD,
+                             cpu_threshold=DEFAULT_CPU_THRESHOLD):
+    """当前平台上可用的压力来源"""
+    if sys.platform == "win32":
+        return [CpuUsageSource(cpu_threshold)]
+    sources = [LoadAverageSource(load_threshold)]
+    for resource in ("cpu", "io"):
+        source = PsiSource(resource, psi_threshold)
+        if source.read() is not None:
+            sources.append(source)
+    return sources
+
+
+def wait_event(cancelled, timeout):
+    """等待 timeout 秒，返回期间是否被取消"""
+    return cancelled.wait(timeout)
+
+
+class AdaptivePacer:
+    """根据系统压力控制启动节奏
+
+    每次放行前采样全部压力来源，最大的比值低于 1 才放行；
+    压力一直很高时最多等待 max_wait_ms，之后强制放行。
+    wait_for_slot 可以被多个线程调用，放行是逐个进行的。
+    clock 和 wait（签名同 wait_event）可以一起替换，用模拟的时间代替真实的等待。
+    """
+
+    def __init__(self, sources, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 interval_ms=DEFAULT_INTERVAL_MS, min_interval_ms=DEFAULT_MIN_INTERVAL_MS,
+                 clock=time.monotonic, wait=wait_event):
+        self.sources = list(sources)
+        self.max_wait = max_wait_ms / 1000
+        self.interval = interval_ms / 1000
+        self.min_interval = min_interval_ms / 1000
+        self.clock = clock
+        self.wait = wait
+        self._lock = threading.Lock()
+        self._last_admit = None
+
+    def pressure(self):
+        """当前压力比值，没有可用来源时返回 None"""
+        samples = [value for value in (source.sample() for source in self.sources)
+                   if value is not None]
+        return max(samples) if samples else None
+
+    def wait_for_slot(self, cancelled=None):
+        """等待系统压力下降，返回等待的秒数
+
+        cancelled 为 threading.Event，设置后立即返回。
+        """
+        cancelled = cancelled or threading.Event()
+        with self._lock:
+            start = self.clock()
+            if self._last_admit is not None:
+                gap = self.min_interval - (start - self._last_admit)
+                if gap > 0 and self.wait(cancelled, gap):
+                    return self.clock() - start
+
+            while not cancelled.is_set():
+                pressure = self.pressure()
+                if pressure is None or pressure < 1:
+                    break
+                if self.clock() - start >= self.max_wait:
+                    break
+                self.wait(cancelled, self.interval)
+
+            self._last_admit = self.clock()
+            return self._last_admit - start
+
+
+def create_pacer(pacing_config):
+    """根据配置中的 launch_pacing 创建节奏控制器，未启用时返回 None"""
+    if not pacing_config or not pacing_config.get('enabled'):
+        return None
+    sources = default_pressure_sources(
+        pacing_config.get('load_threshold', DEFAULT_LOAD_THRESHOLD),
+        pacing_config.get('psi_threshold', DEFAULT_PSI_THRESHOLD),
+        pacing_config.get('cpu_threshold', DEFAULT_CPU_THRESHOLD))
+    return AdaptivePacer(sources,
+                         pacing_config.get('max_wait_ms', DEFAULT_MAX_WAIT_MS),
+                         pacing_config.get('interval_ms', DEFAULT_INTERVAL_MS),
+                         pacing_config.get('min_interval_ms', DEFAULT_MIN_INTERVAL_MS))
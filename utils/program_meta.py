@@ -0,0 +1,214 @@
+"""程序文件信息缓存
+
+按路径记录程序文件是否存在、大小、修改时间、内容哈希和图标，保存在配置文件旁的 program_meta.json 中。
+启动时直接使用缓存显示列表，之后在后台线程池中重新检查：大小和修改时间都没变的文件只需要一次 stat，
+变化了才重新计算哈希。文件不存在或内容有变化时只标记状态，不从列表中删除。
+本模块不依赖 Qt，图标由界面提取后以 PNG 数据（base64）存入。
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from utils.config import atomic_write
+
+# 同时检查的文件数，网络驱动器上主要是等待 I/O
+DEFAULT_META_WORKERS = 8
+# 计算哈希时每次读取的字节数
+HASH_CHUNK_SIZE = 1024 * 1024
+CACHE_VERSION = 1
+
+# 尚未检查过
+STATUS_UNKNOWN = 'unknown'
+STATUS_OK = 'ok'
+STATUS_MISSING = 'missing'
+# 内容与上次记录的不同，用户确认（acknowledge）后恢复为 ok
+STATUS_CHANGED = 'changed'
+
+
+def stat_signature(path):
+    """文件的 (大小, 修改时间 ns)，文件不存在或无法访问时返回 None"""
+    try:
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def file_hash(path):
+    """文件内容的 sha256，读取失败时返回 None"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ProgramMeta:
+    """一个程序文件的信息"""
+
+    __slots__ = ('path', 'exists', 'size', 'mtime_ns', 'hash', 'icon', 'status', 'checked_at')
+
+    def __init__(self, path, exists=False, size=None, mtime_ns=None, file_hash=None,
+                 icon=None, status=STATUS_UNKNOWN, checked_at=None):
+        self.path = path
+        self.exists = exists
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.hash = file_hash
+        # PNG 图标数据 (base64)，尚未提取时为 None
+        self.icon = icon
+        self.status = status
+        self.checked_at = checked_at
+
+    @property
+    def signature(self):
+        return (self.size, self.mtime_ns) if self.exists else None
+
+    def copy(self):
+        return ProgramMeta(self.path, self.exists, self.size, self.mtime_ns, self.hash,
+                           self.icon, self.status, self.checked_at)
+
+    def to_dict(self):
+        return {'exists': self.exists, 'size': self.size, 'mtime_ns': self.mtime_ns,
+                'hash': self.hash, 'icon': self.icon, 'status': self.status,
+                'checked_at': self.checked_at}
+
+    @classmethod
+    def from_dict(cls, path, item):
+        return cls(path, item.get('exists', False), item.get('size'), item.get('mtime_ns'),
+                   item.get('hash'), item.get('icon'), item.get('status', STATUS_UNKNOWN),
+                   item.get('checked_at'))
+
+    def __repr__(self):
+        return f"ProgramMeta({self.path!r}, {self.status})"
+
+
+class ProgramMetaCache:
+    """程序文件信息缓存
+
+    可以在多个线程中同时调用 validate，返回的都是条目的副本。
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self._entries = {}
+        self._lock = threading.Lock()
+        # 后台检查和界面线程都可能保存
+        self._write_lock = threading.Lock()
+        if cache_path:
+            self.load()
+
+    def get(self, path):
+        """缓存中的条目副本，没有时返回 None"""
+        with self._lock:
+            entry = self._entries.get(path)
+            return entry.copy() if entry is not None else None
+
+    def validate(self, path):
+        """重新检查一个文件并更新缓存，返回新的条目副本"""
+        signature = stat_signature(path)
+        with self._lock:
+            cached = self._entries.get(path)
+            entry = cached.copy() if cached is not None else ProgramMeta(path)
+
+        if signature is None:
+            # 保留原来的哈希和图标，文件恢复后可以判断内容是否变化
+            entry.exists = False
+            entry.status = STATUS_MISSING
+        elif entry.hash is None or signature != entry.signature:
+            new_hash = file_hash(path)
+            if new_hash is None:
+                entry.status = STATUS_MISSING
+                entry.exists = False
+            else:
+                if entry.hash is not None and new_hash != entry.hash:
+                    entry.status = STATUS_CHANGED
+                    entry.icon = None
+                elif entry.status != STATUS_CHANGED:
+                    entry.status = STATUS_OK
+                entry.exists = True
+                entry.size, entry.mtime_ns = signature
+                entry.hash = new_hash
+        elif entry.status in (STATUS_UNKNOWN, STATUS_MISSING):
+            entry.exists = True
+            entry.status = STATUS_OK
+        entry.checked_at = time.time()
+
+        with self._lock:
+            self._entries[path] = entry
+        return entry.copy()
+
+    def revalidate(self, paths, on_result=None, max_workers=DEFAULT_META_WORKERS):
+        """在线程池中检查全部文件，每检查完一个回调 on_result(条目)，结束后保存，返回条目列表"""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        paths = list(dict.fromkeys(paths))
+        results = []
+        if paths:
+            workers = max(1, min(max_workers, len(paths)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="program-meta") as executor:
+                for future in as_completed([executor.submit(self.validate, path) for path in paths]):
+                    entry = future.result()
+                    results.append(entry)
+                    if on_result:
+                        on_result(entry)
+        self.save()
+        return results
+
+    def set_icon(self, path, icon):
+        """保存界面提取的图标数据"""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                entry.icon = icon
+
+    def acknowledge(self, path):
+        """用户已知晓文件变化，清除 changed 状态"""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry.status != STATUS_CHANGED:
+                return False
+            entry.status = STATUS_OK
+        self.save()
+        return True
+
+    def prune(self, paths):
+        """只保留 paths 中的条目"""
+        keep = set(paths)
+        with self._lock:
+            for path in [path for path in self._entries if path not in keep]:
+                del self._entries[path]
+
+    def load(self):
+        """从磁盘加载缓存"""
+        try:
+            if not os.path.exists(self.cache_path):
+                return
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            if cache_data.get('version') != CACHE_VERSION:
+                return
+            with self._lock:
+                for path, item in cache_data.get('entries', {}).items():
+                    self._entries[path] = ProgramMeta.from_dict(path, item)
+        except Exception as e:
+            print(f"加载程序信息缓存失败: {str(e)}")
+
+    def save(self):
+        """保存缓存到磁盘"""
+        if not self.cache_path:
+            return
+        with self._lock:
+            cache_data = {
+                'version': CACHE_VERSION,
+                'entries': {path: entry.to_dict() for path, entry in self._entries.items()},
+            }
+        try:
+            with self._write_lock:
+                atomic_write(self.cache_path, json.dumps(cache_data, ensure_ascii=False).encode('utf-8'))
+        except Exception as e:
+            print(f"保存程序信息缓存失败: {str(e)}")
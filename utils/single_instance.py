@@ -0,0 +1,205 @@
+"""单实例
+
+第一个启动的进程在本地监听（Windows 命名管道，其他系统 Unix 域套接字），
+之后再启动时只把命令（显示窗口、按方案启动程序、重新加载配置）转发给它，然后立即退出，
+不会初始化界面。监听地址由配置文件路径决定，使用不同配置文件的启动器互不影响。
+本模块不依赖 Qt（打包时排除了 QtNetwork），使用标准库 multiprocessing.connection。
+命令和回复都是 JSON（send_bytes/recv_bytes），不使用 pickle，收到的数据不会被执行；
+Unix 域套接字放在只有当前用户可以访问的目录中。
+"""
+import hashlib
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+
+COMMAND_SHOW = 'show'
+COMMAND_LAUNCH = 'launch'
+COMMAND_RELOAD = 'reload'
+COMMANDS = (COMMAND_SHOW, COMMAND_LAUNCH, COMMAND_RELOAD)
+# 关闭监听时发给自己的命令
+_COMMAND_STOP = '_stop'
+# 等待对方回复的最长时间 (秒)，界面弹出对话框时可能迟迟不回复
+REPLY_TIMEOUT = 5
+# 监听线程等待界面处理命令的最长时间 (秒)，比 REPLY_TIMEOUT 短，超时后回复“已转发”
+HANDLER_TIMEOUT = 4
+# 连接后等待对方发来命令的最长时间 (秒)，避免不发数据的连接一直占住监听线程
+RECEIVE_TIMEOUT = 2
+# 一条命令或回复的最大长度
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+def _private_directory():
+    """存放套接字的目录，只有当前用户可以访问，不满足时返回 None
+
+    没有 XDG_RUNTIME_DIR 时在临时目录下按用户建立 0700 的子目录。
+    目录已存在但不属于当前用户、其他用户可以访问或者是符号链接时不使用，避免被他人抢先建立。
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        directory = os.path.join(runtime_dir, "nm-start")
+    else:
+        directory = os.path.join(tempfile.gettempdir(), f"nm-start-{os.getuid()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        print(f"创建单实例目录失败: {str(e)}")
+        return None
+    try:
+        info = os.lstat(directory)
+    except OSError:
+        return None
+    if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+            or stat.S_IMODE(info.st_mode) & 0o077):
+        print(f"单实例目录 {directory} 不安全，已停用单实例")
+        return None
+    return directory
+
+
+def instance_address(config_path):
+    """配置文件对应的监听地址，无法安全监听时返回 None"""
+    user = os.environ.get('USERNAME') or os.environ.get('USER') or ''
+    key = hashlib.sha256(f"{user}\0{os.path.normcase(os.path.abspath(config_path))}".encode('utf-8'))
+    name = f"nm-start-{key.hexdigest()[:16]}"
+    if sys.platform == 'win32':
+        return rf'\\.\pipe\{name}'
+    directory = _private_directory()
+    if directory is None:
+        return None
+    return os.path.join(directory, f"{name}.sock")
+
+
+def _family(address):
+    return 'AF_PIPE' if sys.platform == 'win32' else 'AF_UNIX'
+
+
+def _send_message(connection, message):
+    connection.send_bytes(json.dumps(message, ensure_ascii=False).encode('utf-8'))
+
+
+def _receive_message(connection, timeout):
+    """读取一条 JSON 消息，超时、过长或格式不对时返回 None"""
+    if not connection.poll(timeout):
+        return None
+    try:
+        message = json.loads(connection.recv_bytes(MAX_MESSAGE_BYTES).decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return message if isinstance(message, dict) else None
+
+
+def send_command(address, command, timeout=REPLY_TIMEOUT, **params):
+    """把命令发给已在运行的实例，返回对方的回复，没有实例在运行时返回 None
+
+    对方在 timeout 秒内没有回复时视为已转发，返回 {'ok': True, 'pending': True}。
+    """
+    from multiprocessing.connection import Client
+
+    if address is None:
+        return None
+    try:
+        connection = Client(address, _family(address))
+    except (OSError, EOFError):
+        # 没有实例，或者是上次异常退出留下的套接字文件
+        return None
+    try:
+        _send_message(connection, {'command': command, **params})
+        if not connection.poll(timeout):
+            return {'ok': True, 'pending': True}
+        reply = _receive_message(connection, 0)
+        return reply if reply is not None else {'ok': False, 'error': "回复格式不正确"}
+    except (OSError, EOFError):
+        return None
+    finally:
+        connection.close()
+
+
+class InstanceServer:
+    """接收其他进程转发的命令
+
+    on_command(命令字典) 在监听线程中调用，返回值（可以转为 JSON 的字典）作为回复发回给对方，应尽快返回。
+    可以先开始监听、等界面创建好后再设置 on_command，这之前只接受 show（界面随后就会显示）。
+    已有实例在监听时 start 返回 False，address 为 None（无法安全监听）时也返回 False。
+    """
+
+    def __init__(self, address, on_command=None):
+        self.address = address
+        self.on_command = on_command
+        self._listener = None
+        self._thread = None
+        self._stopped = False
+
+    def start(self):
+        """开始监听，返回是否成功"""
+        from multiprocessing.connection import Listener
+
+        if self.address is None:
+            return False
+        try:
+            self._listener = Listener(self.address, _family(self.address))
+        except OSError:
+            # 探测已有实例是否还在运行，同时让它显示窗口
+            if sys.platform == 'win32' or send_command(self.address, COMMAND_SHOW) is not None:
+                return False
+            # 套接字文件是异常退出时留下的，删除后重试
+            try:
+                os.unlink(self.address)
+                self._listener = Listener(self.address, _family(self.address))
+            except OSError as e:
+                print(f"单实例监听失败: {str(e)}")
+                return False
+        self._thread = threading.Thread(target=self._serve, name="instance-server", daemon=True)
+        self._thread.start()
+        return True
+
+    def _serve(self):
+        while not self._stopped:
+            try:
+                connection = self._listener.accept()
+            except (OSError, EOFError):
+                if self._stopped:
+                    break
+                continue
+            try:
+                message = _receive_message(connection, RECEIVE_TIMEOUT)
+                if message is None or message.get('command') == _COMMAND_STOP:
+                    continue
+                _send_message(connection, self._handle(message))
+            except Exception as e:
+                # 对方断开或发来异常数据，只放弃这一个连接，继续监听
+                if not isinstance(e, (OSError, EOFError)):
+                    print(f"单实例处理命令失败: {str(e)}")
+            finally:
+                connection.close()
+
+    def _handle(self, message):
+        command = message.get('command')
+        if command not in COMMANDS:
+            return {'ok': False, 'error': f"不支持的命令：{command}"}
+        on_command = self.on_command
+        if on_command is None:
+            if command == COMMAND_SHOW:
+                return {'ok': True}
+            return {'ok': False, 'error': "启动器正在启动，请稍后再试"}
+        try:
+            reply = on_command(message) or {'ok': True}
+            json.dumps(reply)
+            return reply
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    def close(self):
+        """停止监听"""
+        if self._listener is None:
+            return
+        self._stopped = True
+        # accept 会一直阻塞，连接一次让它返回；不等待回复
+        send_command(self.address, _COMMAND_STOP, timeout=0)
+        if self._thread is not None:
+            self._thread.join(1)
+        self._listener.close()
+        self._listener = None
@@ -0,0 +1,169 @@
+"""启动阶段计时
+
+python main.py --profile-startup [报告路径] [--startup-trace 路径] [--profile-exit]
+或设置环境变量 NM_PROFILE_STARTUP=报告路径（值为 1 时使用默认路径）、NM_STARTUP_TRACE=路径。
+--profile-exit 在写出报告后立即退出，供 build.py --benchmark 使用。
+
+启动过程中在各处调用 startup_mark(阶段名)，记录该阶段结束的时间，相邻两个标记之间即为一个阶段。
+首次绘制完成后写出 JSON 报告，可选输出 Chrome trace（chrome://tracing 或 Perfetto 打开）。
+未启用时 startup_mark 什么也不做。
+"""
+import json
+import os
+import sys
+import time
+
+DEFAULT_REPORT_NAME = 'startup_profile.json'
+REPORT_VERSION = 1
+
+
+def process_start_time(pid=None):
+    """进程的创建时间（time.time() 时间轴），无法获取时返回 None"""
+    pid = os.getpid() if pid is None else pid
+    try:
+        if sys.platform == 'win32':
+            return _windows_start_time(pid)
+        if sys.platform.startswith('linux'):
+            return _linux_start_time(pid)
+    except Exception:
+        pass
+    return None
+
+
+def _windows_start_time(pid):
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.windll.kernel32
+    # PROCESS_QUERY_LIMITED_INFORMATION
+    handle = kernel32.OpenProcess(0x1000, False, pid)
+    if not handle:
+        return None
+    try:
+        creation, exited, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        if not kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exited),
+                                        ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+    finally:
+        kernel32.CloseHandle(handle)
+    # FILETIME 是从 1601 年起的 100 纳秒数
+    ticks = (creation.dwHighDateTime << 32) | creation.dwLowDateTime
+    return ticks / 1e7 - 11644473600
+
+
+def _linux_start_time(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        stat = f.read()
+    # 进程名可能包含空格，从最后一个右括号之后切分，starttime 是第 22 个字段
+    start_ticks = int(stat[stat.rindex(')') + 2:].split()[19])
+    with open('/proc/uptime') as f:
+        uptime = float(f.read().split()[0])
+    return time.time() - (uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+
+
+def _is_onefile():
+    """是否为 PyInstaller 单文件模式（由引导进程解压后再启动子进程）"""
+    meipass = getattr(sys, '_MEIPASS', None)
+    return bool(getattr(sys, 'frozen', False) and meipass
+                and os.path.basename(meipass).startswith('_MEI'))
+
+
+class StartupProfiler:
+    """记录启动各阶段结束的时间点"""
+
+    def __init__(self, origin, report_path=None, trace_path=None, exit_after_report=False):
+        # origin 为 main.py 开始执行时的 time.perf_counter()
+        self.origin = origin
+        self.report_path = report_path or DEFAULT_REPORT_NAME
+        self.trace_path = trace_path
+        # 写出报告后直接退出，用于基准测试
+        self.exit_after_report = exit_after_report
+        # origin 在 time.time() 时间轴上的位置，用于和进程创建时间对齐
+        self.origin_wall = time.time() - (time.perf_counter() - origin)
+        self.marks = []
+        self.finished = False
+
+    def mark(self, name):
+        """记录名为 name 的阶段在此刻结束"""
+        if not self.finished:
+            self.marks.append((name, time.perf_counter()))
+
+    def phases(self):
+        """按顺序返回各阶段 [{name, start_ms, ms}]，时间以进程创建为零点"""
+        phases = []
+        start = 0.0
+        process_start = process_start_time()
+        if process_start is not None and process_start <= self.origin_wall:
+            if _is_onefile():
+                # 单文件模式下父进程是引导程序，负责解压
+                loader_start = process_start_time(os.getppid())
+                if loader_start is not None and loader_start <= process_start:
+                    phases.append({'name': 'bootloader', 'start_ms': 0.0,
+                                   'ms': (process_start - loader_start) * 1000})
+                    start = (process_start - loader_start) * 1000
+                    process_start = loader_start
+            interpreter_ms = (self.origin_wall - process_start) * 1000
+            phases.append({'name': 'interpreter', 'start_ms': start, 'ms': interpreter_ms - start})
+            start = interpreter_ms
+
+        previous = self.origin
+        for name, moment in self.marks:
+            elapsed = (moment - previous) * 1000
+            phases.append({'name': name, 'start_ms': start, 'ms': elapsed})
+            start += elapsed
+            previous = moment
+        return phases
+
+    def report(self):
+        """生成报告"""
+        phases = self.phases()
+        for phase in phases:
+            phase['start_ms'] = round(phase['start_ms'], 3)
+            phase['ms'] = round(phase['ms'], 3)
+        return {
+            'version': REPORT_VERSION,
+            'time': round(self.origin_wall, 3),
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'total_ms': round(sum(phase['ms'] for phase in phases), 3),
+            'phases': phases,
+        }
+
+    def write(self):
+        """写出 JSON 报告和 Chrome trace，返回报告内容"""
+        self.finished = True
+        report = self.report()
+        try:
+            with open(self.report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            if self.trace_path:
+                pid = os.getpid()
+                events = [{'name': phase['name'], 'cat': 'startup', 'ph': 'X', 'pid': pid, 'tid': 0,
+                           'ts': round(phase['start_ms'] * 1000), 'dur': round(phase['ms'] * 1000)}
+                          for phase in report['phases']]
+                with open(self.trace_path, 'w', encoding='utf-8') as f:
+                    json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        except Exception as e:
+            print(f"保存启动计时报告失败: {str(e)}")
+        return report
+
+
+_profiler = None
+
+
+def start_startup_profiler(origin, report_path=None, trace_path=None, exit_after_report=False):
+    """启用启动计时"""
+    global _profiler
+    _profiler = StartupProfiler(origin, report_path, trace_path, exit_after_report)
+    return _profiler
+
+
+def get_startup_profiler():
+    """当前的启动计时器，未启用时返回 None"""
+    return _profiler
+
+
+def startup_mark(name):
+    """记录一个启动阶段结束，未启用启动计时时不做任何事"""
+    if _profiler is not None:
+        _profiler.mark(name)
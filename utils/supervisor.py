@@ -0,0 +1,520 @@
+"""进程监管
+
+记录启动器启动的进程，启动前判断程序是否已经在运行（自己启动的进程加上一次性扫描整个进程表），
+可选地在程序崩溃（非 0 退出码）后按指数退避重新启动，短时间内崩溃次数过多时停止重启。
+所有子进程的退出由同一个线程等待：Linux 使用 pidfd，Windows 使用 WaitForMultipleObjects，
+其他平台在该线程中定时检查。不依赖 Qt，界面和命令行都可以使用。
+"""
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from utils.launcher import spawn_program
+
+# 崩溃后默认最多重启的次数（在 crash_window_s 秒内统计）
+DEFAULT_MAX_RESTARTS = 3
+DEFAULT_CRASH_WINDOW_S = 300
+# 第 n 次重启前等待 backoff_ms * 2^n，最多 max_backoff_ms
+DEFAULT_BACKOFF_MS = 1000
+DEFAULT_MAX_BACKOFF_MS = 30000
+# 无法等待事件时检查进程状态的间隔 (秒)
+POLL_INTERVAL = 0.5
+
+# 监管事件
+EVENT_EXITED = 'exited'
+EVENT_RESTARTING = 'restarting'
+EVENT_RESTARTED = 'restarted'
+EVENT_RESTART_FAILED = 'restart_failed'
+EVENT_GAVE_UP = 'gave_up'
+
+# 脚本解释器：由它们运行的进程，第一个参数（脚本路径）也算作正在运行的程序
+_INTERPRETER = re.compile(r'^(python[\d.]*w?|pypy[\d.]*|node|perl|ruby|php|lua|bash|sh|dash|zsh)$')
+
+
+def normalize_path(path):
+    """用于比较的路径形式（Windows 下不区分大小写）"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def scan_processes():
+    """扫描一次进程表，返回 {规范化的可执行文件路径: [pid, ...]}，不包括当前进程"""
+    # 不使用 psutil，命令行启动时不导入额外的第三方模块
+    try:
+        if sys.platform == 'win32':
+            table = _scan_windows()
+        elif os.path.isdir('/proc'):
+            table = _scan_proc()
+        else:
+            table = _scan_ps()
+    except Exception as e:
+        print(f"读取进程列表失败: {str(e)}")
+        return {}
+    own_pid = os.getpid()
+    for pids in table.values():
+        if own_pid in pids:
+            pids.remove(own_pid)
+    return {path: pids for path, pids in table.items() if pids}
+
+
+def _add(table, path, pid):
+    if path and os.path.isabs(path):
+        pids = table.setdefault(normalize_path(path), [])
+        if pid not in pids:
+            pids.append(pid)
+
+
+def _scan_proc():
+    table = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        pid = int(entry)
+        try:
+            exe = os.readlink(f'/proc/{entry}/exe')
+            _add(table, exe, pid)
+            if not is_interpreter(exe):
+                continue
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                arguments = f.read().split(b'\0')
+        except OSError:
+            # 进程已经退出，或属于其他用户
+            continue
+        # 只看可执行文件；编辑器、文件管理器等打开的文件不算在运行
+        if len(arguments) > 1:
+            _add(table, os.fsdecode(arguments[1]), pid)
+    return table
+
+
+def is_interpreter(path):
+    """path 是否为脚本解释器"""
+    name = os.path.basename(path)
+    if name.lower().endswith('.exe'):
+        name = name[:-4]
+    return bool(_INTERPRETER.match(name))
+
+
+def _scan_windows():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [('dwSize', wintypes.DWORD), ('cntUsage', wintypes.DWORD),
+                    ('th32ProcessID', wintypes.DWORD), ('th32DefaultHeapID', ctypes.c_void_p),
+                    ('th32ModuleID', wintypes.DWORD), ('cntThreads', wintypes.DWORD),
+                    ('th32ParentProcessID', wintypes.DWORD), ('pcPriClassBase', ctypes.c_long),
+                    ('dwFlags', wintypes.DWORD), ('szExeFile', wintypes.WCHAR * 260)]
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    kernel32.QueryFullProcessImageNameW.argtypes = [wintypes.HANDLE, wintypes.DWORD,
+                                                    wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)]
+    # TH32CS_SNAPPROCESS
+    snapshot = kernel32.CreateToolhelp32Snapshot(0x2, 0)
+    if not snapshot or snapshot == wintypes.HANDLE(-1).value:
+        return {}
+    table = {}
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        more = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        buffer = ctypes.create_unicode_buffer(32768)
+        while more:
+            pid = entry.th32ProcessID
+            # PROCESS_QUERY_LIMITED_INFORMATION
+            handle = kernel32.OpenProcess(0x1000, False, pid)
+            if handle:
+                try:
+                    size = wintypes.DWORD(len(buffer))
+                    if kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+                        _add(table, buffer.value, pid)
+                finally:
+                    kernel32.CloseHandle(handle)
+            more = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+    return table
+
+
+def _scan_ps():
+    table = {}
+    output = subprocess.run(['ps', '-axo', 'pid=,comm='], capture_output=True, text=True).stdout
+    for line in output.splitlines():
+        pid, _, command = line.strip().partition(' ')
+        if pid.isdigit():
+            _add(table, command.strip(), int(pid))
+    return table
+
+
+class _PollWaiter:
+    """定时检查进程是否退出"""
+
+    def __init__(self):
+        self._processes = []
+        self._wakeup = threading.Event()
+
+    def add(self, process):
+        self._processes.append(process)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def wait(self):
+        """等到有进程退出或被唤醒，返回已退出的进程"""
+        self._wakeup.wait(POLL_INTERVAL if self._processes else None)
+        self._wakeup.clear()
+        return self._collect()
+
+    def _collect(self):
+        exited = [process for process in self._processes if process.poll() is not None]
+        for process in exited:
+            self._processes.remove(process)
+        return exited
+
+    def close(self):
+        pass
+
+
+class _PidfdWaiter(_PollWaiter):
+    """Linux：每个进程一个 pidfd，进程退出时变为可读，和唤醒用的管道一起由 selector 等待"""
+
+    def __init__(self):
+        super().__init__()
+        import selectors
+        self._selector = selectors.DefaultSelector()
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_write, False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ)
+        self._exited = []
+
+    def add(self, process):
+        import selectors
+        try:
+            fd = os.pidfd_open(process.pid)
+        except ProcessLookupError:
+            self._exited.append(process)
+            return
+        except OSError:
+            # 内核不支持 pidfd，退回定时检查
+            super().add(process)
+            return
+        self._selector.register(fd, selectors.EVENT_READ, process)
+
+    def wake(self):
+        try:
+            os.write(self._wake_write, b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def wait(self):
+        exited, self._exited = self._exited, []
+        if exited:
+            return exited
+        timeout = POLL_INTERVAL if self._processes else None
+        for key, _ in self._selector.select(timeout):
+            if key.fd == self._wake_read:
+                os.read(self._wake_read, 4096)
+                continue
+            self._selector.unregister(key.fd)
+            os.close(key.fd)
+            exited.append(key.data)
+        return exited + self._collect()
+
+    def close(self):
+        for key in list(self._selector.get_map().values()):
+            if key.fd != self._wake_read:
+                os.close(key.fd)
+        self._selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+
+class _WindowsWaiter(_PollWaiter):
+    """Windows：WaitForMultipleObjects 同时等待唤醒事件和进程句柄"""
+
+    # WaitForMultipleObjects 最多等待 64 个句柄，其中一个是唤醒事件
+    MAX_HANDLES = 63
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._kernel32 = ctypes.windll.kernel32
+        self._kernel32.CreateEventW.restype = wintypes.HANDLE
+        self._kernel32.SetEvent.argtypes = [wintypes.HANDLE]
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._kernel32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD]
+        self._event = self._kernel32.CreateEventW(None, False, False, None)
+        self._handle_type = wintypes.HANDLE
+
+    def wake(self):
+        self._kernel32.SetEvent(self._event)
+
+    def wait(self):
+        watched = self._processes[:self.MAX_HANDLES]
+        handles = (self._handle_type * (len(watched) + 1))(
+            self._event, *[int(process._handle) for process in watched])
+        # 超出上限的进程靠定时检查
+        timeout = int(POLL_INTERVAL * 1000) if len(self._processes) > len(watched) else 0xFFFFFFFF
+        self._kernel32.WaitForMultipleObjects(len(handles), handles, False, timeout)
+        return self._collect()
+
+    def close(self):
+        self._kernel32.CloseHandle(self._event)
+
+
+class ExitWatcher:
+    """用一个线程等待所有子进程退出，进程退出后回调 on_exit(进程, 退出码)"""
+
+    def __init__(self, on_exit):
+        self.on_exit = on_exit
+        self._lock = threading.Lock()
+        self._added = []
+        self._thread = None
+        self._stopped = False
+        if sys.platform == 'win32':
+            self._waiter = _WindowsWaiter()
+        elif hasattr(os, 'pidfd_open'):
+            self._waiter = _PidfdWaiter()
+        else:
+            self._waiter = _PollWaiter()
+
+    def watch(self, process):
+        """开始等待该进程退出"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._added.append(process)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="exit-watcher", daemon=True)
+                self._thread.start()
+        self._waiter.wake()
+
+    def stop(self):
+        """停止等待，不影响子进程"""
+        with self._lock:
+            self._stopped = True
+            started = self._thread is not None
+        if started:
+            self._waiter.wake()
+        else:
+            self._waiter.close()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._stopped:
+                    break
+                added, self._added = self._added, []
+            for process in added:
+                self._waiter.add(process)
+            for process in self._waiter.wait():
+                try:
+                    self.on_exit(process, process.wait())
+                except Exception as e:
+                    print(f"处理进程退出失败: {str(e)}")
+        self._waiter.close()
+
+
+class RestartPolicy:
+    """崩溃后的重启策略"""
+
+    __slots__ = ('max_restarts', 'crash_window', 'backoff', 'max_backoff')
+
+    def __init__(self, max_restarts=DEFAULT_MAX_RESTARTS, crash_window_s=DEFAULT_CRASH_WINDOW_S,
+                 backoff_ms=DEFAULT_BACKOFF_MS, max_backoff_ms=DEFAULT_MAX_BACKOFF_MS):
+        self.max_restarts = max(0, int(max_restarts))
+        self.crash_window = crash_window_s
+        self.backoff = backoff_ms / 1000
+        self.max_backoff = max_backoff_ms / 1000
+
+    def delay(self, attempt):
+        """第 attempt 次（从 0 开始）重启前等待的秒数"""
+        return min(self.backoff * (2 ** attempt), self.max_backoff)
+
+
+def create_restart_policy(policy_config):
+    """根据配置中的 restart_policy 创建重启策略"""
+    policy_config = policy_config or {}
+    return RestartPolicy(policy_config.get('max_restarts', DEFAULT_MAX_RESTARTS),
+                         policy_config.get('crash_window_s', DEFAULT_CRASH_WINDOW_S),
+                         policy_config.get('backoff_ms', DEFAULT_BACKOFF_MS),
+                         policy_config.get('max_backoff_ms', DEFAULT_MAX_BACKOFF_MS))
+
+
+class SupervisorEvent:
+    """监管事件，kind 为 EVENT_* 之一"""
+
+    __slots__ = ('kind', 'name', 'path', 'pid', 'exit_code', 'delay', 'restarts', 'error')
+
+    def __init__(self, kind, name, path, pid=None, exit_code=None, delay=None, restarts=0, error=None):
+        self.kind = kind
+        self.name = name
+        self.path = path
+        self.pid = pid
+        self.exit_code = exit_code
+        self.delay = delay
+        self.restarts = restarts
+        self.error = error
+
+    def __repr__(self):
+        return f"SupervisorEvent({self.kind!r}, {self.name!r}, exit_code={self.exit_code})"
+
+
+class _Tracked:
+    __slots__ = ('key', 'name', 'path', 'process')
+
+    def __init__(self, key, name, path, process):
+        self.key = key
+        self.name = name
+        self.path = path
+        self.process = process
+
+
+class ProcessSupervisor:
+    """监管启动器启动的进程
+
+    作为 LaunchEngine 的 spawn 使用：记录每个进程，退出时发出 EVENT_EXITED。
+    程序配置中 restart_on_crash 为 true 时，非 0 退出后按 policy 重新启动；
+    crash_window 内崩溃超过 max_restarts 次则放弃并发出 EVENT_GAVE_UP。
+    on_event 在监管线程中调用。
+    """
+
+    def __init__(self, spawn=spawn_program, policy=None, on_event=None):
+        self._spawn = spawn
+        self.policy = policy or RestartPolicy()
+        self.on_event = on_event
+        self._lock = threading.Lock()
+        # 规范化路径 -> _Tracked，每个程序只记录最近启动的进程
+        self._tracked = {}
+        # 进程对象 -> _Tracked
+        self._processes = {}
+        self._programs = {}
+        self._crashes = {}
+        self._timers = {}
+        self._closed = False
+        self._watcher = ExitWatcher(self._on_exit)
+
+    def configure(self, programs):
+        """更新程序配置（名称和 restart_on_crash）"""
+        with self._lock:
+            for program in programs:
+                self._programs[normalize_path(program['path'])] = program
+
+    def running_pid(self, path):
+        """自己启动的该程序的进程仍在运行时返回 pid"""
+        with self._lock:
+            tracked = self._tracked.get(normalize_path(path))
+        if tracked is not None and tracked.process.poll() is None:
+            return tracked.process.pid
+        return None
+
+    def find_running(self, paths):
+        """返回 {路径: pid}，列出已经在运行的程序
+
+        先看自己启动的进程，其余的只扫描一次进程表。
+        """
+        running = {}
+        unknown = []
+        for path in paths:
+            pid = self.running_pid(path)
+            if pid is not None:
+                running[path] = pid
+            else:
+                unknown.append(path)
+        if unknown:
+            table = scan_processes()
+            for path in unknown:
+                pids = table.get(normalize_path(path))
+                if pids:
+                    running[path] = pids[0]
+        return running
+
+    def spawn(self, path):
+        """启动程序并开始监管，返回进程对象"""
+        process = self._spawn(path)
+        key = normalize_path(path)
+        with self._lock:
+            program = self._programs.get(key) or {}
+            tracked = _Tracked(key, program.get('name', os.path.basename(path)), path, process)
+            self._tracked[key] = tracked
+            self._processes[process] = tracked
+        self._watcher.watch(process)
+        return process
+
+    def _emit(self, event):
+        if self.on_event is not None:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                print(f"处理监管事件失败: {str(e)}")
+
+    def _on_exit(self, process, exit_code):
+        with self._lock:
+            tracked = self._processes.pop(process, None)
+            if tracked is None:
+                return
+            key = tracked.key
+            # 同一程序后来又启动了新进程时，旧进程退出不影响监管
+            if self._tracked.get(key) is not tracked:
+                return
+            del self._tracked[key]
+            program = self._programs.get(key) or {}
+        self._emit(SupervisorEvent(EVENT_EXITED, tracked.name, tracked.path, process.pid, exit_code))
+        if self._closed or exit_code == 0 or not program.get('restart_on_crash'):
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            crashes = [moment for moment in self._crashes.get(key, [])
+                       if now - moment < self.policy.crash_window]
+            crashes.append(now)
+            self._crashes[key] = crashes
+        restarts = len(crashes) - 1
+        if restarts >= self.policy.max_restarts:
+            self._emit(SupervisorEvent(EVENT_GAVE_UP, tracked.name, tracked.path, process.pid,
+                                       exit_code, restarts=restarts))
+            return
+
+        delay = self.policy.delay(restarts)
+        self._emit(SupervisorEvent(EVENT_RESTARTING, tracked.name, tracked.path, process.pid,
+                                   exit_code, delay, restarts + 1))
+        timer = threading.Timer(delay, self._restart, args=(tracked, restarts + 1))
+        timer.daemon = True
+        with self._lock:
+            if self._closed:
+                return
+            self._timers[key] = timer
+        timer.start()
+
+    def _restart(self, tracked, restarts):
+        with self._lock:
+            self._timers.pop(tracked.key, None)
+            if self._closed:
+                return
+        # 等待期间用户可能已经手动启动
+        if self.running_pid(tracked.path) is not None:
+            return
+        try:
+            process = self.spawn(tracked.path)
+        except Exception as e:
+            self._emit(SupervisorEvent(EVENT_RESTART_FAILED, tracked.name, tracked.path,
+                                       restarts=restarts, error=str(e)))
+            return
+        self._emit(SupervisorEvent(EVENT_RESTARTED, tracked.name, tracked.path, process.pid,
+                                   restarts=restarts))
+
+    def shutdown(self):
+        """停止监管和尚未执行的重启，已启动的程序继续运行"""
+        with self._lock:
+            self._closed = True
+            timers = list(self._timers.values())
+            self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+        self._watcher.stop()
@@ -1,42 +1,29 @@
-import requests
-import json
-import os
-import sys
+from utils.amap_client import AmapCancelled, get_amap_client
+from utils.city_index import MUNICIPALITIES, get_city_index
 
-def load_city_data():
-    try:
-        # 获取JSON文件路径
-        if getattr(sys, 'frozen', False):
-            # 如果是打包后的可执行文件
-            base_path = sys._MEIPASS
-        else:
-            # 如果是开发环境
-            base_path = os.path.dirname(os.path.dirname(__file__))
-            
-        json_path = os.path.join(base_path, 'resources', 'city_data.json')
-        
-        # 读取JSON文件
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"加载城市数据失败：{str(e)}")
-        return None
+# 没有设置位置时显示的地区
+DEFAULT_WEATHER_LOCATION = {'province': "广东省", 'city': "深圳市", 'district': "宝安区"}
+
+def get_weather_info(adcode, api_key, extensions="base", timeout=None, cancelled=None):
+    """获取天气信息，timeout 为空时使用 AmapClient 中天气接口的默认超时
 
-def get_weather_info(adcode, api_key):
-    """获取天气信息"""
-    url = f"https://restapi.amap.com/v3/weather/weatherInfo"
+    extensions 为 base 时返回实况，为 all 时返回预报（forecasts 中的一项）。
+    cancelled 为返回是否已取消的函数，取消后不再重试，返回 None。
+    """
     params = {
         "key": api_key,
         "city": adcode,
-        "extensions": "base"
+        "extensions": extensions
     }
     
     try:
-        response = requests.get(url, params=params)
-        data = response.json()
+        data = get_amap_client().get("weather", params, timeout=timeout, cancelled=cancelled)
         
-        if data["status"] == "1" and data["lives"]:
-            return data["lives"][0]
+        key = "forecasts" if extensions == "all" else "lives"
+        if data["status"] == "1" and data.get(key):
+            return data[key][0]
+    except AmapCancelled:
+        pass
     except Exception as e:
         print(f"获取天气信息失败: {str(e)}")
     
@@ -44,42 +31,22 @@ def get_weather_info(adcode, api_key):
 
 def get_province_list():
     """获取省份列表"""
-    city_data = load_city_data()
-    return list(city_data.keys())
+    return get_city_index().provinces()
 
 def get_cities_by_province(province):
     """获取指定省份的城市列表"""
-    city_data = load_city_data()
-    if province in city_data:
-        # 返回城市列表（不包括区）
-        cities = list(city_data[province]["cities"].keys())
-        # 如果是直辖市，只返回市本身
-        if len(cities) == 1 and cities[0] == province:
-            return cities
-        return sorted(cities)  # 按字母顺序排序
-    return []
+    return get_city_index().cities(province)
 
 def get_districts_by_city(province, city):
     """获取指定城市的区列表"""
-    city_data = load_city_data()
-    if province in city_data and city in city_data[province]["cities"]:
-        return list(city_data[province]["cities"][city]["districts"].keys())
-    return []
+    return get_city_index().districts(province, city)
 
 def get_adcode_by_location(province, city, district=None, api_key=None):
     """获取区域编码"""
-    city_data = load_city_data()
-    if province in city_data:
-        if city in city_data[province]["cities"]:
-            if district:
-                # 如果指定了区，返回区的adcode
-                districts = city_data[province]["cities"][city]["districts"]
-                if district in districts:
-                    return districts[district]["adcode"]
-            else:
-                # 如果只指定到市，返回市的adcode
-                return city_data[province]["cities"][city]["adcode"]
-    return None
+    if not city:
+        return None
+    # 未指定区时返回市的adcode
+    return get_city_index().adcode(province, city, district)
 
 def get_weather_by_city(province, city):
     """根据省份和城市获取天气信息"""
@@ -90,4 +57,34 @@ def get_weather_by_city(province, city):
 
 def is_municipality(province):
     """判断是否为直辖市"""
-    return province in ["北京市", "上海市", "天津市", "重庆市"]
+    return province in MUNICIPALITIES
+
+def normalize_locations(locations):
+    """整理配置中的位置列表，去掉缺少省份或城市的项"""
+    result = []
+    for location in locations or []:
+        if isinstance(location, dict) and location.get('province') and location.get('city'):
+            result.append({'province': location['province'], 'city': location['city'],
+                           'district': location.get('district') or ""})
+    return result
+
+def location_name(location):
+    """位置的显示名称"""
+    return " ".join(part for part in (location['province'], location['city'],
+                                      location.get('district')) if part)
+
+def group_locations_by_adcode(locations):
+    """按 adcode 合并位置，返回 ({adcode: [位置序号]}, [找不到 adcode 的位置序号])
+
+    多个位置属于同一地区（例如同一城市的不同写法）时只需请求一次。
+    """
+    groups = {}
+    unresolved = []
+    for index, location in enumerate(locations):
+        adcode = get_adcode_by_location(location['province'], location['city'],
+                                        location.get('district') or None)
+        if adcode:
+            groups.setdefault(adcode, []).append(index)
+        else:
+            unresolved.append(index)
+    return groups, unresolved
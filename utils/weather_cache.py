@@ -0,0 +1,116 @@
+import json
+import os
+import time
+from utils.config import atomic_write
+
+# AMap 实况数据大约每小时更新一次，默认缓存半小时
+DEFAULT_WEATHER_TTL = 1800
+
+
+class WeatherCacheEntry:
+    """一条缓存的天气数据"""
+
+    __slots__ = ('data', 'fetched_at')
+
+    def __init__(self, data, fetched_at):
+        self.data = data
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self):
+        """距离获取时的秒数"""
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class WeatherCache:
+    """天气数据缓存
+
+    以 (adcode, extensions) 为键，超过 ttl 的数据仍然保留，
+    用于在后台刷新期间先显示上一次的结果。
+    命中统计和数据一起保存到磁盘，可以跨多次启动累计。
+    查询只在内存中更新统计，写入新数据时或 flush（例如退出时）才保存到磁盘。
+    """
+
+    def __init__(self, cache_path=None, ttl=DEFAULT_WEATHER_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._entries = {}
+        # hits: 未过期直接使用; stale: 已过期，先显示再刷新; misses: 无缓存
+        # fetches: 实际发出的接口请求，包括失败的请求
+        self.counters = {'hits': 0, 'stale': 0, 'misses': 0, 'fetches': 0}
+        # 统计有尚未写入磁盘的变化
+        self._dirty = False
+        if cache_path:
+            self.load()
+
+    @staticmethod
+    def _key(adcode, extensions):
+        return f"{adcode}:{extensions}"
+
+    def lookup(self, adcode, extensions="base"):
+        """查询缓存并记录命中情况，没有缓存时返回 None"""
+        entry = self._entries.get(self._key(adcode, extensions))
+        if entry is None:
+            self.counters['misses'] += 1
+        elif self.is_fresh(entry):
+            self.counters['hits'] += 1
+        else:
+            self.counters['stale'] += 1
+        self._dirty = True
+        return entry
+
+    def record_fetch(self):
+        """记录一次发出的接口请求，不论成功与否"""
+        self.counters['fetches'] += 1
+        self._dirty = True
+
+    def is_fresh(self, entry):
+        """缓存是否仍在有效期内"""
+        return entry.age < self.ttl
+
+    def put(self, adcode, data, extensions="base"):
+        """写入新获取的数据"""
+        self._entries[self._key(adcode, extensions)] = WeatherCacheEntry(data, time.time())
+        self.save()
+
+    def stats(self):
+        """缓存统计信息"""
+        stats = dict(self.counters)
+        lookups = stats['hits'] + stats['stale'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['entries'] = {key: round(entry.age) for key, entry in self._entries.items()}
+        return stats
+
+    def load(self):
+        """从磁盘加载缓存"""
+        try:
+            if not os.path.exists(self.cache_path):
+                return
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            for key, item in cache_data.get('entries', {}).items():
+                self._entries[key] = WeatherCacheEntry(item['data'], item['fetched_at'])
+            for name in self.counters:
+                self.counters[name] = cache_data.get('counters', {}).get(name, 0)
+        except Exception as e:
+            print(f"加载天气缓存失败: {str(e)}")
+
+    def save(self):
+        """保存缓存到磁盘"""
+        if not self.cache_path:
+            return
+        cache_data = {
+            'entries': {key: {'data': entry.data, 'fetched_at': entry.fetched_at}
+                        for key, entry in self._entries.items()},
+            'counters': self.counters,
+        }
+        try:
+            atomic_write(self.cache_path, json.dumps(cache_data, ensure_ascii=False).encode('utf-8'))
+            self._dirty = False
+        except Exception as e:
+            print(f"保存天气缓存失败: {str(e)}")
+
+    def flush(self):
+        """写入尚未保存的统计"""
+        if self._dirty:
+            self.save()
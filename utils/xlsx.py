@@ -0,0 +1,92 @@
+"""流式读取 xlsx
+
+xlsx 是 zip 包中的若干 XML 文件。这里直接从 zip 中逐个元素解析共享字符串表和工作表，
+每处理完一行就释放对应的元素，不构建整个工作簿，也不依赖 openpyxl。
+只支持读取单元格的值（共享字符串、内联字符串、数字和公式的缓存结果），忽略样式和格式。
+"""
+import posixpath
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+class XlsxError(Exception):
+    """xlsx 文件格式不正确"""
+
+
+def _column_index(cell_ref):
+    """单元格引用（如 "AB12"）的列号，从 0 开始"""
+    index = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + (ord(char.upper()) - ord('A') + 1)
+    return index - 1
+
+
+def _text(element):
+    """<si> 或 <is> 中的文本，包括分段格式（<r>）中的各段"""
+    return "".join(node.text or "" for node in element.iter(f"{_MAIN_NS}t"))
+
+
+def _iter_elements(archive, name, tag):
+    """逐个返回 XML 中指定标签的元素，处理完后释放"""
+    with archive.open(name) as f:
+        for _, element in iterparse(f, events=("end",)):
+            if element.tag == tag:
+                yield element
+                element.clear()
+
+
+def read_shared_strings(archive):
+    """读取共享字符串表，单元格中以序号引用"""
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    return [_text(item) for item in _iter_elements(archive, "xl/sharedStrings.xml", f"{_MAIN_NS}si")]
+
+
+def _sheet_path(archive, sheet_index):
+    """第 sheet_index 个工作表在 zip 中的路径"""
+    try:
+        with archive.open("xl/workbook.xml") as f:
+            sheets = [element.get(f"{_REL_NS}id") for _, element in iterparse(f)
+                      if element.tag == f"{_MAIN_NS}sheet"]
+        with archive.open("xl/_rels/workbook.xml.rels") as f:
+            targets = {element.get("Id"): element.get("Target") for _, element in iterparse(f)
+                       if element.tag == f"{_PACKAGE_REL_NS}Relationship"}
+        target = targets[sheets[sheet_index]]
+    except (KeyError, IndexError) as e:
+        raise XlsxError(f"找不到第 {sheet_index + 1} 个工作表") from e
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def iter_xlsx_rows(path, sheet_index=0):
+    """逐行返回工作表的内容，每行是单元格值的列表（字符串），空单元格为 None"""
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile as e:
+        raise XlsxError(f"{path} 不是有效的 xlsx 文件") from e
+    with archive:
+        shared_strings = read_shared_strings(archive)
+        for row in _iter_elements(archive, _sheet_path(archive, sheet_index), f"{_MAIN_NS}row"):
+            values = []
+            for position, cell in enumerate(row.iter(f"{_MAIN_NS}c")):
+                ref = cell.get("r")
+                column = _column_index(ref) if ref else position
+                cell_type = cell.get("t")
+                if cell_type == "inlineStr":
+                    inline = cell.find(f"{_MAIN_NS}is")
+                    value = _text(inline) if inline is not None else None
+                else:
+                    value = cell.findtext(f"{_MAIN_NS}v")
+                    if value is not None and cell_type == "s":
+                        value = shared_strings[int(value)]
+                if column >= len(values):
+                    values.extend([None] * (column + 1 - len(values)))
+                values[column] = value
+            yield values